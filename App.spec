@@ -14,12 +14,16 @@ for root, dirs, files in os.walk('src'):
             dest_path = root
             added_files.append((source_path, dest_path))
 
+for file in os.listdir(os.path.join('database_files', 'sqlite')):
+    if file.endswith('.sql'):
+        added_files.append((os.path.join('database_files', 'sqlite', file), os.path.join('database_files', 'sqlite')))
+
 a = Analysis(
     ['main.py'],
     pathex=[],
     binaries=[],
     datas=added_files,
-    hiddenimports=[],
+    hiddenimports=['mysql.connector.connection_cext', '_mysql_connector'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
@@ -0,0 +1,95 @@
+"""
+Compares adding employees with one INSERT per row and with multi-row INSERTs.
+
+Run from the project root against the database configured in configuration_files/config.ini:
+    python -m benchmarks.bulk_insert_benchmark --rows 3000 --chunk-size 500
+
+The inserted employees are deleted again after each run.
+"""
+import argparse
+import time
+
+from src.data_access_layer.database_connector import DatabaseConnector
+from src.data_access_layer.employees_DAO import EmployeesDAO
+from src.objects.employee import Employee
+
+
+def make_employees(rows: int, run: str):
+    """
+    Creates unsaved employees with names that identify the benchmark run.
+    :param rows:
+    :param run:
+    :return:
+    """
+    return [Employee(f"Bench{run}", f"Employee{i}") for i in range(rows)]
+
+
+def delete_employees(employees):
+    """
+    Removes the benchmark employees in chunks.
+    :param employees:
+    :return:
+    """
+    connector = DatabaseConnector()
+    ids = [employee.id for employee in employees if employee.id is not None]
+    connection = connector.connect()
+    try:
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            sql = f"DELETE FROM employees WHERE id IN ({', '.join(['%s'] * len(chunk))})"
+            connector.execute(connection, sql, chunk, prepared=False)
+        connection.commit()
+    finally:
+        connector.release()
+
+
+def measure(rows: int, chunk_size: int, run: str):
+    """
+    Inserts the employees with the given chunk size and checks the assigned ids against the database.
+    :param rows:
+    :param chunk_size:
+    :param run:
+    :return: seconds taken by the insert
+    """
+    employees = make_employees(rows, run)
+    start = time.perf_counter()
+    EmployeesDAO().add(employees, chunk_size)
+    elapsed = time.perf_counter() - start
+
+    try:
+        loaded = {employee.id: employee for employee in EmployeesDAO().load()}
+        for employee in employees:
+            match = loaded.get(employee.id)
+            if match is None or (match.first_name, match.last_name) != (employee.first_name, employee.last_name):
+                raise RuntimeError(f"Employee id {employee.id} does not match the database row")
+    finally:
+        delete_employees(employees)
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=2000, help="employees inserted per run")
+    parser.add_argument("--chunk-size", type=int, default=None, help="rows per multi-row INSERT")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per mode")
+    args = parser.parse_args()
+
+    chunk_size = args.chunk_size or DatabaseConnector().bulk_insert_chunk_size
+    modes = [("row by row", 1), (f"chunks of {chunk_size}", chunk_size)]
+
+    results = {}
+    for name, size in modes:
+        runs = [measure(args.rows, size, f"{size}x{i}") for i in range(args.repeat)]
+        results[name] = min(runs)
+
+    print(f"{'mode':<20}{'rows':>8}{'ms':>12}{'rows/s':>12}")
+    for name, seconds in results.items():
+        print(f"{name:<20}{args.rows:>8}{seconds * 1000:>12.1f}{args.rows / seconds:>12.0f}")
+
+    single, bulk = results[modes[0][0]], results[modes[1][0]]
+    if bulk:
+        print(f"multi-row INSERT is {single / bulk:.1f}x faster")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Compares row-decode throughput of the C extension and the pure Python MySQL driver on the DAO queries.
+
+Run from the project root against the database configured in configuration_files/config.ini:
+    python -m benchmarks.driver_benchmark --repeat 20 --from 2024-01-01 --to 2024-12-31
+"""
+import argparse
+import time
+
+import mysql.connector
+
+from src.data_access_layer.database_connector import DatabaseConnector
+from src.data_access_layer.order_items_DAO import OrderItemsDAO
+from src.data_access_layer.orders_DAO import OrdersDAO
+from src.data_access_layer.reports_DAO import ReportsDAO
+
+
+def measure(function, repeat: int):
+    """
+    Runs the function repeat times.
+    :param function: callable returning the number of rows it decoded
+    :param repeat:
+    :return: (rows per run, seconds per run)
+    """
+    rows = function()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    elapsed = (time.perf_counter() - start) / repeat
+    return rows, elapsed
+
+
+def run_queries(repeat: int, start_date: str, end_date: str):
+    """
+    Benchmarks the DAO read queries with the currently selected driver.
+    :param repeat:
+    :param start_date:
+    :param end_date:
+    :return: dict of query name -> (rows per run, seconds per run)
+    """
+    orders_dao = OrdersDAO()
+    order_items_dao = OrderItemsDAO()
+    reports_dao = ReportsDAO()
+
+    order_ids = [order.id for order in orders_dao.get_unpaid_orders()]
+
+    def unpaid_orders():
+        return len(orders_dao.get_unpaid_orders())
+
+    def order_items():
+        return sum(len(order_items_dao.get_items_by_order_id(order_id)) for order_id in order_ids)
+
+    def sales_report():
+        return len(reports_dao.get_sales_report(start_date, end_date))
+
+    return {
+        "get_unpaid_orders": measure(unpaid_orders, repeat),
+        "get_items_by_order_id": measure(order_items, repeat),
+        "get_sales_report": measure(sales_report, repeat),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=10, help="runs per query and driver")
+    parser.add_argument("--from", dest="start_date", default="2000-01-01", help="sales report start date")
+    parser.add_argument("--to", dest="end_date", default="2100-12-31", help="sales report end date")
+    args = parser.parse_args()
+
+    connector = DatabaseConnector()
+    start_date = f"{args.start_date} 00:00:00"
+    end_date = f"{args.end_date} 23:59:59"
+
+    paths = [False, True] if mysql.connector.HAVE_CEXT else [False]
+    if not mysql.connector.HAVE_CEXT:
+        print("C extension is not available, only the pure Python driver is measured.")
+
+    results = {}
+    for use_c_extension in paths:
+        connector.set_use_c_extension(use_c_extension)
+        results[connector.driver] = run_queries(args.repeat, start_date, end_date)
+
+    print(f"{'query':<24}{'driver':<14}{'rows':>8}{'ms/run':>10}{'rows/s':>12}")
+    for driver, queries in results.items():
+        for query, (rows, seconds) in queries.items():
+            throughput = rows / seconds if seconds else 0.0
+            print(f"{query:<24}{driver:<14}{rows:>8}{seconds * 1000:>10.2f}{throughput:>12.0f}")
+
+    if len(results) == 2:
+        pure, cext = results["pure-python"], results["c-extension"]
+        for query in pure:
+            if cext[query][1]:
+                print(f"{query}: C extension is {pure[query][1] / cext[query][1]:.2f}x faster")
+
+
+if __name__ == "__main__":
+    main()
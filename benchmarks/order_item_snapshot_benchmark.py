@@ -0,0 +1,106 @@
+"""
+Measures bulk insertion of order items, where the order_items_snapshot_menu_item trigger copies
+the menu item into every inserted row.
+
+Run from the project root against the database configured in configuration_files/config.ini,
+once before and once after applying the migration that changes the trigger:
+    python -m benchmarks.order_item_snapshot_benchmark --rows 5000 --chunk-size 500
+
+The menu items and the order created by the benchmark are deleted afterwards.
+"""
+import argparse
+import time
+
+from src.data_access_layer.database_connector import DatabaseConnector
+from src.data_access_layer.menu_items_DAO import MenuItemsDAO
+from src.data_access_layer.orders_DAO import OrdersDAO
+from src.objects.menu_item import MenuItem
+from src.objects.order import Order
+
+
+def insert_order_items(order_id: int, menu_items: list[MenuItem], rows: int, chunk_size: int):
+    """
+    Inserts rows order items into the order with multi-row INSERTs and commits them.
+    :param order_id:
+    :param menu_items: menu items used in turn
+    :param rows:
+    :param chunk_size:
+    :return: seconds taken
+    """
+    connector = DatabaseConnector()
+    connection = connector.connect()
+    try:
+        start = time.perf_counter()
+        for first in range(0, rows, chunk_size):
+            count = min(chunk_size, rows - first)
+            sql = "INSERT INTO order_items (order_id, menu_item_id, quantity) VALUES " + ", ".join(["(%s, %s, %s)"] * count)
+            params = []
+            for i in range(first, first + count):
+                params.extend((order_id, menu_items[i % len(menu_items)].id, 1 + i % 3))
+            connector.execute(connection, sql, params, prepared=count == chunk_size)
+        connection.commit()
+        return time.perf_counter() - start
+    finally:
+        connector.release()
+
+
+def check_snapshots(order_id: int) -> int:
+    """
+    Compares the snapshot columns of the order items with their menu items.
+    :param order_id:
+    :return: number of checked order items
+    """
+    connector = DatabaseConnector()
+    sql = """
+          SELECT oi.item_name = mi.name AND oi.item_type = mi.item_type AND oi.item_price = mi.price
+                 AND oi.vat_percentage = mi.vat_percentage AND oi.item_vat = mi.vat
+                 AND oi.total_price = mi.price * oi.quantity AND oi.total_vat = mi.vat * oi.quantity
+          FROM order_items oi JOIN menu_items mi ON mi.id = oi.menu_item_id
+          WHERE oi.order_id = %s
+          """
+    connection = connector.connect()
+    try:
+        rows = connector.execute(connection, sql, (order_id,)).fetchall()
+    finally:
+        connector.release()
+
+    if not all(row[0] for row in rows):
+        raise RuntimeError(f"Order {order_id} has order items whose snapshot differs from the menu item")
+    return len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=5000, help="order items inserted per run")
+    parser.add_argument("--chunk-size", type=int, default=None, help="rows per multi-row INSERT")
+    parser.add_argument("--repeat", type=int, default=3, help="runs")
+    args = parser.parse_args()
+
+    chunk_size = args.chunk_size or DatabaseConnector().bulk_insert_chunk_size
+    orders_dao = OrdersDAO()
+    menu_items_dao = MenuItemsDAO()
+
+    menu_items = [MenuItem(f"Bench snapshot {i}", "main", 3 + i * 0.35, 15) for i in range(100)]
+    menu_items_dao.add(menu_items)
+
+    try:
+        runs = []
+        for _ in range(args.repeat):
+            order = Order(None, "Bench snapshot", False)
+            orders_dao.create(order)
+            try:
+                runs.append(insert_order_items(order.id, menu_items, args.rows, chunk_size))
+                check_snapshots(order.id)
+            finally:
+                orders_dao.delete(order.id)
+    finally:
+        for menu_item in menu_items:
+            menu_items_dao.delete(menu_item.id)
+
+    best = min(runs)
+    print(f"{'rows':>8}{'chunk':>8}{'ms':>12}{'us/row':>10}{'rows/s':>12}")
+    print(f"{args.rows:>8}{chunk_size:>8}{best * 1000:>12.1f}{best * 1e6 / args.rows:>10.1f}{args.rows / best:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
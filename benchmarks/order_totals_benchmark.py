@@ -0,0 +1,111 @@
+"""
+Measures how creating and editing large orders scales with the number of order lines.
+The order total triggers run once per changed line, so the time per line should stay flat as orders grow.
+
+Run from the project root against the database configured in configuration_files/config.ini:
+    python -m benchmarks.order_totals_benchmark --lines 50 100 200 400
+
+The employee, menu items and orders created by the benchmark are deleted afterwards.
+"""
+import argparse
+import time
+
+from src.data_access_layer.database_connector import DatabaseConnector
+from src.data_access_layer.employees_DAO import EmployeesDAO
+from src.data_access_layer.menu_items_DAO import MenuItemsDAO
+from src.data_access_layer.orders_DAO import OrdersDAO
+from src.objects.employee import Employee
+from src.objects.menu_item import MenuItem
+from src.objects.order import Order
+from src.objects.order_item import OrderItem
+
+
+def check_totals(order_id: int):
+    """
+    Compares the stored order totals with the sum of its order items.
+    :param order_id:
+    :return:
+    """
+    connector = DatabaseConnector()
+    sql = """
+          SELECT o.total_price, o.total_vat,
+                 (SELECT IFNULL(SUM(total_price), 0) FROM order_items WHERE order_id = o.id),
+                 (SELECT IFNULL(SUM(total_vat), 0) FROM order_items WHERE order_id = o.id)
+          FROM orders o WHERE o.id = %s
+          """
+    connection = connector.connect()
+    try:
+        row = connector.execute(connection, sql, (order_id,)).fetchone()
+    finally:
+        connector.release()
+
+    if round(float(row[0]), 2) != round(float(row[2]), 2) or round(float(row[1]), 2) != round(float(row[3]), 2):
+        raise RuntimeError(f"Order {order_id} totals {row[0]}/{row[1]} differ from its items {row[2]}/{row[3]}")
+
+
+def measure(lines: int, employee: Employee, menu_items: list[MenuItem]):
+    """
+    Creates an order with the given number of lines, changes every quantity, removes half of the lines
+    and deletes the order.
+    :param lines:
+    :param employee:
+    :param menu_items:
+    :return: dict of step name -> seconds
+    """
+    orders_dao = OrdersDAO()
+    order = Order(employee.id, f"Bench {lines} lines", False)
+    order.order_items = [OrderItem(menu_items[i], 1 + i % 3) for i in range(lines)]
+
+    timings = {}
+    start = time.perf_counter()
+    orders_dao.create(order)
+    timings["create"] = time.perf_counter() - start
+    check_totals(order.id)
+
+    try:
+        for item in order.order_items:
+            item.quantity += 1
+        start = time.perf_counter()
+        orders_dao.update(order)
+        timings["update quantities"] = time.perf_counter() - start
+        check_totals(order.id)
+
+        order.order_items = order.order_items[:lines // 2]
+        start = time.perf_counter()
+        orders_dao.update(order)
+        timings["remove half"] = time.perf_counter() - start
+        check_totals(order.id)
+    finally:
+        orders_dao.delete(order.id)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, nargs="+", default=[50, 100, 200], help="order lines per order")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per order size")
+    args = parser.parse_args()
+
+    employees_dao = EmployeesDAO()
+    menu_items_dao = MenuItemsDAO()
+
+    employee = Employee("Bench", "Orders")
+    employees_dao.add(employee)
+    menu_items = [MenuItem(f"Bench item {i}", "main", 5 + i % 20 + 0.45, 21) for i in range(max(args.lines))]
+    menu_items_dao.add(menu_items)
+
+    try:
+        print(f"{'lines':>6}  {'step':<20}{'ms':>10}{'ms/line':>10}")
+        for lines in args.lines:
+            runs = [measure(lines, employee, menu_items) for _ in range(args.repeat)]
+            for step in runs[0]:
+                seconds = min(run[step] for run in runs)
+                print(f"{lines:>6}  {step:<20}{seconds * 1000:>10.1f}{seconds * 1000 / lines:>10.3f}")
+    finally:
+        for menu_item in menu_items:
+            menu_items_dao.delete(menu_item.id)
+        employees_dao.delete(employee.id)
+
+
+if __name__ == "__main__":
+    main()
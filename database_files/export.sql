@@ -17,6 +17,50 @@ USE `restaurant`;
 /*!40101 SET @OLD_SQL_MODE=@@SQL_MODE, SQL_MODE='NO_AUTO_VALUE_ON_ZERO' */;
 /*!40111 SET @OLD_SQL_NOTES=@@SQL_NOTES, SQL_NOTES=0 */;
 
+--
+-- Table structure for table `change_counters`
+--
+
+DROP TABLE IF EXISTS `change_counters`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!50503 SET character_set_client = utf8mb4 */;
+CREATE TABLE `change_counters` (
+  `name` varchar(64) NOT NULL,
+  `version` bigint NOT NULL DEFAULT '0',
+  PRIMARY KEY (`name`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+/*!40101 SET character_set_client = @saved_cs_client */;
+
+--
+-- Dumping data for table `change_counters`
+--
+
+LOCK TABLES `change_counters` WRITE;
+/*!40000 ALTER TABLE `change_counters` DISABLE KEYS */;
+INSERT INTO `change_counters` VALUES ('employees',0),('menu_items',0);
+/*!40000 ALTER TABLE `change_counters` ENABLE KEYS */;
+UNLOCK TABLES;
+
+--
+-- Table structure for table `daily_product_sales`
+--
+
+DROP TABLE IF EXISTS `daily_product_sales`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!50503 SET character_set_client = utf8mb4 */;
+CREATE TABLE `daily_product_sales` (
+  `sales_date` date NOT NULL,
+  `menu_item_id` int NOT NULL,
+  `orders_count` int NOT NULL,
+  `quantity` int NOT NULL,
+  `revenue` decimal(12,2) NOT NULL,
+  `vat` decimal(12,2) NOT NULL,
+  PRIMARY KEY (`sales_date`,`menu_item_id`),
+  KEY `menu_item_id` (`menu_item_id`),
+  CONSTRAINT `daily_product_sales_ibfk_1` FOREIGN KEY (`menu_item_id`) REFERENCES `menu_items` (`id`) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+/*!40101 SET character_set_client = @saved_cs_client */;
+
 --
 -- Table structure for table `employees`
 --
@@ -31,6 +75,57 @@ CREATE TABLE `employees` (
   PRIMARY KEY (`id`)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 /*!40101 SET character_set_client = @saved_cs_client */;
+/*!50003 SET @saved_cs_client      = @@character_set_client */ ;
+/*!50003 SET @saved_cs_results     = @@character_set_results */ ;
+/*!50003 SET @saved_col_connection = @@collation_connection */ ;
+/*!50003 SET character_set_client  = utf8mb4 */ ;
+/*!50003 SET character_set_results = utf8mb4 */ ;
+/*!50003 SET collation_connection  = utf8mb4_0900_ai_ci */ ;
+/*!50003 SET @saved_sql_mode       = @@sql_mode */ ;
+/*!50003 SET sql_mode              = 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION' */ ;
+DELIMITER ;;
+/*!50003 CREATE*/ /*!50017 DEFINER=`root`@`localhost`*/ /*!50003 TRIGGER `employees_changes_ins` AFTER INSERT ON `employees` FOR EACH ROW BEGIN
+    UPDATE change_counters SET version = version + 1 WHERE name = 'employees';
+END */;;
+DELIMITER ;
+/*!50003 SET sql_mode              = @saved_sql_mode */ ;
+/*!50003 SET character_set_client  = @saved_cs_client */ ;
+/*!50003 SET character_set_results = @saved_cs_results */ ;
+/*!50003 SET collation_connection  = @saved_col_connection */ ;
+/*!50003 SET @saved_cs_client      = @@character_set_client */ ;
+/*!50003 SET @saved_cs_results     = @@character_set_results */ ;
+/*!50003 SET @saved_col_connection = @@collation_connection */ ;
+/*!50003 SET character_set_client  = utf8mb4 */ ;
+/*!50003 SET character_set_results = utf8mb4 */ ;
+/*!50003 SET collation_connection  = utf8mb4_0900_ai_ci */ ;
+/*!50003 SET @saved_sql_mode       = @@sql_mode */ ;
+/*!50003 SET sql_mode              = 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION' */ ;
+DELIMITER ;;
+/*!50003 CREATE*/ /*!50017 DEFINER=`root`@`localhost`*/ /*!50003 TRIGGER `employees_changes_upd` AFTER UPDATE ON `employees` FOR EACH ROW BEGIN
+    UPDATE change_counters SET version = version + 1 WHERE name = 'employees';
+END */;;
+DELIMITER ;
+/*!50003 SET sql_mode              = @saved_sql_mode */ ;
+/*!50003 SET character_set_client  = @saved_cs_client */ ;
+/*!50003 SET character_set_results = @saved_cs_results */ ;
+/*!50003 SET collation_connection  = @saved_col_connection */ ;
+/*!50003 SET @saved_cs_client      = @@character_set_client */ ;
+/*!50003 SET @saved_cs_results     = @@character_set_results */ ;
+/*!50003 SET @saved_col_connection = @@collation_connection */ ;
+/*!50003 SET character_set_client  = utf8mb4 */ ;
+/*!50003 SET character_set_results = utf8mb4 */ ;
+/*!50003 SET collation_connection  = utf8mb4_0900_ai_ci */ ;
+/*!50003 SET @saved_sql_mode       = @@sql_mode */ ;
+/*!50003 SET sql_mode              = 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION' */ ;
+DELIMITER ;;
+/*!50003 CREATE*/ /*!50017 DEFINER=`root`@`localhost`*/ /*!50003 TRIGGER `employees_changes_del` AFTER DELETE ON `employees` FOR EACH ROW BEGIN
+    UPDATE change_counters SET version = version + 1 WHERE name = 'employees';
+END */;;
+DELIMITER ;
+/*!50003 SET sql_mode              = @saved_sql_mode */ ;
+/*!50003 SET character_set_client  = @saved_cs_client */ ;
+/*!50003 SET character_set_results = @saved_cs_results */ ;
+/*!50003 SET collation_connection  = @saved_col_connection */ ;
 
 --
 -- Table structure for table `menu_items`
@@ -83,6 +178,74 @@ DELIMITER ;
 /*!50003 SET character_set_client  = @saved_cs_client */ ;
 /*!50003 SET character_set_results = @saved_cs_results */ ;
 /*!50003 SET collation_connection  = @saved_col_connection */ ;
+/*!50003 SET @saved_cs_client      = @@character_set_client */ ;
+/*!50003 SET @saved_cs_results     = @@character_set_results */ ;
+/*!50003 SET @saved_col_connection = @@collation_connection */ ;
+/*!50003 SET character_set_client  = utf8mb4 */ ;
+/*!50003 SET character_set_results = utf8mb4 */ ;
+/*!50003 SET collation_connection  = utf8mb4_0900_ai_ci */ ;
+/*!50003 SET @saved_sql_mode       = @@sql_mode */ ;
+/*!50003 SET sql_mode              = 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION' */ ;
+DELIMITER ;;
+/*!50003 CREATE*/ /*!50017 DEFINER=`root`@`localhost`*/ /*!50003 TRIGGER `menu_items_changes_ins` AFTER INSERT ON `menu_items` FOR EACH ROW BEGIN
+    UPDATE change_counters SET version = version + 1 WHERE name = 'menu_items';
+END */;;
+DELIMITER ;
+/*!50003 SET sql_mode              = @saved_sql_mode */ ;
+/*!50003 SET character_set_client  = @saved_cs_client */ ;
+/*!50003 SET character_set_results = @saved_cs_results */ ;
+/*!50003 SET collation_connection  = @saved_col_connection */ ;
+/*!50003 SET @saved_cs_client      = @@character_set_client */ ;
+/*!50003 SET @saved_cs_results     = @@character_set_results */ ;
+/*!50003 SET @saved_col_connection = @@collation_connection */ ;
+/*!50003 SET character_set_client  = utf8mb4 */ ;
+/*!50003 SET character_set_results = utf8mb4 */ ;
+/*!50003 SET collation_connection  = utf8mb4_0900_ai_ci */ ;
+/*!50003 SET @saved_sql_mode       = @@sql_mode */ ;
+/*!50003 SET sql_mode              = 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION' */ ;
+DELIMITER ;;
+/*!50003 CREATE*/ /*!50017 DEFINER=`root`@`localhost`*/ /*!50003 TRIGGER `menu_items_changes_upd` AFTER UPDATE ON `menu_items` FOR EACH ROW BEGIN
+    UPDATE change_counters SET version = version + 1 WHERE name = 'menu_items';
+END */;;
+DELIMITER ;
+/*!50003 SET sql_mode              = @saved_sql_mode */ ;
+/*!50003 SET character_set_client  = @saved_cs_client */ ;
+/*!50003 SET character_set_results = @saved_cs_results */ ;
+/*!50003 SET collation_connection  = @saved_col_connection */ ;
+/*!50003 SET @saved_cs_client      = @@character_set_client */ ;
+/*!50003 SET @saved_cs_results     = @@character_set_results */ ;
+/*!50003 SET @saved_col_connection = @@collation_connection */ ;
+/*!50003 SET character_set_client  = utf8mb4 */ ;
+/*!50003 SET character_set_results = utf8mb4 */ ;
+/*!50003 SET collation_connection  = utf8mb4_0900_ai_ci */ ;
+/*!50003 SET @saved_sql_mode       = @@sql_mode */ ;
+/*!50003 SET sql_mode              = 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION' */ ;
+DELIMITER ;;
+/*!50003 CREATE*/ /*!50017 DEFINER=`root`@`localhost`*/ /*!50003 TRIGGER `menu_items_changes_del` AFTER DELETE ON `menu_items` FOR EACH ROW BEGIN
+    UPDATE change_counters SET version = version + 1 WHERE name = 'menu_items';
+END */;;
+DELIMITER ;
+/*!50003 SET sql_mode              = @saved_sql_mode */ ;
+/*!50003 SET character_set_client  = @saved_cs_client */ ;
+/*!50003 SET character_set_results = @saved_cs_results */ ;
+/*!50003 SET collation_connection  = @saved_col_connection */ ;
+
+--
+-- Table structure for table `order_changes`
+--
+
+DROP TABLE IF EXISTS `order_changes`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!50503 SET character_set_client = utf8mb4 */;
+CREATE TABLE `order_changes` (
+  `id` bigint NOT NULL AUTO_INCREMENT,
+  `order_id` int NOT NULL,
+  `is_open` tinyint NOT NULL,
+  `changed_at` timestamp NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (`id`),
+  KEY `idx_order_changes_changed_at` (`changed_at`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+/*!40101 SET character_set_client = @saved_cs_client */;
 
 --
 -- Table structure for table `order_items`
@@ -103,9 +266,10 @@ CREATE TABLE `order_items` (
   `quantity` int NOT NULL,
   `total_price` decimal(10,2) NOT NULL,
   `total_vat` decimal(10,2) NOT NULL,
+  `version` int NOT NULL DEFAULT '1',
   PRIMARY KEY (`id`),
-  KEY `order_id` (`order_id`),
   KEY `menu_item_id` (`menu_item_id`),
+  KEY `idx_order_items_order_covering` (`order_id`,`menu_item_id`,`quantity`,`total_price`,`total_vat`),
   CONSTRAINT `order_items_ibfk_1` FOREIGN KEY (`order_id`) REFERENCES `orders` (`id`) ON DELETE CASCADE,
   CONSTRAINT `order_items_ibfk_2` FOREIGN KEY (`menu_item_id`) REFERENCES `menu_items` (`id`) ON DELETE SET NULL
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
@@ -120,13 +284,24 @@ CREATE TABLE `order_items` (
 /*!50003 SET sql_mode              = 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION' */ ;
 DELIMITER ;;
 /*!50003 CREATE*/ /*!50017 DEFINER=`root`@`localhost`*/ /*!50003 TRIGGER `order_items_snapshot_menu_item` BEFORE INSERT ON `order_items` FOR EACH ROW BEGIN
-    SET NEW.item_name = (SELECT name FROM menu_items WHERE id = NEW.menu_item_id);
-    SET NEW.item_type = (SELECT item_type FROM menu_items WHERE id = NEW.menu_item_id);
-    SET NEW.item_price = (SELECT price FROM menu_items WHERE id = NEW.menu_item_id);
-    SET NEW.vat_percentage = (SELECT vat_percentage FROM menu_items WHERE id = NEW.menu_item_id);
-    SET NEW.item_vat = (SELECT vat FROM menu_items WHERE id = NEW.menu_item_id);
-    SET NEW.total_price = NEW.item_price * NEW.quantity;
-    SET NEW.total_vat = NEW.item_vat * NEW.quantity;
+    DECLARE v_name VARCHAR(255);
+    DECLARE v_item_type VARCHAR(20);
+    DECLARE v_price DECIMAL(10,2);
+    DECLARE v_vat_percentage TINYINT;
+    DECLARE v_vat DECIMAL(10,2);
+
+    SELECT name, item_type, price, vat_percentage, vat
+    INTO v_name, v_item_type, v_price, v_vat_percentage, v_vat
+    FROM menu_items
+    WHERE id = NEW.menu_item_id;
+
+    SET NEW.item_name = v_name;
+    SET NEW.item_type = v_item_type;
+    SET NEW.item_price = v_price;
+    SET NEW.vat_percentage = v_vat_percentage;
+    SET NEW.item_vat = v_vat;
+    SET NEW.total_price = v_price * NEW.quantity;
+    SET NEW.total_vat = v_vat * NEW.quantity;
 END */;;
 DELIMITER ;
 /*!50003 SET sql_mode              = @saved_sql_mode */ ;
@@ -144,8 +319,8 @@ DELIMITER ;
 DELIMITER ;;
 /*!50003 CREATE*/ /*!50017 DEFINER=`root`@`localhost`*/ /*!50003 TRIGGER `orders_update_totals_ins` AFTER INSERT ON `order_items` FOR EACH ROW BEGIN
     UPDATE orders
-    SET total_price = IFNULL((SELECT SUM(total_price) FROM order_items WHERE order_id = NEW.order_id), 0),
-        total_vat = IFNULL((SELECT SUM(total_vat) FROM order_items WHERE order_id = NEW.order_id), 0)
+    SET total_price = IFNULL(total_price, 0) + NEW.total_price,
+        total_vat = IFNULL(total_vat, 0) + NEW.total_vat
     WHERE id = NEW.order_id;
 END */;;
 DELIMITER ;
@@ -181,16 +356,23 @@ DELIMITER ;
 /*!50003 SET sql_mode              = 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION' */ ;
 DELIMITER ;;
 /*!50003 CREATE*/ /*!50017 DEFINER=`root`@`localhost`*/ /*!50003 TRIGGER `orders_update_totals_upd` AFTER UPDATE ON `order_items` FOR EACH ROW BEGIN
-    UPDATE orders
-    SET total_price = IFNULL((SELECT SUM(total_price) FROM order_items WHERE order_id = NEW.order_id), 0),
-        total_vat = IFNULL((SELECT SUM(total_vat) FROM order_items WHERE order_id = NEW.order_id), 0)
-    WHERE id = NEW.order_id;
-    
-    IF OLD.order_id <> NEW.order_id THEN
+    IF OLD.order_id = NEW.order_id THEN
+        IF OLD.total_price <> NEW.total_price OR OLD.total_vat <> NEW.total_vat THEN
+            UPDATE orders
+            SET total_price = IFNULL(total_price, 0) + NEW.total_price - OLD.total_price,
+                total_vat = IFNULL(total_vat, 0) + NEW.total_vat - OLD.total_vat
+            WHERE id = NEW.order_id;
+        END IF;
+    ELSE
         UPDATE orders
-        SET total_price = IFNULL((SELECT SUM(total_price) FROM order_items WHERE order_id = OLD.order_id), 0),
-            total_vat = IFNULL((SELECT SUM(total_vat) FROM order_items WHERE order_id = OLD.order_id), 0)
+        SET total_price = IFNULL(total_price, 0) - OLD.total_price,
+            total_vat = IFNULL(total_vat, 0) - OLD.total_vat
         WHERE id = OLD.order_id;
+
+        UPDATE orders
+        SET total_price = IFNULL(total_price, 0) + NEW.total_price,
+            total_vat = IFNULL(total_vat, 0) + NEW.total_vat
+        WHERE id = NEW.order_id;
     END IF;
 END */;;
 DELIMITER ;
@@ -209,8 +391,8 @@ DELIMITER ;
 DELIMITER ;;
 /*!50003 CREATE*/ /*!50017 DEFINER=`root`@`localhost`*/ /*!50003 TRIGGER `orders_update_totals_del` AFTER DELETE ON `order_items` FOR EACH ROW BEGIN
     UPDATE orders
-    SET total_price = IFNULL((SELECT SUM(total_price) FROM order_items WHERE order_id = OLD.order_id), 0),
-        total_vat = IFNULL((SELECT SUM(total_vat) FROM order_items WHERE order_id = OLD.order_id), 0)
+    SET total_price = IFNULL(total_price, 0) - OLD.total_price,
+        total_vat = IFNULL(total_vat, 0) - OLD.total_vat
     WHERE id = OLD.order_id;
 END */;;
 DELIMITER ;
@@ -218,6 +400,26 @@ DELIMITER ;
 /*!50003 SET character_set_client  = @saved_cs_client */ ;
 /*!50003 SET character_set_results = @saved_cs_results */ ;
 /*!50003 SET collation_connection  = @saved_col_connection */ ;
+/*!50003 SET @saved_cs_client      = @@character_set_client */ ;
+/*!50003 SET @saved_cs_results     = @@character_set_results */ ;
+/*!50003 SET @saved_col_connection = @@collation_connection */ ;
+/*!50003 SET character_set_client  = utf8mb4 */ ;
+/*!50003 SET character_set_results = utf8mb4 */ ;
+/*!50003 SET collation_connection  = utf8mb4_0900_ai_ci */ ;
+/*!50003 SET @saved_sql_mode       = @@sql_mode */ ;
+/*!50003 SET sql_mode              = 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION' */ ;
+DELIMITER ;;
+/*!50003 CREATE*/ /*!50017 DEFINER=`root`@`localhost`*/ /*!50003 TRIGGER `order_items_changes_upd` AFTER UPDATE ON `order_items` FOR EACH ROW BEGIN
+    IF OLD.order_id = NEW.order_id AND OLD.total_price = NEW.total_price AND OLD.total_vat = NEW.total_vat THEN
+        INSERT INTO order_changes (order_id, is_open)
+        VALUES (NEW.order_id, COALESCE((SELECT is_paid = 0 FROM orders WHERE id = NEW.order_id), 0));
+    END IF;
+END */;;
+DELIMITER ;
+/*!50003 SET sql_mode              = @saved_sql_mode */ ;
+/*!50003 SET character_set_client  = @saved_cs_client */ ;
+/*!50003 SET character_set_results = @saved_cs_results */ ;
+/*!50003 SET collation_connection  = @saved_col_connection */ ;
 
 --
 -- Table structure for table `orders`
@@ -236,8 +438,11 @@ CREATE TABLE `orders` (
   `is_paid` tinyint NOT NULL,
   `total_price` decimal(10,2) DEFAULT '0.00',
   `total_vat` decimal(10,2) DEFAULT '0.00',
+  `version` int NOT NULL DEFAULT '1',
   PRIMARY KEY (`id`),
   KEY `employee_id` (`employee_id`),
+  KEY `idx_orders_is_paid` (`is_paid`),
+  KEY `idx_orders_creation_date` (`creation_date`),
   CONSTRAINT `orders_ibfk_1` FOREIGN KEY (`employee_id`) REFERENCES `employees` (`id`) ON DELETE SET NULL
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 /*!40101 SET character_set_client = @saved_cs_client */;
@@ -261,6 +466,205 @@ DELIMITER ;
 /*!50003 SET character_set_client  = @saved_cs_client */ ;
 /*!50003 SET character_set_results = @saved_cs_results */ ;
 /*!50003 SET collation_connection  = @saved_col_connection */ ;
+/*!50003 SET @saved_cs_client      = @@character_set_client */ ;
+/*!50003 SET @saved_cs_results     = @@character_set_results */ ;
+/*!50003 SET @saved_col_connection = @@collation_connection */ ;
+/*!50003 SET character_set_client  = utf8mb4 */ ;
+/*!50003 SET character_set_results = utf8mb4 */ ;
+/*!50003 SET collation_connection  = utf8mb4_0900_ai_ci */ ;
+/*!50003 SET @saved_sql_mode       = @@sql_mode */ ;
+/*!50003 SET sql_mode              = 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION' */ ;
+DELIMITER ;;
+/*!50003 CREATE*/ /*!50017 DEFINER=`root`@`localhost`*/ /*!50003 TRIGGER `orders_sales_rollup_paid` AFTER UPDATE ON `orders` FOR EACH ROW BEGIN
+    DECLARE v_sign INT;
+
+    IF OLD.is_paid <> NEW.is_paid THEN
+        SET v_sign = IF(NEW.is_paid <> 0, 1, -1);
+
+        INSERT INTO daily_product_sales (sales_date, menu_item_id, orders_count, quantity, revenue, vat)
+        SELECT * FROM (
+            SELECT DATE(NEW.creation_date) AS sales_date, menu_item_id, v_sign AS orders_count,
+                   v_sign * SUM(quantity) AS quantity, v_sign * SUM(total_price) AS revenue, v_sign * SUM(total_vat) AS vat
+            FROM order_items
+            WHERE order_id = NEW.id AND menu_item_id IS NOT NULL
+            GROUP BY menu_item_id
+        ) AS changes
+        ON DUPLICATE KEY UPDATE
+            orders_count = daily_product_sales.orders_count + changes.orders_count,
+            quantity = daily_product_sales.quantity + changes.quantity,
+            revenue = daily_product_sales.revenue + changes.revenue,
+            vat = daily_product_sales.vat + changes.vat;
+
+        DELETE FROM daily_product_sales WHERE sales_date = DATE(NEW.creation_date) AND orders_count = 0;
+    END IF;
+END */;;
+DELIMITER ;
+/*!50003 SET sql_mode              = @saved_sql_mode */ ;
+/*!50003 SET character_set_client  = @saved_cs_client */ ;
+/*!50003 SET character_set_results = @saved_cs_results */ ;
+/*!50003 SET collation_connection  = @saved_col_connection */ ;
+/*!50003 SET @saved_cs_client      = @@character_set_client */ ;
+/*!50003 SET @saved_cs_results     = @@character_set_results */ ;
+/*!50003 SET @saved_col_connection = @@collation_connection */ ;
+/*!50003 SET character_set_client  = utf8mb4 */ ;
+/*!50003 SET character_set_results = utf8mb4 */ ;
+/*!50003 SET collation_connection  = utf8mb4_0900_ai_ci */ ;
+/*!50003 SET @saved_sql_mode       = @@sql_mode */ ;
+/*!50003 SET sql_mode              = 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION' */ ;
+DELIMITER ;;
+/*!50003 CREATE*/ /*!50017 DEFINER=`root`@`localhost`*/ /*!50003 TRIGGER `orders_sales_rollup_del` BEFORE DELETE ON `orders` FOR EACH ROW BEGIN
+    IF OLD.is_paid <> 0 THEN
+        UPDATE daily_product_sales s
+        JOIN (
+            SELECT menu_item_id, SUM(quantity) AS quantity, SUM(total_price) AS revenue, SUM(total_vat) AS vat
+            FROM order_items
+            WHERE order_id = OLD.id AND menu_item_id IS NOT NULL
+            GROUP BY menu_item_id
+        ) AS changes ON changes.menu_item_id = s.menu_item_id
+        SET s.orders_count = s.orders_count - 1,
+            s.quantity = s.quantity - changes.quantity,
+            s.revenue = s.revenue - changes.revenue,
+            s.vat = s.vat - changes.vat
+        WHERE s.sales_date = DATE(OLD.creation_date);
+
+        DELETE FROM daily_product_sales WHERE sales_date = DATE(OLD.creation_date) AND orders_count = 0;
+    END IF;
+END */;;
+DELIMITER ;
+/*!50003 SET sql_mode              = @saved_sql_mode */ ;
+/*!50003 SET character_set_client  = @saved_cs_client */ ;
+/*!50003 SET character_set_results = @saved_cs_results */ ;
+/*!50003 SET collation_connection  = @saved_col_connection */ ;
+/*!50003 SET @saved_cs_client      = @@character_set_client */ ;
+/*!50003 SET @saved_cs_results     = @@character_set_results */ ;
+/*!50003 SET @saved_col_connection = @@collation_connection */ ;
+/*!50003 SET character_set_client  = utf8mb4 */ ;
+/*!50003 SET character_set_results = utf8mb4 */ ;
+/*!50003 SET collation_connection  = utf8mb4_0900_ai_ci */ ;
+/*!50003 SET @saved_sql_mode       = @@sql_mode */ ;
+/*!50003 SET sql_mode              = 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION' */ ;
+DELIMITER ;;
+/*!50003 CREATE*/ /*!50017 DEFINER=`root`@`localhost`*/ /*!50003 TRIGGER `orders_sales_changes_upd` AFTER UPDATE ON `orders` FOR EACH ROW BEGIN
+    IF OLD.is_paid <> 0 OR NEW.is_paid <> 0 THEN
+        INSERT INTO sales_day_changes (sales_date, version) VALUES (DATE(NEW.creation_date), 1)
+        ON DUPLICATE KEY UPDATE version = version + 1;
+    END IF;
+END */;;
+DELIMITER ;
+/*!50003 SET sql_mode              = @saved_sql_mode */ ;
+/*!50003 SET character_set_client  = @saved_cs_client */ ;
+/*!50003 SET character_set_results = @saved_cs_results */ ;
+/*!50003 SET collation_connection  = @saved_col_connection */ ;
+/*!50003 SET @saved_cs_client      = @@character_set_client */ ;
+/*!50003 SET @saved_cs_results     = @@character_set_results */ ;
+/*!50003 SET @saved_col_connection = @@collation_connection */ ;
+/*!50003 SET character_set_client  = utf8mb4 */ ;
+/*!50003 SET character_set_results = utf8mb4 */ ;
+/*!50003 SET collation_connection  = utf8mb4_0900_ai_ci */ ;
+/*!50003 SET @saved_sql_mode       = @@sql_mode */ ;
+/*!50003 SET sql_mode              = 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION' */ ;
+DELIMITER ;;
+/*!50003 CREATE*/ /*!50017 DEFINER=`root`@`localhost`*/ /*!50003 TRIGGER `orders_sales_changes_del` AFTER DELETE ON `orders` FOR EACH ROW BEGIN
+    IF OLD.is_paid <> 0 THEN
+        INSERT INTO sales_day_changes (sales_date, version) VALUES (DATE(OLD.creation_date), 1)
+        ON DUPLICATE KEY UPDATE version = version + 1;
+    END IF;
+END */;;
+DELIMITER ;
+/*!50003 SET sql_mode              = @saved_sql_mode */ ;
+/*!50003 SET character_set_client  = @saved_cs_client */ ;
+/*!50003 SET character_set_results = @saved_cs_results */ ;
+/*!50003 SET collation_connection  = @saved_col_connection */ ;
+/*!50003 SET @saved_cs_client      = @@character_set_client */ ;
+/*!50003 SET @saved_cs_results     = @@character_set_results */ ;
+/*!50003 SET @saved_col_connection = @@collation_connection */ ;
+/*!50003 SET character_set_client  = utf8mb4 */ ;
+/*!50003 SET character_set_results = utf8mb4 */ ;
+/*!50003 SET collation_connection  = utf8mb4_0900_ai_ci */ ;
+/*!50003 SET @saved_sql_mode       = @@sql_mode */ ;
+/*!50003 SET sql_mode              = 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION' */ ;
+DELIMITER ;;
+/*!50003 CREATE*/ /*!50017 DEFINER=`root`@`localhost`*/ /*!50003 TRIGGER `orders_changes_ins` AFTER INSERT ON `orders` FOR EACH ROW BEGIN
+    INSERT INTO order_changes (order_id, is_open) VALUES (NEW.id, NEW.is_paid = 0);
+END */;;
+DELIMITER ;
+/*!50003 SET sql_mode              = @saved_sql_mode */ ;
+/*!50003 SET character_set_client  = @saved_cs_client */ ;
+/*!50003 SET character_set_results = @saved_cs_results */ ;
+/*!50003 SET collation_connection  = @saved_col_connection */ ;
+/*!50003 SET @saved_cs_client      = @@character_set_client */ ;
+/*!50003 SET @saved_cs_results     = @@character_set_results */ ;
+/*!50003 SET @saved_col_connection = @@collation_connection */ ;
+/*!50003 SET character_set_client  = utf8mb4 */ ;
+/*!50003 SET character_set_results = utf8mb4 */ ;
+/*!50003 SET collation_connection  = utf8mb4_0900_ai_ci */ ;
+/*!50003 SET @saved_sql_mode       = @@sql_mode */ ;
+/*!50003 SET sql_mode              = 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION' */ ;
+DELIMITER ;;
+/*!50003 CREATE*/ /*!50017 DEFINER=`root`@`localhost`*/ /*!50003 TRIGGER `orders_changes_upd` AFTER UPDATE ON `orders` FOR EACH ROW BEGIN
+    INSERT INTO order_changes (order_id, is_open) VALUES (NEW.id, NEW.is_paid = 0);
+END */;;
+DELIMITER ;
+/*!50003 SET sql_mode              = @saved_sql_mode */ ;
+/*!50003 SET character_set_client  = @saved_cs_client */ ;
+/*!50003 SET character_set_results = @saved_cs_results */ ;
+/*!50003 SET collation_connection  = @saved_col_connection */ ;
+/*!50003 SET @saved_cs_client      = @@character_set_client */ ;
+/*!50003 SET @saved_cs_results     = @@character_set_results */ ;
+/*!50003 SET @saved_col_connection = @@collation_connection */ ;
+/*!50003 SET character_set_client  = utf8mb4 */ ;
+/*!50003 SET character_set_results = utf8mb4 */ ;
+/*!50003 SET collation_connection  = utf8mb4_0900_ai_ci */ ;
+/*!50003 SET @saved_sql_mode       = @@sql_mode */ ;
+/*!50003 SET sql_mode              = 'ONLY_FULL_GROUP_BY,STRICT_TRANS_TABLES,NO_ZERO_IN_DATE,NO_ZERO_DATE,ERROR_FOR_DIVISION_BY_ZERO,NO_ENGINE_SUBSTITUTION' */ ;
+DELIMITER ;;
+/*!50003 CREATE*/ /*!50017 DEFINER=`root`@`localhost`*/ /*!50003 TRIGGER `orders_changes_del` AFTER DELETE ON `orders` FOR EACH ROW BEGIN
+    INSERT INTO order_changes (order_id, is_open) VALUES (OLD.id, 0);
+END */;;
+DELIMITER ;
+/*!50003 SET sql_mode              = @saved_sql_mode */ ;
+/*!50003 SET character_set_client  = @saved_cs_client */ ;
+/*!50003 SET character_set_results = @saved_cs_results */ ;
+/*!50003 SET collation_connection  = @saved_col_connection */ ;
+
+--
+-- Table structure for table `schema_migrations`
+--
+
+DROP TABLE IF EXISTS `schema_migrations`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!50503 SET character_set_client = utf8mb4 */;
+CREATE TABLE `schema_migrations` (
+  `version` int NOT NULL,
+  `name` varchar(255) NOT NULL,
+  `applied_at` timestamp NOT NULL DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (`version`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+/*!40101 SET character_set_client = @saved_cs_client */;
+
+--
+-- Dumping data for table `schema_migrations`
+--
+
+LOCK TABLES `schema_migrations` WRITE;
+/*!40000 ALTER TABLE `schema_migrations` DISABLE KEYS */;
+INSERT INTO `schema_migrations` VALUES (1,'incremental_order_totals','2026-01-11 18:09:46'),(2,'single_lookup_order_item_snapshot','2026-01-11 18:09:46'),(3,'access_path_indexes','2026-01-11 18:09:46'),(4,'daily_product_sales','2026-01-11 18:09:46'),(5,'change_counters','2026-01-11 18:09:46'),(6,'order_changes','2026-01-11 18:09:46'),(7,'row_versions','2026-01-11 18:09:46'),(8,'employee_changes','2026-01-11 18:09:46');
+/*!40000 ALTER TABLE `schema_migrations` ENABLE KEYS */;
+UNLOCK TABLES;
+
+--
+-- Table structure for table `sales_day_changes`
+--
+
+DROP TABLE IF EXISTS `sales_day_changes`;
+/*!40101 SET @saved_cs_client     = @@character_set_client */;
+/*!50503 SET character_set_client = utf8mb4 */;
+CREATE TABLE `sales_day_changes` (
+  `sales_date` date NOT NULL,
+  `version` bigint NOT NULL DEFAULT '0',
+  PRIMARY KEY (`sales_date`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
+/*!40101 SET character_set_client = @saved_cs_client */;
 
 --
 -- Table structure for table `shifts`
@@ -277,8 +681,12 @@ CREATE TABLE `shifts` (
   `start_time` timestamp NOT NULL,
   `end_time` timestamp NOT NULL,
   `hourly_rate` decimal(10,2) NOT NULL,
+  `shift_date` date GENERATED ALWAYS AS (cast(`start_time` as date)) VIRTUAL,
+  `version` int NOT NULL DEFAULT '1',
   PRIMARY KEY (`id`),
   KEY `employee_id` (`employee_id`),
+  KEY `idx_shifts_start_time` (`start_time`),
+  KEY `idx_shifts_shift_date` (`shift_date`),
   CONSTRAINT `shifts_ibfk_1` FOREIGN KEY (`employee_id`) REFERENCES `employees` (`id`) ON DELETE SET NULL
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_0900_ai_ci;
 /*!40101 SET character_set_client = @saved_cs_client */;
@@ -320,7 +728,8 @@ SET @saved_cs_client     = @@character_set_client;
  1 AS `creation_date`,
  1 AS `is_paid`,
  1 AS `total_price`,
- 1 AS `total_vat`*/;
+ 1 AS `total_vat`,
+ 1 AS `version`*/;
 SET character_set_client = @saved_cs_client;
 
 --
@@ -375,7 +784,7 @@ SET character_set_client = @saved_cs_client;
 /*!50001 SET collation_connection      = utf8mb4_0900_ai_ci */;
 /*!50001 CREATE ALGORITHM=UNDEFINED */
 /*!50013 DEFINER=`root`@`localhost` SQL SECURITY DEFINER */
-/*!50001 VIEW `view_paid_orders` AS select `orders`.`id` AS `id`,`orders`.`employee_id` AS `employee_id`,`orders`.`employee_first_name` AS `employee_first_name`,`orders`.`employee_last_name` AS `employee_last_name`,`orders`.`name` AS `name`,`orders`.`creation_date` AS `creation_date`,`orders`.`is_paid` AS `is_paid`,`orders`.`total_price` AS `total_price`,`orders`.`total_vat` AS `total_vat` from `orders` where (`orders`.`is_paid` = 0) */;
+/*!50001 VIEW `view_paid_orders` AS select `orders`.`id` AS `id`,`orders`.`employee_id` AS `employee_id`,`orders`.`employee_first_name` AS `employee_first_name`,`orders`.`employee_last_name` AS `employee_last_name`,`orders`.`name` AS `name`,`orders`.`creation_date` AS `creation_date`,`orders`.`is_paid` AS `is_paid`,`orders`.`total_price` AS `total_price`,`orders`.`total_vat` AS `total_vat`,`orders`.`version` AS `version` from `orders` where (`orders`.`is_paid` = 0) */;
 /*!50001 SET character_set_client      = @saved_cs_client */;
 /*!50001 SET character_set_results     = @saved_cs_results */;
 /*!50001 SET collation_connection      = @saved_col_connection */;
@@ -411,7 +820,7 @@ SET character_set_client = @saved_cs_client;
 /*!50001 SET collation_connection      = utf8mb4_0900_ai_ci */;
 /*!50001 CREATE ALGORITHM=UNDEFINED */
 /*!50013 DEFINER=`root`@`localhost` SQL SECURITY DEFINER */
-/*!50001 VIEW `view_shifts_log` AS select `shifts`.`id` AS `id`,`shifts`.`employee_id` AS `employee_id`,`shifts`.`employee_first_name` AS `employee_first_name`,`shifts`.`employee_last_name` AS `employee_last_name`,`shifts`.`start_time` AS `start_time`,`shifts`.`end_time` AS `end_time`,`shifts`.`hourly_rate` AS `hourly_rate`,cast(`shifts`.`start_time` as date) AS `shift_date` from `shifts` */;
+/*!50001 VIEW `view_shifts_log` AS select `shifts`.`id` AS `id`,`shifts`.`employee_id` AS `employee_id`,`shifts`.`employee_first_name` AS `employee_first_name`,`shifts`.`employee_last_name` AS `employee_last_name`,`shifts`.`start_time` AS `start_time`,`shifts`.`end_time` AS `end_time`,`shifts`.`hourly_rate` AS `hourly_rate`,`shifts`.`shift_date` AS `shift_date` from `shifts` */;
 /*!50001 SET character_set_client      = @saved_cs_client */;
 /*!50001 SET character_set_results     = @saved_cs_results */;
 /*!50001 SET collation_connection      = @saved_col_connection */;
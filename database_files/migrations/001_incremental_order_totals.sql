@@ -0,0 +1,72 @@
+-- Replaces the order total triggers that re-run SUM over all items of the order for every
+-- inserted, updated or deleted order item with triggers that only apply the change.
+-- Existing totals are recomputed once so the increments start from correct values.
+
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version INT PRIMARY KEY,
+    name VARCHAR(255) NOT NULL,
+    applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+DROP TRIGGER IF EXISTS orders_update_totals_ins;
+DROP TRIGGER IF EXISTS orders_update_totals_upd;
+DROP TRIGGER IF EXISTS orders_update_totals_del;
+
+DELIMITER $$
+
+CREATE TRIGGER orders_update_totals_ins
+AFTER INSERT ON order_items
+FOR EACH ROW
+BEGIN
+    UPDATE orders
+    SET total_price = IFNULL(total_price, 0) + NEW.total_price,
+        total_vat = IFNULL(total_vat, 0) + NEW.total_vat
+    WHERE id = NEW.order_id;
+END$$
+
+CREATE TRIGGER orders_update_totals_upd
+AFTER UPDATE ON order_items
+FOR EACH ROW
+BEGIN
+    IF OLD.order_id = NEW.order_id THEN
+        IF OLD.total_price <> NEW.total_price OR OLD.total_vat <> NEW.total_vat THEN
+            UPDATE orders
+            SET total_price = IFNULL(total_price, 0) + NEW.total_price - OLD.total_price,
+                total_vat = IFNULL(total_vat, 0) + NEW.total_vat - OLD.total_vat
+            WHERE id = NEW.order_id;
+        END IF;
+    ELSE
+        UPDATE orders
+        SET total_price = IFNULL(total_price, 0) - OLD.total_price,
+            total_vat = IFNULL(total_vat, 0) - OLD.total_vat
+        WHERE id = OLD.order_id;
+
+        UPDATE orders
+        SET total_price = IFNULL(total_price, 0) + NEW.total_price,
+            total_vat = IFNULL(total_vat, 0) + NEW.total_vat
+        WHERE id = NEW.order_id;
+    END IF;
+END$$
+
+CREATE TRIGGER orders_update_totals_del
+AFTER DELETE ON order_items
+FOR EACH ROW
+BEGIN
+    UPDATE orders
+    SET total_price = IFNULL(total_price, 0) - OLD.total_price,
+        total_vat = IFNULL(total_vat, 0) - OLD.total_vat
+    WHERE id = OLD.order_id;
+END$$
+
+DELIMITER ;
+
+UPDATE orders o
+LEFT JOIN (
+    SELECT order_id, SUM(total_price) AS total_price, SUM(total_vat) AS total_vat
+    FROM order_items
+    GROUP BY order_id
+) t ON t.order_id = o.id
+SET o.total_price = IFNULL(t.total_price, 0),
+    o.total_vat = IFNULL(t.total_vat, 0);
+
+INSERT INTO schema_migrations (version, name) VALUES (1, 'incremental_order_totals');
@@ -0,0 +1,40 @@
+-- The snapshot of the menu item copied into a new order item is read with one lookup
+-- instead of five separate subqueries against menu_items.
+
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version INT PRIMARY KEY,
+    name VARCHAR(255) NOT NULL,
+    applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+DROP TRIGGER IF EXISTS order_items_snapshot_menu_item;
+
+DELIMITER $$
+
+CREATE TRIGGER order_items_snapshot_menu_item
+BEFORE INSERT ON order_items
+FOR EACH ROW
+BEGIN
+    DECLARE v_name VARCHAR(255);
+    DECLARE v_item_type VARCHAR(20);
+    DECLARE v_price DECIMAL(10,2);
+    DECLARE v_vat_percentage TINYINT;
+    DECLARE v_vat DECIMAL(10,2);
+
+    SELECT name, item_type, price, vat_percentage, vat
+    INTO v_name, v_item_type, v_price, v_vat_percentage, v_vat
+    FROM menu_items
+    WHERE id = NEW.menu_item_id;
+
+    SET NEW.item_name = v_name;
+    SET NEW.item_type = v_item_type;
+    SET NEW.item_price = v_price;
+    SET NEW.vat_percentage = v_vat_percentage;
+    SET NEW.item_vat = v_vat;
+    SET NEW.total_price = v_price * NEW.quantity;
+    SET NEW.total_vat = v_vat * NEW.quantity;
+END$$
+
+DELIMITER ;
+
+INSERT INTO schema_migrations (version, name) VALUES (2, 'single_lookup_order_item_snapshot');
@@ -0,0 +1,37 @@
+-- Indexes for the filters used by the DAOs and views:
+-- shifts by day, unpaid orders, order items by order and orders by creation date.
+-- view_shifts_log exposes shift_date as an indexed generated column instead of computing
+-- DATE(start_time), so filtering the view by day no longer scans every shift.
+-- The covering index on order_items also replaces the index MySQL created for its order_id foreign key.
+
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version INT PRIMARY KEY,
+    name VARCHAR(255) NOT NULL,
+    applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+ALTER TABLE shifts
+    ADD COLUMN shift_date DATE GENERATED ALWAYS AS (DATE(start_time)) VIRTUAL,
+    ADD INDEX idx_shifts_start_time (start_time),
+    ADD INDEX idx_shifts_shift_date (shift_date);
+
+ALTER TABLE orders
+    ADD INDEX idx_orders_is_paid (is_paid),
+    ADD INDEX idx_orders_creation_date (creation_date);
+
+ALTER TABLE order_items
+    ADD INDEX idx_order_items_order_covering (order_id, menu_item_id, quantity, total_price, total_vat);
+
+CREATE OR REPLACE VIEW view_shifts_log AS
+SELECT
+    id,
+    employee_id,
+    employee_first_name,
+    employee_last_name,
+    start_time,
+    end_time,
+    hourly_rate,
+    shift_date
+FROM shifts;
+
+INSERT INTO schema_migrations (version, name) VALUES (3, 'access_path_indexes');
@@ -0,0 +1,85 @@
+-- Daily sales per menu item of paid orders. The sales report reads whole days from this table
+-- and only aggregates the raw order items of partial days at the edges of the range.
+-- The triggers add an order when it is paid and remove it when it is unpaid or deleted.
+-- Existing paid orders are backfilled; python -m tools.rebuild_sales_rollup rebuilds the table at any time.
+
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version INT PRIMARY KEY,
+    name VARCHAR(255) NOT NULL,
+    applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE daily_product_sales (
+    sales_date DATE NOT NULL,
+    menu_item_id INT NOT NULL,
+    orders_count INT NOT NULL,
+    quantity INT NOT NULL,
+    revenue DECIMAL(12,2) NOT NULL,
+    vat DECIMAL(12,2) NOT NULL,
+    PRIMARY KEY (sales_date, menu_item_id),
+    FOREIGN KEY (menu_item_id)
+    REFERENCES menu_items(id)
+    ON DELETE CASCADE
+);
+
+DELIMITER $$
+
+CREATE TRIGGER orders_sales_rollup_paid
+AFTER UPDATE ON orders
+FOR EACH ROW
+BEGIN
+    DECLARE v_sign INT;
+
+    IF OLD.is_paid <> NEW.is_paid THEN
+        SET v_sign = IF(NEW.is_paid <> 0, 1, -1);
+
+        INSERT INTO daily_product_sales (sales_date, menu_item_id, orders_count, quantity, revenue, vat)
+        SELECT * FROM (
+            SELECT DATE(NEW.creation_date) AS sales_date, menu_item_id, v_sign AS orders_count,
+                   v_sign * SUM(quantity) AS quantity, v_sign * SUM(total_price) AS revenue, v_sign * SUM(total_vat) AS vat
+            FROM order_items
+            WHERE order_id = NEW.id AND menu_item_id IS NOT NULL
+            GROUP BY menu_item_id
+        ) AS changes
+        ON DUPLICATE KEY UPDATE
+            orders_count = daily_product_sales.orders_count + changes.orders_count,
+            quantity = daily_product_sales.quantity + changes.quantity,
+            revenue = daily_product_sales.revenue + changes.revenue,
+            vat = daily_product_sales.vat + changes.vat;
+
+        DELETE FROM daily_product_sales WHERE sales_date = DATE(NEW.creation_date) AND orders_count = 0;
+    END IF;
+END$$
+
+CREATE TRIGGER orders_sales_rollup_del
+BEFORE DELETE ON orders
+FOR EACH ROW
+BEGIN
+    IF OLD.is_paid <> 0 THEN
+        UPDATE daily_product_sales s
+        JOIN (
+            SELECT menu_item_id, SUM(quantity) AS quantity, SUM(total_price) AS revenue, SUM(total_vat) AS vat
+            FROM order_items
+            WHERE order_id = OLD.id AND menu_item_id IS NOT NULL
+            GROUP BY menu_item_id
+        ) AS changes ON changes.menu_item_id = s.menu_item_id
+        SET s.orders_count = s.orders_count - 1,
+            s.quantity = s.quantity - changes.quantity,
+            s.revenue = s.revenue - changes.revenue,
+            s.vat = s.vat - changes.vat
+        WHERE s.sales_date = DATE(OLD.creation_date);
+
+        DELETE FROM daily_product_sales WHERE sales_date = DATE(OLD.creation_date) AND orders_count = 0;
+    END IF;
+END$$
+
+DELIMITER ;
+
+INSERT INTO daily_product_sales (sales_date, menu_item_id, orders_count, quantity, revenue, vat)
+SELECT DATE(o.creation_date), oi.menu_item_id, COUNT(DISTINCT o.id), SUM(oi.quantity), SUM(oi.total_price), SUM(oi.total_vat)
+FROM orders o
+JOIN order_items oi ON oi.order_id = o.id
+WHERE o.is_paid = 1 AND oi.menu_item_id IS NOT NULL
+GROUP BY DATE(o.creation_date), oi.menu_item_id;
+
+INSERT INTO schema_migrations (version, name) VALUES (4, 'daily_product_sales');
@@ -0,0 +1,70 @@
+-- Change counters that let caches check cheaply whether their data is still current.
+-- change_counters.menu_items is incremented by every change of a menu item.
+-- sales_day_changes has one counter per day, incremented whenever a paid order of that day
+-- is changed, paid, unpaid or deleted, so a cached sales report only has to compare the
+-- counters of the days it covers.
+
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version INT PRIMARY KEY,
+    name VARCHAR(255) NOT NULL,
+    applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE change_counters (
+    name VARCHAR(64) PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0
+);
+
+INSERT INTO change_counters (name, version) VALUES ('menu_items', 0);
+
+CREATE TABLE sales_day_changes (
+    sales_date DATE PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0
+);
+
+DELIMITER $$
+
+CREATE TRIGGER menu_items_changes_ins
+AFTER INSERT ON menu_items
+FOR EACH ROW
+BEGIN
+    UPDATE change_counters SET version = version + 1 WHERE name = 'menu_items';
+END$$
+
+CREATE TRIGGER menu_items_changes_upd
+AFTER UPDATE ON menu_items
+FOR EACH ROW
+BEGIN
+    UPDATE change_counters SET version = version + 1 WHERE name = 'menu_items';
+END$$
+
+CREATE TRIGGER menu_items_changes_del
+AFTER DELETE ON menu_items
+FOR EACH ROW
+BEGIN
+    UPDATE change_counters SET version = version + 1 WHERE name = 'menu_items';
+END$$
+
+CREATE TRIGGER orders_sales_changes_upd
+AFTER UPDATE ON orders
+FOR EACH ROW
+BEGIN
+    IF OLD.is_paid <> 0 OR NEW.is_paid <> 0 THEN
+        INSERT INTO sales_day_changes (sales_date, version) VALUES (DATE(NEW.creation_date), 1)
+        ON DUPLICATE KEY UPDATE version = version + 1;
+    END IF;
+END$$
+
+CREATE TRIGGER orders_sales_changes_del
+AFTER DELETE ON orders
+FOR EACH ROW
+BEGIN
+    IF OLD.is_paid <> 0 THEN
+        INSERT INTO sales_day_changes (sales_date, version) VALUES (DATE(OLD.creation_date), 1)
+        ON DUPLICATE KEY UPDATE version = version + 1;
+    END IF;
+END$$
+
+DELIMITER ;
+
+INSERT INTO schema_migrations (version, name) VALUES (5, 'change_counters');
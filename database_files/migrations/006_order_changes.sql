@@ -0,0 +1,58 @@
+-- Change log of the orders and their order items, read by terminals that poll for changes made by others.
+-- Entries are numbered by an AUTO_INCREMENT id, so writers never wait for each other. Ids are taken when a row
+-- is inserted, so a transaction can still commit an entry below an id that is already visible, and a rolled back
+-- one leaves a gap. Pollers only move their cursor past a gap once the entry after it is older than a few seconds,
+-- so an entry committed later than that after its changed_at is skipped.
+-- is_open is 0 when the order was paid or deleted. Order item changes update the totals of their order
+-- and are logged through it, only changes that leave the totals as they are get their own entry.
+
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version INT PRIMARY KEY,
+    name VARCHAR(255) NOT NULL,
+    applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE order_changes (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    order_id INT NOT NULL,
+    is_open TINYINT NOT NULL,
+    changed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_order_changes_changed_at (changed_at)
+);
+
+DELIMITER $$
+
+CREATE TRIGGER orders_changes_ins
+AFTER INSERT ON orders
+FOR EACH ROW
+BEGIN
+    INSERT INTO order_changes (order_id, is_open) VALUES (NEW.id, NEW.is_paid = 0);
+END$$
+
+CREATE TRIGGER orders_changes_upd
+AFTER UPDATE ON orders
+FOR EACH ROW
+BEGIN
+    INSERT INTO order_changes (order_id, is_open) VALUES (NEW.id, NEW.is_paid = 0);
+END$$
+
+CREATE TRIGGER orders_changes_del
+AFTER DELETE ON orders
+FOR EACH ROW
+BEGIN
+    INSERT INTO order_changes (order_id, is_open) VALUES (OLD.id, 0);
+END$$
+
+CREATE TRIGGER order_items_changes_upd
+AFTER UPDATE ON order_items
+FOR EACH ROW
+BEGIN
+    IF OLD.order_id = NEW.order_id AND OLD.total_price = NEW.total_price AND OLD.total_vat = NEW.total_vat THEN
+        INSERT INTO order_changes (order_id, is_open)
+        VALUES (NEW.order_id, COALESCE((SELECT is_paid = 0 FROM orders WHERE id = NEW.order_id), 0));
+    END IF;
+END$$
+
+DELIMITER ;
+
+INSERT INTO schema_migrations (version, name) VALUES (6, 'order_changes');
@@ -0,0 +1,32 @@
+-- Version numbers for optimistic concurrency. The app updates and deletes a row only while its version
+-- still matches the one it loaded and increments the version with every update, so a terminal cannot
+-- overwrite changes it has not seen. The version is exposed by view_paid_orders.
+
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version INT PRIMARY KEY,
+    name VARCHAR(255) NOT NULL,
+    applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+ALTER TABLE orders ADD COLUMN version INT NOT NULL DEFAULT 1;
+
+ALTER TABLE order_items ADD COLUMN version INT NOT NULL DEFAULT 1;
+
+ALTER TABLE shifts ADD COLUMN version INT NOT NULL DEFAULT 1;
+
+CREATE OR REPLACE VIEW view_paid_orders AS
+SELECT
+    id,
+    employee_id,
+    employee_first_name,
+    employee_last_name,
+    name,
+    creation_date,
+    is_paid,
+    total_price,
+    total_vat,
+    version
+FROM orders
+WHERE is_paid = 0;
+
+INSERT INTO schema_migrations (version, name) VALUES (7, 'row_versions');
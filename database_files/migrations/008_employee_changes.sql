@@ -0,0 +1,37 @@
+-- change_counters.employees is incremented by every change of an employee, so the cached
+-- employee roster of each terminal only has to read this counter to know whether it is current.
+
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version INT PRIMARY KEY,
+    name VARCHAR(255) NOT NULL,
+    applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+INSERT INTO change_counters (name, version) VALUES ('employees', 0);
+
+DELIMITER $$
+
+CREATE TRIGGER employees_changes_ins
+AFTER INSERT ON employees
+FOR EACH ROW
+BEGIN
+    UPDATE change_counters SET version = version + 1 WHERE name = 'employees';
+END$$
+
+CREATE TRIGGER employees_changes_upd
+AFTER UPDATE ON employees
+FOR EACH ROW
+BEGIN
+    UPDATE change_counters SET version = version + 1 WHERE name = 'employees';
+END$$
+
+CREATE TRIGGER employees_changes_del
+AFTER DELETE ON employees
+FOR EACH ROW
+BEGIN
+    UPDATE change_counters SET version = version + 1 WHERE name = 'employees';
+END$$
+
+DELIMITER ;
+
+INSERT INTO schema_migrations (version, name) VALUES (8, 'employee_changes');
@@ -1,11 +1,36 @@
 CREATE DATABASE IF NOT EXISTS restaurant;
 USE restaurant;
 
+DROP TABLE IF EXISTS daily_product_sales;
 DROP TABLE IF EXISTS order_items;
 DROP TABLE IF EXISTS orders;
 DROP TABLE IF EXISTS shifts;
 DROP TABLE IF EXISTS menu_items;
 DROP TABLE IF EXISTS employees;
+DROP TABLE IF EXISTS schema_migrations;
+DROP TABLE IF EXISTS change_counters;
+DROP TABLE IF EXISTS sales_day_changes;
+DROP TABLE IF EXISTS order_changes;
+
+CREATE TABLE change_counters (
+    name VARCHAR(64) PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0
+);
+
+INSERT INTO change_counters (name, version) VALUES ('employees', 0), ('menu_items', 0);
+
+CREATE TABLE sales_day_changes (
+    sales_date DATE PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0
+);
+
+CREATE TABLE order_changes (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    order_id INT NOT NULL,
+    is_open TINYINT NOT NULL,
+    changed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_order_changes_changed_at (changed_at)
+);
 
 CREATE TABLE employees (
     id INT AUTO_INCREMENT PRIMARY KEY,
@@ -13,6 +38,31 @@ CREATE TABLE employees (
     last_name VARCHAR(255) NOT NULL
 );
 
+DELIMITER $$
+
+CREATE TRIGGER employees_changes_ins
+AFTER INSERT ON employees
+FOR EACH ROW
+BEGIN
+    UPDATE change_counters SET version = version + 1 WHERE name = 'employees';
+END$$
+
+CREATE TRIGGER employees_changes_upd
+AFTER UPDATE ON employees
+FOR EACH ROW
+BEGIN
+    UPDATE change_counters SET version = version + 1 WHERE name = 'employees';
+END$$
+
+CREATE TRIGGER employees_changes_del
+AFTER DELETE ON employees
+FOR EACH ROW
+BEGIN
+    UPDATE change_counters SET version = version + 1 WHERE name = 'employees';
+END$$
+
+DELIMITER ;
+
 CREATE TABLE menu_items (
     id INT AUTO_INCREMENT PRIMARY KEY,
     name VARCHAR(255) NOT NULL,
@@ -38,6 +88,27 @@ BEGIN
     SET NEW.vat = ROUND(NEW.price * NEW.vat_percentage / 100, 2);
 END$$
 
+CREATE TRIGGER menu_items_changes_ins
+AFTER INSERT ON menu_items
+FOR EACH ROW
+BEGIN
+    UPDATE change_counters SET version = version + 1 WHERE name = 'menu_items';
+END$$
+
+CREATE TRIGGER menu_items_changes_upd
+AFTER UPDATE ON menu_items
+FOR EACH ROW
+BEGIN
+    UPDATE change_counters SET version = version + 1 WHERE name = 'menu_items';
+END$$
+
+CREATE TRIGGER menu_items_changes_del
+AFTER DELETE ON menu_items
+FOR EACH ROW
+BEGIN
+    UPDATE change_counters SET version = version + 1 WHERE name = 'menu_items';
+END$$
+
 DELIMITER ;
 
 CREATE TABLE orders (
@@ -50,6 +121,9 @@ CREATE TABLE orders (
     is_paid TINYINT NOT NULL,
     total_price DECIMAL(10,2) DEFAULT 0,
     total_vat DECIMAL(10,2) DEFAULT 0,
+    version INT NOT NULL DEFAULT 1,
+    INDEX idx_orders_is_paid (is_paid),
+    INDEX idx_orders_creation_date (creation_date),
     FOREIGN KEY (employee_id)
     REFERENCES employees(id)
     ON DELETE SET NULL
@@ -67,6 +141,27 @@ BEGIN
     END IF;
 END$$
 
+CREATE TRIGGER orders_changes_ins
+AFTER INSERT ON orders
+FOR EACH ROW
+BEGIN
+    INSERT INTO order_changes (order_id, is_open) VALUES (NEW.id, NEW.is_paid = 0);
+END$$
+
+CREATE TRIGGER orders_changes_upd
+AFTER UPDATE ON orders
+FOR EACH ROW
+BEGIN
+    INSERT INTO order_changes (order_id, is_open) VALUES (NEW.id, NEW.is_paid = 0);
+END$$
+
+CREATE TRIGGER orders_changes_del
+AFTER DELETE ON orders
+FOR EACH ROW
+BEGIN
+    INSERT INTO order_changes (order_id, is_open) VALUES (OLD.id, 0);
+END$$
+
 DELIMITER ;
 
 CREATE TABLE order_items (
@@ -81,6 +176,8 @@ CREATE TABLE order_items (
     quantity INT NOT NULL,
     total_price DECIMAL(10,2) NOT NULL,
     total_vat DECIMAL(10,2) NOT NULL,
+    version INT NOT NULL DEFAULT 1,
+    INDEX idx_order_items_order_covering (order_id, menu_item_id, quantity, total_price, total_vat),
     FOREIGN KEY (order_id)
     REFERENCES orders(id)
     ON DELETE CASCADE,
@@ -95,13 +192,24 @@ CREATE TRIGGER order_items_snapshot_menu_item
 BEFORE INSERT ON order_items
 FOR EACH ROW
 BEGIN
-    SET NEW.item_name = (SELECT name FROM menu_items WHERE id = NEW.menu_item_id);
-    SET NEW.item_type = (SELECT item_type FROM menu_items WHERE id = NEW.menu_item_id);
-    SET NEW.item_price = (SELECT price FROM menu_items WHERE id = NEW.menu_item_id);
-    SET NEW.vat_percentage = (SELECT vat_percentage FROM menu_items WHERE id = NEW.menu_item_id);
-    SET NEW.item_vat = (SELECT vat FROM menu_items WHERE id = NEW.menu_item_id);
-    SET NEW.total_price = NEW.item_price * NEW.quantity;
-    SET NEW.total_vat = NEW.item_vat * NEW.quantity;
+    DECLARE v_name VARCHAR(255);
+    DECLARE v_item_type VARCHAR(20);
+    DECLARE v_price DECIMAL(10,2);
+    DECLARE v_vat_percentage TINYINT;
+    DECLARE v_vat DECIMAL(10,2);
+
+    SELECT name, item_type, price, vat_percentage, vat
+    INTO v_name, v_item_type, v_price, v_vat_percentage, v_vat
+    FROM menu_items
+    WHERE id = NEW.menu_item_id;
+
+    SET NEW.item_name = v_name;
+    SET NEW.item_type = v_item_type;
+    SET NEW.item_price = v_price;
+    SET NEW.vat_percentage = v_vat_percentage;
+    SET NEW.item_vat = v_vat;
+    SET NEW.total_price = v_price * NEW.quantity;
+    SET NEW.total_vat = v_vat * NEW.quantity;
 END$$
 
 CREATE TRIGGER order_items_recalc_totals_upd
@@ -117,8 +225,8 @@ AFTER INSERT ON order_items
 FOR EACH ROW
 BEGIN
     UPDATE orders
-    SET total_price = IFNULL((SELECT SUM(total_price) FROM order_items WHERE order_id = NEW.order_id), 0),
-        total_vat = IFNULL((SELECT SUM(total_vat) FROM order_items WHERE order_id = NEW.order_id), 0)
+    SET total_price = IFNULL(total_price, 0) + NEW.total_price,
+        total_vat = IFNULL(total_vat, 0) + NEW.total_vat
     WHERE id = NEW.order_id;
 END$$
 
@@ -126,16 +234,23 @@ CREATE TRIGGER orders_update_totals_upd
 AFTER UPDATE ON order_items
 FOR EACH ROW
 BEGIN
-    UPDATE orders
-    SET total_price = IFNULL((SELECT SUM(total_price) FROM order_items WHERE order_id = NEW.order_id), 0),
-        total_vat = IFNULL((SELECT SUM(total_vat) FROM order_items WHERE order_id = NEW.order_id), 0)
-    WHERE id = NEW.order_id;
-    
-    IF OLD.order_id <> NEW.order_id THEN
+    IF OLD.order_id = NEW.order_id THEN
+        IF OLD.total_price <> NEW.total_price OR OLD.total_vat <> NEW.total_vat THEN
+            UPDATE orders
+            SET total_price = IFNULL(total_price, 0) + NEW.total_price - OLD.total_price,
+                total_vat = IFNULL(total_vat, 0) + NEW.total_vat - OLD.total_vat
+            WHERE id = NEW.order_id;
+        END IF;
+    ELSE
         UPDATE orders
-        SET total_price = IFNULL((SELECT SUM(total_price) FROM order_items WHERE order_id = OLD.order_id), 0),
-            total_vat = IFNULL((SELECT SUM(total_vat) FROM order_items WHERE order_id = OLD.order_id), 0)
+        SET total_price = IFNULL(total_price, 0) - OLD.total_price,
+            total_vat = IFNULL(total_vat, 0) - OLD.total_vat
         WHERE id = OLD.order_id;
+
+        UPDATE orders
+        SET total_price = IFNULL(total_price, 0) + NEW.total_price,
+            total_vat = IFNULL(total_vat, 0) + NEW.total_vat
+        WHERE id = NEW.order_id;
     END IF;
 END$$
 
@@ -144,11 +259,107 @@ AFTER DELETE ON order_items
 FOR EACH ROW
 BEGIN
     UPDATE orders
-    SET total_price = IFNULL((SELECT SUM(total_price) FROM order_items WHERE order_id = OLD.order_id), 0),
-        total_vat = IFNULL((SELECT SUM(total_vat) FROM order_items WHERE order_id = OLD.order_id), 0)
+    SET total_price = IFNULL(total_price, 0) - OLD.total_price,
+        total_vat = IFNULL(total_vat, 0) - OLD.total_vat
     WHERE id = OLD.order_id;
 END$$
 
+CREATE TRIGGER order_items_changes_upd
+AFTER UPDATE ON order_items
+FOR EACH ROW
+BEGIN
+    IF OLD.order_id = NEW.order_id AND OLD.total_price = NEW.total_price AND OLD.total_vat = NEW.total_vat THEN
+        INSERT INTO order_changes (order_id, is_open)
+        VALUES (NEW.order_id, COALESCE((SELECT is_paid = 0 FROM orders WHERE id = NEW.order_id), 0));
+    END IF;
+END$$
+
+DELIMITER ;
+
+CREATE TABLE daily_product_sales (
+    sales_date DATE NOT NULL,
+    menu_item_id INT NOT NULL,
+    orders_count INT NOT NULL,
+    quantity INT NOT NULL,
+    revenue DECIMAL(12,2) NOT NULL,
+    vat DECIMAL(12,2) NOT NULL,
+    PRIMARY KEY (sales_date, menu_item_id),
+    FOREIGN KEY (menu_item_id)
+    REFERENCES menu_items(id)
+    ON DELETE CASCADE
+);
+
+DELIMITER $$
+
+CREATE TRIGGER orders_sales_rollup_paid
+AFTER UPDATE ON orders
+FOR EACH ROW
+BEGIN
+    DECLARE v_sign INT;
+
+    IF OLD.is_paid <> NEW.is_paid THEN
+        SET v_sign = IF(NEW.is_paid <> 0, 1, -1);
+
+        INSERT INTO daily_product_sales (sales_date, menu_item_id, orders_count, quantity, revenue, vat)
+        SELECT * FROM (
+            SELECT DATE(NEW.creation_date) AS sales_date, menu_item_id, v_sign AS orders_count,
+                   v_sign * SUM(quantity) AS quantity, v_sign * SUM(total_price) AS revenue, v_sign * SUM(total_vat) AS vat
+            FROM order_items
+            WHERE order_id = NEW.id AND menu_item_id IS NOT NULL
+            GROUP BY menu_item_id
+        ) AS changes
+        ON DUPLICATE KEY UPDATE
+            orders_count = daily_product_sales.orders_count + changes.orders_count,
+            quantity = daily_product_sales.quantity + changes.quantity,
+            revenue = daily_product_sales.revenue + changes.revenue,
+            vat = daily_product_sales.vat + changes.vat;
+
+        DELETE FROM daily_product_sales WHERE sales_date = DATE(NEW.creation_date) AND orders_count = 0;
+    END IF;
+END$$
+
+CREATE TRIGGER orders_sales_rollup_del
+BEFORE DELETE ON orders
+FOR EACH ROW
+BEGIN
+    IF OLD.is_paid <> 0 THEN
+        UPDATE daily_product_sales s
+        JOIN (
+            SELECT menu_item_id, SUM(quantity) AS quantity, SUM(total_price) AS revenue, SUM(total_vat) AS vat
+            FROM order_items
+            WHERE order_id = OLD.id AND menu_item_id IS NOT NULL
+            GROUP BY menu_item_id
+        ) AS changes ON changes.menu_item_id = s.menu_item_id
+        SET s.orders_count = s.orders_count - 1,
+            s.quantity = s.quantity - changes.quantity,
+            s.revenue = s.revenue - changes.revenue,
+            s.vat = s.vat - changes.vat
+        WHERE s.sales_date = DATE(OLD.creation_date);
+
+        DELETE FROM daily_product_sales WHERE sales_date = DATE(OLD.creation_date) AND orders_count = 0;
+    END IF;
+END$$
+
+CREATE TRIGGER orders_sales_changes_upd
+AFTER UPDATE ON orders
+FOR EACH ROW
+BEGIN
+    IF OLD.is_paid <> 0 OR NEW.is_paid <> 0 THEN
+        INSERT INTO sales_day_changes (sales_date, version) VALUES (DATE(NEW.creation_date), 1)
+        ON DUPLICATE KEY UPDATE version = version + 1;
+    END IF;
+END$$
+
+CREATE TRIGGER orders_sales_changes_del
+AFTER DELETE ON orders
+FOR EACH ROW
+BEGIN
+    IF OLD.is_paid <> 0 THEN
+        INSERT INTO sales_day_changes (sales_date, version) VALUES (DATE(OLD.creation_date), 1)
+        ON DUPLICATE KEY UPDATE version = version + 1;
+    END IF;
+END$$
+
 DELIMITER ;
 
 CREATE TABLE shifts (
@@ -159,6 +370,10 @@ CREATE TABLE shifts (
     start_time TIMESTAMP NOT NULL,
     end_time TIMESTAMP NOT NULL,
     hourly_rate DECIMAL(10,2) NOT NULL,
+    shift_date DATE GENERATED ALWAYS AS (DATE(start_time)) VIRTUAL,
+    version INT NOT NULL DEFAULT 1,
+    INDEX idx_shifts_start_time (start_time),
+    INDEX idx_shifts_shift_date (shift_date),
     FOREIGN KEY (employee_id)
     REFERENCES employees(id)
     ON DELETE SET NULL
@@ -187,7 +402,7 @@ SELECT
     start_time, 
     end_time, 
     hourly_rate,
-    DATE(start_time) as shift_date
+    shift_date
 FROM shifts;
 
 CREATE OR REPLACE VIEW view_paid_orders AS
@@ -200,7 +415,8 @@ SELECT
     creation_date, 
     is_paid, 
     total_price, 
-    total_vat
+    total_vat,
+    version
 FROM orders 
 WHERE is_paid = 0;
 
@@ -215,4 +431,20 @@ FROM menu_items mi
 JOIN order_items oi ON mi.id = oi.menu_item_id
 JOIN orders o ON oi.order_id = o.id
 GROUP BY mi.item_type, mi.name
-ORDER BY total_revenue DESC;
\ No newline at end of file
+ORDER BY total_revenue DESC;
+
+CREATE TABLE schema_migrations (
+    version INT PRIMARY KEY,
+    name VARCHAR(255) NOT NULL,
+    applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+INSERT INTO schema_migrations (version, name) VALUES
+    (1, 'incremental_order_totals'),
+    (2, 'single_lookup_order_item_snapshot'),
+    (3, 'access_path_indexes'),
+    (4, 'daily_product_sales'),
+    (5, 'change_counters'),
+    (6, 'order_changes'),
+    (7, 'row_versions'),
+    (8, 'employee_changes');
\ No newline at end of file
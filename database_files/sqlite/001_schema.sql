@@ -0,0 +1,180 @@
+-- SQLite equivalent of script.sql.
+-- SQLite triggers cannot assign NEW values, so the BEFORE triggers of the MySQL schema
+-- are AFTER triggers that update the inserted row. The snapshot UPDATE of a new order item
+-- changes its totals, which fires orders_update_totals_upd, so there is no separate insert trigger.
+
+CREATE TABLE employees (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    first_name TEXT NOT NULL,
+    last_name TEXT NOT NULL
+);
+
+CREATE TABLE menu_items (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    item_type TEXT NOT NULL CHECK (item_type IN ('appetizer','main','dessert','beverage')),
+    price NUMERIC NOT NULL,
+    vat_percentage INTEGER NOT NULL,
+    vat NUMERIC
+);
+
+CREATE TRIGGER menu_items_calc_vat_ins
+AFTER INSERT ON menu_items
+FOR EACH ROW
+BEGIN
+    UPDATE menu_items SET vat = ROUND(NEW.price * NEW.vat_percentage / 100.0, 2) WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER menu_items_calc_vat_upd
+AFTER UPDATE OF price, vat_percentage ON menu_items
+FOR EACH ROW
+BEGIN
+    UPDATE menu_items SET vat = ROUND(NEW.price * NEW.vat_percentage / 100.0, 2) WHERE id = NEW.id;
+END;
+
+CREATE TABLE orders (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    employee_id INTEGER NULL REFERENCES employees(id) ON DELETE SET NULL,
+    employee_first_name TEXT,
+    employee_last_name TEXT,
+    name TEXT NOT NULL,
+    creation_date TIMESTAMP NOT NULL DEFAULT (datetime('now', 'localtime')),
+    is_paid INTEGER NOT NULL,
+    total_price NUMERIC DEFAULT 0,
+    total_vat NUMERIC DEFAULT 0
+);
+
+CREATE TRIGGER orders_snapshot_employee
+AFTER INSERT ON orders
+FOR EACH ROW
+WHEN NEW.employee_id IS NOT NULL
+BEGIN
+    UPDATE orders
+    SET employee_first_name = (SELECT first_name FROM employees WHERE id = NEW.employee_id),
+        employee_last_name = (SELECT last_name FROM employees WHERE id = NEW.employee_id)
+    WHERE id = NEW.id;
+END;
+
+CREATE TABLE order_items (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    order_id INTEGER NOT NULL REFERENCES orders(id) ON DELETE CASCADE,
+    menu_item_id INTEGER NULL REFERENCES menu_items(id) ON DELETE SET NULL,
+    item_name TEXT,
+    item_type TEXT CHECK (item_type IN ('appetizer','main','dessert','beverage')),
+    item_price NUMERIC,
+    vat_percentage INTEGER,
+    item_vat NUMERIC,
+    quantity INTEGER NOT NULL,
+    total_price NUMERIC NOT NULL DEFAULT 0,
+    total_vat NUMERIC NOT NULL DEFAULT 0
+);
+
+CREATE TRIGGER order_items_snapshot_menu_item
+AFTER INSERT ON order_items
+FOR EACH ROW
+BEGIN
+    UPDATE order_items
+    SET item_name = (SELECT name FROM menu_items WHERE id = NEW.menu_item_id),
+        item_type = (SELECT item_type FROM menu_items WHERE id = NEW.menu_item_id),
+        item_price = (SELECT price FROM menu_items WHERE id = NEW.menu_item_id),
+        vat_percentage = (SELECT vat_percentage FROM menu_items WHERE id = NEW.menu_item_id),
+        item_vat = (SELECT vat FROM menu_items WHERE id = NEW.menu_item_id),
+        total_price = (SELECT price FROM menu_items WHERE id = NEW.menu_item_id) * NEW.quantity,
+        total_vat = (SELECT vat FROM menu_items WHERE id = NEW.menu_item_id) * NEW.quantity
+    WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER order_items_recalc_totals_upd
+AFTER UPDATE OF quantity ON order_items
+FOR EACH ROW
+BEGIN
+    UPDATE order_items
+    SET total_price = NEW.item_price * NEW.quantity,
+        total_vat = NEW.item_vat * NEW.quantity
+    WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER orders_update_totals_upd
+AFTER UPDATE OF total_price, total_vat, order_id ON order_items
+FOR EACH ROW
+BEGIN
+    UPDATE orders
+    SET total_price = IFNULL((SELECT SUM(total_price) FROM order_items WHERE order_id = NEW.order_id), 0),
+        total_vat = IFNULL((SELECT SUM(total_vat) FROM order_items WHERE order_id = NEW.order_id), 0)
+    WHERE id = NEW.order_id;
+
+    UPDATE orders
+    SET total_price = IFNULL((SELECT SUM(total_price) FROM order_items WHERE order_id = OLD.order_id), 0),
+        total_vat = IFNULL((SELECT SUM(total_vat) FROM order_items WHERE order_id = OLD.order_id), 0)
+    WHERE id = OLD.order_id AND OLD.order_id <> NEW.order_id;
+END;
+
+CREATE TRIGGER orders_update_totals_del
+AFTER DELETE ON order_items
+FOR EACH ROW
+BEGIN
+    UPDATE orders
+    SET total_price = IFNULL((SELECT SUM(total_price) FROM order_items WHERE order_id = OLD.order_id), 0),
+        total_vat = IFNULL((SELECT SUM(total_vat) FROM order_items WHERE order_id = OLD.order_id), 0)
+    WHERE id = OLD.order_id;
+END;
+
+CREATE TABLE shifts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    employee_id INTEGER NULL REFERENCES employees(id) ON DELETE SET NULL,
+    employee_first_name TEXT,
+    employee_last_name TEXT,
+    start_time TIMESTAMP NOT NULL,
+    end_time TIMESTAMP NOT NULL,
+    hourly_rate NUMERIC NOT NULL
+);
+
+CREATE TRIGGER shifts_snapshot_employee
+AFTER INSERT ON shifts
+FOR EACH ROW
+WHEN NEW.employee_id IS NOT NULL
+BEGIN
+    UPDATE shifts
+    SET employee_first_name = (SELECT first_name FROM employees WHERE id = NEW.employee_id),
+        employee_last_name = (SELECT last_name FROM employees WHERE id = NEW.employee_id)
+    WHERE id = NEW.id;
+END;
+
+CREATE VIEW view_shifts_log AS
+SELECT
+    id,
+    employee_id,
+    employee_first_name,
+    employee_last_name,
+    start_time,
+    end_time,
+    hourly_rate,
+    DATE(start_time) AS shift_date
+FROM shifts;
+
+CREATE VIEW view_paid_orders AS
+SELECT
+    id,
+    employee_id,
+    employee_first_name,
+    employee_last_name,
+    name,
+    creation_date,
+    is_paid,
+    total_price,
+    total_vat
+FROM orders
+WHERE is_paid = 0;
+
+CREATE VIEW view_product_sales_report AS
+SELECT
+    mi.item_type AS category,
+    mi.name AS product_name,
+    COUNT(DISTINCT o.id) AS orders_count,
+    SUM(oi.quantity) AS total_quantity_sold,
+    SUM(oi.total_price) AS total_revenue
+FROM menu_items mi
+JOIN order_items oi ON mi.id = oi.menu_item_id
+JOIN orders o ON oi.order_id = o.id
+GROUP BY mi.item_type, mi.name
+ORDER BY total_revenue DESC;
@@ -0,0 +1,58 @@
+-- Order totals are updated with the difference of the changed order item instead of
+-- re-running SUM over all items of the order. The values are rounded to cents because
+-- SQLite stores them as floating point numbers.
+
+DROP TRIGGER orders_update_totals_upd;
+DROP TRIGGER orders_update_totals_del;
+
+CREATE TRIGGER orders_update_totals_ins
+AFTER INSERT ON order_items
+FOR EACH ROW
+WHEN NEW.total_price <> 0 OR NEW.total_vat <> 0
+BEGIN
+    UPDATE orders
+    SET total_price = ROUND(IFNULL(total_price, 0) + NEW.total_price, 2),
+        total_vat = ROUND(IFNULL(total_vat, 0) + NEW.total_vat, 2)
+    WHERE id = NEW.order_id;
+END;
+
+CREATE TRIGGER orders_update_totals_upd
+AFTER UPDATE OF total_price, total_vat, order_id ON order_items
+FOR EACH ROW
+WHEN OLD.order_id = NEW.order_id AND (OLD.total_price <> NEW.total_price OR OLD.total_vat <> NEW.total_vat)
+BEGIN
+    UPDATE orders
+    SET total_price = ROUND(IFNULL(total_price, 0) + NEW.total_price - OLD.total_price, 2),
+        total_vat = ROUND(IFNULL(total_vat, 0) + NEW.total_vat - OLD.total_vat, 2)
+    WHERE id = NEW.order_id;
+END;
+
+CREATE TRIGGER orders_update_totals_move
+AFTER UPDATE OF order_id ON order_items
+FOR EACH ROW
+WHEN OLD.order_id <> NEW.order_id
+BEGIN
+    UPDATE orders
+    SET total_price = ROUND(IFNULL(total_price, 0) - OLD.total_price, 2),
+        total_vat = ROUND(IFNULL(total_vat, 0) - OLD.total_vat, 2)
+    WHERE id = OLD.order_id;
+
+    UPDATE orders
+    SET total_price = ROUND(IFNULL(total_price, 0) + NEW.total_price, 2),
+        total_vat = ROUND(IFNULL(total_vat, 0) + NEW.total_vat, 2)
+    WHERE id = NEW.order_id;
+END;
+
+CREATE TRIGGER orders_update_totals_del
+AFTER DELETE ON order_items
+FOR EACH ROW
+BEGIN
+    UPDATE orders
+    SET total_price = ROUND(IFNULL(total_price, 0) - OLD.total_price, 2),
+        total_vat = ROUND(IFNULL(total_vat, 0) - OLD.total_vat, 2)
+    WHERE id = OLD.order_id;
+END;
+
+UPDATE orders
+SET total_price = IFNULL((SELECT ROUND(SUM(total_price), 2) FROM order_items WHERE order_id = orders.id), 0),
+    total_vat = IFNULL((SELECT ROUND(SUM(total_vat), 2) FROM order_items WHERE order_id = orders.id), 0);
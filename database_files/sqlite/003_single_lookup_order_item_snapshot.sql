@@ -0,0 +1,17 @@
+-- The snapshot of the menu item copied into a new order item is read with one row-value
+-- subquery instead of seven separate subqueries against menu_items.
+
+DROP TRIGGER order_items_snapshot_menu_item;
+
+CREATE TRIGGER order_items_snapshot_menu_item
+AFTER INSERT ON order_items
+FOR EACH ROW
+BEGIN
+    UPDATE order_items
+    SET (item_name, item_type, item_price, vat_percentage, item_vat, total_price, total_vat) = (
+        SELECT name, item_type, price, vat_percentage, vat, price * NEW.quantity, vat * NEW.quantity
+        FROM menu_items
+        WHERE id = NEW.menu_item_id
+    )
+    WHERE id = NEW.id;
+END;
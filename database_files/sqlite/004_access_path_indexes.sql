@@ -0,0 +1,26 @@
+-- Indexes for the filters used by the DAOs and views:
+-- shifts by day, unpaid orders, order items by order and orders by creation date.
+-- SQLite does not index foreign keys by itself, so order items by order were a full scan.
+-- view_shifts_log exposes shift_date as an indexed generated column instead of computing DATE(start_time).
+
+ALTER TABLE shifts ADD COLUMN shift_date DATE GENERATED ALWAYS AS (DATE(start_time)) VIRTUAL;
+
+CREATE INDEX idx_shifts_start_time ON shifts (start_time);
+CREATE INDEX idx_shifts_shift_date ON shifts (shift_date);
+CREATE INDEX idx_orders_unpaid ON orders (id) WHERE is_paid = 0;
+CREATE INDEX idx_orders_creation_date ON orders (creation_date);
+CREATE INDEX idx_order_items_order_covering ON order_items (order_id, menu_item_id, quantity, total_price, total_vat);
+
+DROP VIEW view_shifts_log;
+
+CREATE VIEW view_shifts_log AS
+SELECT
+    id,
+    employee_id,
+    employee_first_name,
+    employee_last_name,
+    start_time,
+    end_time,
+    hourly_rate,
+    shift_date
+FROM shifts;
@@ -0,0 +1,63 @@
+-- Daily sales per menu item of paid orders. The sales report reads whole days from this table
+-- and only aggregates the raw order items of partial days at the edges of the range.
+-- Paying an order adds its items, unpaying or deleting a paid order subtracts them.
+
+CREATE TABLE daily_product_sales (
+    sales_date DATE NOT NULL,
+    menu_item_id INTEGER NOT NULL REFERENCES menu_items(id) ON DELETE CASCADE,
+    orders_count INTEGER NOT NULL,
+    quantity INTEGER NOT NULL,
+    revenue NUMERIC NOT NULL,
+    vat NUMERIC NOT NULL,
+    PRIMARY KEY (sales_date, menu_item_id)
+);
+
+CREATE TRIGGER orders_sales_rollup_paid
+AFTER UPDATE OF is_paid ON orders
+FOR EACH ROW
+WHEN OLD.is_paid <> NEW.is_paid
+BEGIN
+    INSERT INTO daily_product_sales (sales_date, menu_item_id, orders_count, quantity, revenue, vat)
+    SELECT DATE(NEW.creation_date), menu_item_id,
+           CASE WHEN NEW.is_paid <> 0 THEN 1 ELSE -1 END,
+           CASE WHEN NEW.is_paid <> 0 THEN 1 ELSE -1 END * SUM(quantity),
+           CASE WHEN NEW.is_paid <> 0 THEN 1 ELSE -1 END * ROUND(SUM(total_price), 2),
+           CASE WHEN NEW.is_paid <> 0 THEN 1 ELSE -1 END * ROUND(SUM(total_vat), 2)
+    FROM order_items
+    WHERE order_id = NEW.id AND menu_item_id IS NOT NULL
+    GROUP BY menu_item_id
+    ON CONFLICT (sales_date, menu_item_id) DO UPDATE SET
+        orders_count = orders_count + excluded.orders_count,
+        quantity = quantity + excluded.quantity,
+        revenue = ROUND(revenue + excluded.revenue, 2),
+        vat = ROUND(vat + excluded.vat, 2);
+
+    DELETE FROM daily_product_sales WHERE sales_date = DATE(NEW.creation_date) AND orders_count = 0;
+END;
+
+CREATE TRIGGER orders_sales_rollup_del
+BEFORE DELETE ON orders
+FOR EACH ROW
+WHEN OLD.is_paid <> 0
+BEGIN
+    INSERT INTO daily_product_sales (sales_date, menu_item_id, orders_count, quantity, revenue, vat)
+    SELECT DATE(OLD.creation_date), menu_item_id, -1, -SUM(quantity), -ROUND(SUM(total_price), 2), -ROUND(SUM(total_vat), 2)
+    FROM order_items
+    WHERE order_id = OLD.id AND menu_item_id IS NOT NULL
+    GROUP BY menu_item_id
+    ON CONFLICT (sales_date, menu_item_id) DO UPDATE SET
+        orders_count = orders_count + excluded.orders_count,
+        quantity = quantity + excluded.quantity,
+        revenue = ROUND(revenue + excluded.revenue, 2),
+        vat = ROUND(vat + excluded.vat, 2);
+
+    DELETE FROM daily_product_sales WHERE sales_date = DATE(OLD.creation_date) AND orders_count = 0;
+END;
+
+INSERT INTO daily_product_sales (sales_date, menu_item_id, orders_count, quantity, revenue, vat)
+SELECT DATE(o.creation_date), oi.menu_item_id, COUNT(DISTINCT o.id), SUM(oi.quantity),
+       ROUND(SUM(oi.total_price), 2), ROUND(SUM(oi.total_vat), 2)
+FROM orders o
+JOIN order_items oi ON oi.order_id = o.id
+WHERE o.is_paid = 1 AND oi.menu_item_id IS NOT NULL
+GROUP BY DATE(o.creation_date), oi.menu_item_id;
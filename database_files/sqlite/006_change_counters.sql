@@ -0,0 +1,56 @@
+-- Change counters that let caches check cheaply whether their data is still current.
+-- change_counters.menu_items is incremented by every change of a menu item.
+-- sales_day_changes has one counter per day, incremented whenever a paid order of that day
+-- is changed, paid, unpaid or deleted, so a cached sales report only has to compare the
+-- counters of the days it covers.
+
+CREATE TABLE change_counters (
+    name VARCHAR(64) PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0
+);
+
+INSERT INTO change_counters (name, version) VALUES ('menu_items', 0);
+
+CREATE TABLE sales_day_changes (
+    sales_date DATE PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TRIGGER menu_items_changes_ins
+AFTER INSERT ON menu_items
+FOR EACH ROW
+BEGIN
+    UPDATE change_counters SET version = version + 1 WHERE name = 'menu_items';
+END;
+
+CREATE TRIGGER menu_items_changes_upd
+AFTER UPDATE ON menu_items
+FOR EACH ROW
+BEGIN
+    UPDATE change_counters SET version = version + 1 WHERE name = 'menu_items';
+END;
+
+CREATE TRIGGER menu_items_changes_del
+AFTER DELETE ON menu_items
+FOR EACH ROW
+BEGIN
+    UPDATE change_counters SET version = version + 1 WHERE name = 'menu_items';
+END;
+
+CREATE TRIGGER orders_sales_changes_upd
+AFTER UPDATE ON orders
+FOR EACH ROW
+WHEN OLD.is_paid <> 0 OR NEW.is_paid <> 0
+BEGIN
+    INSERT INTO sales_day_changes (sales_date, version) VALUES (DATE(NEW.creation_date), 1)
+    ON CONFLICT (sales_date) DO UPDATE SET version = version + 1;
+END;
+
+CREATE TRIGGER orders_sales_changes_del
+AFTER DELETE ON orders
+FOR EACH ROW
+WHEN OLD.is_paid <> 0
+BEGIN
+    INSERT INTO sales_day_changes (sales_date, version) VALUES (DATE(OLD.creation_date), 1)
+    ON CONFLICT (sales_date) DO UPDATE SET version = version + 1;
+END;
@@ -0,0 +1,52 @@
+-- Change log of the orders and their order items, read by terminals that poll for changes made by others.
+-- Entries are numbered by their own id, AUTOINCREMENT keeps the ids of pruned entries from being reused.
+-- is_open is 0 when the order was paid or deleted. Order item changes update the totals of their order
+-- and are logged through it, only changes that leave the totals as they are get their own entry.
+
+CREATE TABLE order_changes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    order_id INTEGER NOT NULL,
+    is_open INTEGER NOT NULL,
+    changed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX idx_order_changes_changed_at ON order_changes (changed_at);
+
+CREATE TRIGGER orders_changes_ins
+AFTER INSERT ON orders
+FOR EACH ROW
+BEGIN
+    INSERT INTO order_changes (order_id, is_open) VALUES (NEW.id, NEW.is_paid = 0);
+END;
+
+CREATE TRIGGER orders_changes_upd
+AFTER UPDATE ON orders
+FOR EACH ROW
+BEGIN
+    INSERT INTO order_changes (order_id, is_open) VALUES (NEW.id, NEW.is_paid = 0);
+END;
+
+CREATE TRIGGER orders_changes_del
+AFTER DELETE ON orders
+FOR EACH ROW
+BEGIN
+    INSERT INTO order_changes (order_id, is_open) VALUES (OLD.id, 0);
+END;
+
+CREATE TRIGGER order_items_changes_ins
+AFTER INSERT ON order_items
+FOR EACH ROW
+WHEN NEW.total_price = 0 AND NEW.total_vat = 0
+BEGIN
+    INSERT INTO order_changes (order_id, is_open)
+    VALUES (NEW.order_id, COALESCE((SELECT is_paid = 0 FROM orders WHERE id = NEW.order_id), 0));
+END;
+
+CREATE TRIGGER order_items_changes_upd
+AFTER UPDATE ON order_items
+FOR EACH ROW
+WHEN OLD.order_id = NEW.order_id AND OLD.total_price = NEW.total_price AND OLD.total_vat = NEW.total_vat
+BEGIN
+    INSERT INTO order_changes (order_id, is_open)
+    VALUES (NEW.order_id, COALESCE((SELECT is_paid = 0 FROM orders WHERE id = NEW.order_id), 0));
+END;
@@ -0,0 +1,25 @@
+-- change_counters.employees is incremented by every change of an employee, so the cached
+-- employee roster of each terminal only has to read this counter to know whether it is current.
+
+INSERT INTO change_counters (name, version) VALUES ('employees', 0);
+
+CREATE TRIGGER employees_changes_ins
+AFTER INSERT ON employees
+FOR EACH ROW
+BEGIN
+    UPDATE change_counters SET version = version + 1 WHERE name = 'employees';
+END;
+
+CREATE TRIGGER employees_changes_upd
+AFTER UPDATE ON employees
+FOR EACH ROW
+BEGIN
+    UPDATE change_counters SET version = version + 1 WHERE name = 'employees';
+END;
+
+CREATE TRIGGER employees_changes_del
+AFTER DELETE ON employees
+FOR EACH ROW
+BEGIN
+    UPDATE change_counters SET version = version + 1 WHERE name = 'employees';
+END;
@@ -0,0 +1,12 @@
+-- The vat of a menu item is set by a trigger that updates the row again, which also incremented
+-- change_counters.menu_items a second time. The update trigger now ignores the vat column, so every
+-- written menu item increments the counter once, as in MySQL, where vat is set before the row is written.
+
+DROP TRIGGER menu_items_changes_upd;
+
+CREATE TRIGGER menu_items_changes_upd
+AFTER UPDATE OF name, item_type, price, vat_percentage ON menu_items
+FOR EACH ROW
+BEGIN
+    UPDATE change_counters SET version = version + 1 WHERE name = 'menu_items';
+END;
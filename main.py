@@ -1,61 +1,69 @@
-import mysql.connector.locales.eng.client_error
-from mysql.connector.plugins import mysql_native_password
-
-import sys
-import os
-import traceback
-from datetime import datetime
-from PyQt5 import QtWidgets
-
-from src.data_access_layer.database_connector import DatabaseConnector
-from src.presentation_layer.main_window import MainWindow
-
-
-def excepthook(exc_type, exc_value, exc_tb):
-    error_msg = "".join(traceback.format_exception(exc_type, exc_value, exc_tb))
-
-    if getattr(sys, 'frozen', False):
-        log_dir = os.path.dirname(sys.executable)
-    else:
-        log_dir = os.path.dirname(os.path.abspath(__file__))
-
-    log_path = os.path.join(log_dir, "crash_log.txt")
-
-    try:
-        with open(log_path, "a") as f:
-            f.write(f"\n--- Crash at {datetime.now()} ---\n")
-            f.write(error_msg)
-            f.write("\n")
-    except Exception:
-        pass
-
-    app = QtWidgets.QApplication.instance()
-    if not app:
-        app = QtWidgets.QApplication(sys.argv)
-
-    error_box = QtWidgets.QMessageBox()
-    error_box.setIcon(QtWidgets.QMessageBox.Critical)
-    error_box.setWindowTitle("Critical Error")
-    error_box.setText("An unexpected error occurred.")
-    error_box.setInformativeText(f"See crash_log.txt for details.\n\nPath: {log_path}")
-    error_box.setDetailedText(error_msg)
-    error_box.exec_()
-
-    sys.exit(1)
-
-
-if __name__ == "__main__":
-    sys.excepthook = excepthook
-
-    app = QtWidgets.QApplication(sys.argv)
-
-    try:
-        connection = DatabaseConnector().connect()
-
-    except Exception as e:
-        sys.excepthook(type(e), e, e.__traceback__)
-        sys.exit(1)
-
-    window = MainWindow()
-    window.show()
+import mysql.connector.locales.eng.client_error
+from mysql.connector.plugins import mysql_native_password
+
+import sys
+import os
+import traceback
+from datetime import datetime
+from PyQt5 import QtWidgets
+
+from src.data_access_layer.database_connector import DatabaseConnector
+from src.presentation_layer.main_window import MainWindow
+from src.presentation_layer.MyLib.startup_timer import StartupTimer
+
+
+def excepthook(exc_type, exc_value, exc_tb):
+    error_msg = "".join(traceback.format_exception(exc_type, exc_value, exc_tb))
+
+    if getattr(sys, 'frozen', False):
+        log_dir = os.path.dirname(sys.executable)
+    else:
+        log_dir = os.path.dirname(os.path.abspath(__file__))
+
+    log_path = os.path.join(log_dir, "crash_log.txt")
+
+    try:
+        with open(log_path, "a") as f:
+            f.write(f"\n--- Crash at {datetime.now()} ---\n")
+            f.write(error_msg)
+            f.write("\n")
+    except Exception:
+        pass
+
+    app = QtWidgets.QApplication.instance()
+    if not app:
+        app = QtWidgets.QApplication(sys.argv)
+
+    error_box = QtWidgets.QMessageBox()
+    error_box.setIcon(QtWidgets.QMessageBox.Critical)
+    error_box.setWindowTitle("Critical Error")
+    error_box.setText("An unexpected error occurred.")
+    error_box.setInformativeText(f"See crash_log.txt for details.\n\nPath: {log_path}")
+    error_box.setDetailedText(error_msg)
+    error_box.exec_()
+
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    sys.excepthook = excepthook
+
+    startup_timer = StartupTimer()
+    startup_timer.start("create application")
+    app = QtWidgets.QApplication(sys.argv)
+    startup_timer.finish("create application")
+
+    try:
+        DatabaseConnector()
+
+    except Exception as e:
+        sys.excepthook(type(e), e, e.__traceback__)
+        sys.exit(1)
+
+    window = MainWindow(startup_timer)
+    window.show()
+
+    if "--startup-timings" in sys.argv:
+        app.aboutToQuit.connect(lambda: print(startup_timer.report()))
+
     sys.exit(app.exec_())
\ No newline at end of file
@@ -0,0 +1,174 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from src.aplication_layer.employees_manager import EmployeesManager
+from src.aplication_layer.menu_items_manager import MenuItemsManager
+from src.aplication_layer.orders_manager import OrdersManager
+from src.aplication_layer.reports_manager import ReportsManager
+from src.aplication_layer.shifts_manager import ShiftsManager
+from src.data_access_layer.database_connector import DatabaseConnector
+from src.objects.employee import Employee
+from src.objects.menu_item import MenuItem
+from src.objects.order import Order
+from src.objects.order_item import OrderItem
+from src.objects.shift import Shift
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Returns the executor shared by all async managers.
+    It has one worker per pooled connection, so blocking DAO calls never wait for a connection.
+    :return:
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=DatabaseConnector().pool_size,
+                thread_name_prefix="db-worker"
+            )
+        return _executor
+
+
+class AsyncManager:
+    def __init__(self, manager, executor: ThreadPoolExecutor = None):
+        """
+        Runs the blocking methods of a manager on the shared executor so they can be awaited.
+        :param manager: synchronous manager whose state is shared with this wrapper
+        :param executor: executor to use instead of the shared one
+        """
+        self.manager = manager
+        self._executor = executor or get_executor()
+
+    async def _run(self, function, *args):
+        """
+        Runs the function on the executor and waits for its result without blocking the event loop.
+        :param function:
+        :param args:
+        :return:
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(function, *args))
+
+
+class AsyncOrdersManager(AsyncManager):
+    def __init__(self, manager: OrdersManager, executor: ThreadPoolExecutor = None):
+        if not isinstance(manager, OrdersManager):
+            raise TypeError("manager must be an instance of OrdersManager")
+        super().__init__(manager, executor)
+
+    async def load_orders(self):
+        await self._run(self.manager.load_orders)
+        return self.manager.orders
+
+    async def refresh_orders(self, prefetch_items: bool = False):
+        return await self._run(self.manager.refresh_orders, prefetch_items)
+
+    async def add_order(self, order: Order):
+        await self._run(self.manager.add_order, order)
+
+    async def update_order(self, order: Order):
+        return await self._run(self.manager.update_order, order)
+
+    async def delete_order(self, order_id: int):
+        await self._run(self.manager.delete_order, order_id)
+
+    async def pay_order(self, order_id: int):
+        await self._run(self.manager.pay_order, order_id)
+
+    async def get_order_items(self, order_id: int):
+        return await self._run(self.manager.get_order_items, order_id)
+
+    async def add_order_item(self, order_item: OrderItem):
+        await self._run(self.manager.add_order_item, order_item)
+
+    async def edit_order_item(self, order_item: OrderItem):
+        await self._run(self.manager.edit_order_item, order_item)
+
+    async def delete_order_item(self, order_item_id: int):
+        await self._run(self.manager.delete_order_item, order_item_id)
+
+    async def remove_order_item(self, order_id: int, order_item_id: int):
+        await self._run(self.manager.remove_order_item, order_id, order_item_id)
+
+
+class AsyncMenuItemsManager(AsyncManager):
+    def __init__(self, manager: MenuItemsManager, executor: ThreadPoolExecutor = None):
+        if not isinstance(manager, MenuItemsManager):
+            raise TypeError("manager must be an instance of MenuItemsManager")
+        super().__init__(manager, executor)
+
+    async def load_menu_items(self):
+        await self._run(self.manager.load_menu_items)
+        return self.manager.menu_items
+
+    async def refresh_menu_items(self, max_age: float = None):
+        return await self._run(self.manager.refresh_menu_items, max_age)
+
+    async def add_menu_item(self, menu_item: MenuItem):
+        await self._run(self.manager.add_menu_item, menu_item)
+
+    async def delete_menu_item(self, menu_item_id: int):
+        await self._run(self.manager.delete_menu_item, menu_item_id)
+
+    async def edit_menu_item(self, menu_item: MenuItem):
+        await self._run(self.manager.edit_menu_item, menu_item)
+
+
+class AsyncEmployeesManager(AsyncManager):
+    def __init__(self, manager: EmployeesManager, executor: ThreadPoolExecutor = None):
+        if not isinstance(manager, EmployeesManager):
+            raise TypeError("manager must be an instance of EmployeesManager")
+        super().__init__(manager, executor)
+
+    async def load_employees(self):
+        await self._run(self.manager.load_employees)
+        return self.manager.employees
+
+    async def refresh_employees(self, max_age: float = None):
+        return await self._run(self.manager.refresh_employees, max_age)
+
+    async def add_employee(self, employee: Employee):
+        await self._run(self.manager.add_employee, employee)
+
+    async def delete_employee(self, employee_id: int):
+        await self._run(self.manager.delete_employee, employee_id)
+
+    async def edit_employee(self, employee: Employee):
+        await self._run(self.manager.edit_employee, employee)
+
+
+class AsyncShiftsManager(AsyncManager):
+    def __init__(self, manager: ShiftsManager, executor: ThreadPoolExecutor = None):
+        if not isinstance(manager, ShiftsManager):
+            raise TypeError("manager must be an instance of ShiftsManager")
+        super().__init__(manager, executor)
+
+    async def get_shifts_for_date(self, date):
+        return await self._run(self.manager.get_shifts_for_date, date)
+
+    async def add_shift(self, shift: Shift):
+        await self._run(self.manager.add_shift, shift)
+
+    async def edit_shift(self, shift: Shift):
+        await self._run(self.manager.edit_shift, shift)
+
+    async def delete_shift(self, shift_id: int):
+        await self._run(self.manager.delete_shift, shift_id)
+
+
+class AsyncReportsManager(AsyncManager):
+    def __init__(self, manager: ReportsManager, executor: ThreadPoolExecutor = None):
+        if not isinstance(manager, ReportsManager):
+            raise TypeError("manager must be an instance of ReportsManager")
+        super().__init__(manager, executor)
+
+    async def load_sales_report(self, start_date: datetime, end_date: datetime):
+        await self._run(self.manager.load_sales_report, start_date, end_date)
+        return self.manager.sales_report_data
@@ -1,68 +1,88 @@
-from src.data_access_layer.menu_items_DAO import MenuItemsDAO
-from src.objects.menu_item import MenuItem
-
-
-class MenuItemsManager:
-    def __init__(self):
-        self.menu_items = []
-        self._menu_items_DAO = MenuItemsDAO()
-
-    @property
-    def menu_items(self):
-        return self._menu_items
-
-    @menu_items.setter
-    def menu_items(self, value: list):
-        if not isinstance(value, list):
-            raise ValueError("menu_items must be a list")
-        self._menu_items = value
-
-    def load_menu_items(self):
-        """
-        Loads menu items from the database into the menu_items list.
-        :return:
-        """
-        self.menu_items = self._menu_items_DAO.load()
-
-    def add_menu_item(self, menu_item: MenuItem):
-        """
-        Adds a menu item into the menu_items list and the database.
-        :param menu_item:
-        :return:
-        """
-        if not isinstance(menu_item, MenuItem):
-            raise ValueError("menu_item must be an instance of MenuItem")
-
-        self.menu_items.append(menu_item)
-        self._menu_items_DAO.add(menu_item)
-
-    def delete_menu_item(self, menu_item_id: int):
-        """
-        Deletes a menu item from the menu_items list and the database.
-        :param menu_item_id:
-        :return:
-        """
-        if not isinstance(menu_item_id, int):
-            raise ValueError("menu_item_id must be an integer")
-
-        for menu_item in self.menu_items:
-            if menu_item.id == menu_item_id:
-                self.menu_items.remove(menu_item)
-
-        self._menu_items_DAO.delete(menu_item_id)
-
-    def edit_menu_item(self, menu_item: MenuItem):
-        """
-        Edits a menu item from the menu_items list and the database.
-        :param menu_item:
-        :return:
-        """
-        if not isinstance(menu_item, MenuItem):
-            raise ValueError("menu_item must be an instance of MenuItem")
-
-        self._menu_items_DAO.update(menu_item)
-
-        for i, item in enumerate(self.menu_items):
-            if item.id == menu_item.id:
-                self.menu_items[i] = menu_item
-                break
+from src.aplication_layer.versioned_cache import VersionedCache
+from src.data_access_layer.menu_items_DAO import MenuItemsDAO
+from src.objects.menu_item import MenuItem
+
+
+class MenuItemsManager:
+    def __init__(self):
+        self._menu_items_DAO = MenuItemsDAO()
+        self._cache = VersionedCache(self._menu_items_DAO.get_version, self._menu_items_DAO.load)
+
+    @property
+    def menu_items(self):
+        return self._cache.items
+
+    @menu_items.setter
+    def menu_items(self, value: list):
+        if not isinstance(value, list):
+            raise ValueError("menu_items must be a list")
+        self._cache.items = value
+
+    @property
+    def revision(self) -> int:
+        """
+        Number that changes whenever the menu_items list changes.
+        :return:
+        """
+        return self._cache.revision
+
+    def load_menu_items(self):
+        """
+        Loads menu items from the database into the menu_items list.
+        :return:
+        """
+        self._cache.load()
+
+    def refresh_menu_items(self, max_age: float = None) -> bool:
+        """
+        Reloads the menu items only when the menu changed since they were loaded.
+        The menu version is read at most once per max_age seconds, in between the loaded list is used without a query.
+        :param max_age: seconds a version check stays valid, None uses VersionedCache.VERSION_CHECK_INTERVAL
+        :return: True when the menu items were reloaded
+        """
+        return self._cache.refresh(max_age)
+
+    def add_menu_item(self, menu_item: MenuItem):
+        """
+        Adds a menu item into the menu_items list and the database.
+        :param menu_item:
+        :return:
+        """
+        if not isinstance(menu_item, MenuItem):
+            raise ValueError("menu_item must be an instance of MenuItem")
+
+        self.menu_items.append(menu_item)
+        self._menu_items_DAO.add(menu_item)
+        self._cache.applied()
+
+    def delete_menu_item(self, menu_item_id: int):
+        """
+        Deletes a menu item from the menu_items list and the database.
+        :param menu_item_id:
+        :return:
+        """
+        if not isinstance(menu_item_id, int):
+            raise ValueError("menu_item_id must be an integer")
+
+        for menu_item in self.menu_items:
+            if menu_item.id == menu_item_id:
+                self.menu_items.remove(menu_item)
+
+        self._cache.applied(self._menu_items_DAO.delete(menu_item_id))
+
+    def edit_menu_item(self, menu_item: MenuItem):
+        """
+        Edits a menu item from the menu_items list and the database.
+        :param menu_item:
+        :return:
+        """
+        if not isinstance(menu_item, MenuItem):
+            raise ValueError("menu_item must be an instance of MenuItem")
+
+        updated = self._menu_items_DAO.update(menu_item)
+
+        for i, item in enumerate(self.menu_items):
+            if item.id == menu_item.id:
+                self.menu_items[i] = menu_item
+                break
+        self._cache.applied(updated)
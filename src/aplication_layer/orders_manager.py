@@ -1,155 +1,312 @@
-from typing import List
-import mysql.connector
-
-from src.data_access_layer.order_items_DAO import OrderItemsDAO
-from src.data_access_layer.orders_DAO import OrdersDAO
-from src.data_access_layer.database_connector import DatabaseConnector
-from src.objects.order import Order
-from src.objects.order_item import OrderItem
-
-
-class OrdersManager:
-    def __init__(self):
-        self.orders = []
-        self._orders_DAO = OrdersDAO()
-        self._order_items_DAO = OrderItemsDAO()
-        self._db_connector = DatabaseConnector()
-
-    def load_orders(self):
-        """
-        Loads orders from the database.
-        :return:
-        """
-        self.orders = self._orders_DAO.get_unpaid_orders()
-
-    def add_order(self, order: Order):
-        """
-        Adds a new order to the database.
-        :param order:
-        :return:
-        """
-        if not isinstance(order, Order):
-            raise TypeError("Order must be an instance of Order")
-
-        self._orders_DAO.create(order)
-        self.orders.append(order)
-
-    def update_order(self, order: Order):
-        """
-        Updates the order in the database.
-        :param order:
-        :return:
-        """
-        if not isinstance(order, Order):
-            raise TypeError("Order must be an instance of Order")
-
-        self._orders_DAO.update(order)
-        self.load_orders()
-
-    def remove_order(self, order_id):
-        """
-        Removes the order from the database.
-        :param order_id:
-        :return:
-        """
-        if not isinstance(order_id, int):
-            raise TypeError("Order id must be an instance of int")
-
-        for order in self.orders:
-            if order.id == order_id:
-                self.orders.remove(order)
-                break
-
-    def delete_order(self, order_id):
-        """
-        Deletes the order from the database.
-        :param order_id:
-        :return:
-        """
-        if not isinstance(order_id, int):
-            raise TypeError("Order id must be an instance of int")
-
-        try:
-            self._orders_DAO.delete(order_id)
-        except Exception as e:
-            raise RuntimeError(f"failed to remove order with id: {order_id}") from e
-        self.remove_order(order_id)
-
-    def pay_order(self, order_id):
-        """
-        Sets is_paid to true for the order with the matching id.
-        :param order_id:
-        :return:
-        """
-        if not isinstance(order_id, int):
-            raise TypeError("Order id must be an instance of int")
-        try:
-            self._orders_DAO.set_paid(order_id, True)
-            self.remove_order(order_id)
-        except Exception as e:
-            raise RuntimeError(f"Failed to pay/close order {order_id}") from e
-
-    def get_order_items(self, order_id) -> List[OrderItem]:
-        """
-        Fetches all order items from the database.
-        :param order_id:
-        :return:
-        """
-        if not isinstance(order_id, int):
-            raise TypeError("Order id must be an instance of int")
-        return self._order_items_DAO.get_items_by_order_id(order_id)
-
-    def add_order_item(self, order_item: OrderItem):
-        """
-        Adds a new order item to the database.
-        :param order_item:
-        :return:
-        """
-        if not isinstance(order_item, OrderItem):
-            raise TypeError("Order item must be an instance of OrderItem")
-
-        if order_item.order_id is None:
-            raise ValueError("Order item must have an order_id")
-
-        self._order_items_DAO.create(order_item)
-
-        for order in self.orders:
-            if order.id == order_item.order_id:
-                order.order_items.append(order_item)
-                pass
-
-    def edit_order_item(self, order_item: OrderItem):
-        """
-        Edits a new order item to the database.
-        :param order_item:
-        :return:
-        """
-        self._order_items_DAO.update(order_item)
-
-    def delete_order_item(self, order_item_id: int):
-        """
-        Deletes the order item from the database.
-        :param order_item_id:
-        :return:
-        """
-        self._order_items_DAO.delete(order_item_id)
-
-    def remove_order_item(self, order_id: int, order_item_id: int):
-        """
-        Removes the order item from the database.
-        :param order_id:
-        :param order_item_id:
-        :return:
-        """
-        if not isinstance(order_id, int):
-            raise TypeError("Order id must be an instance of int")
-        if not isinstance(order_item_id, int):
-            raise TypeError("Order item_id must be an instance of int")
-
-        self._order_items_DAO.delete(order_item_id)
-        for order in self.orders:
-            if order.id == order_id:
-                for order_item in order.order_items:
-                    if order_item.id == order_item_id:
-                        order.order_items.remove(order_item)
+import threading
+from typing import List
+import mysql.connector
+
+from src.data_access_layer.concurrency import ConcurrencyConflictError
+from src.data_access_layer.order_items_DAO import OrderItemsDAO
+from src.data_access_layer.orders_DAO import OrdersDAO
+from src.data_access_layer.database_connector import DatabaseConnector
+from src.objects.order import Order
+from src.objects.order_item import OrderItem
+
+
+class OrdersManager:
+    SAVE_ATTEMPTS = 3
+
+    def __init__(self):
+        self.orders = []
+        self._orders_version = None
+        self._prefetched_items = {}
+        self._sync_lock = threading.Lock()
+        self._orders_DAO = OrdersDAO()
+        self._order_items_DAO = OrderItemsDAO()
+        self._db_connector = DatabaseConnector()
+
+    def load_orders(self, prefetch_items: bool = False):
+        """
+        Loads orders from the database.
+        :param prefetch_items: also load the order_items of all orders with one query
+        :return:
+        """
+        with self._sync_lock:
+            self._load_orders(prefetch_items)
+
+    def _load_orders(self, prefetch_items: bool):
+        """
+        Loads all unpaid orders. Must be called with the sync lock held.
+        :param prefetch_items:
+        :return:
+        """
+        version = self._orders_DAO.get_orders_version()
+        self.orders = self._orders_DAO.get_unpaid_orders()
+        self._orders_version = version
+
+        self._prefetched_items = {}
+        if prefetch_items:
+            self._prefetch_order_items(self.orders)
+
+    def poll_changes(self, since: int):
+        """
+        Fetches the changes of orders and their order_items made after the given version, by this or other terminals.
+        :param since: version returned by the previous poll or read when the orders were loaded
+        :return: (current version, list of OrderChange), the list is None when the changes are no longer logged
+        """
+        if not isinstance(since, int):
+            raise TypeError("since must be an instance of int")
+        return self._orders_DAO.get_order_changes(since)
+
+    def refresh_orders(self, prefetch_items: bool = False):
+        """
+        Patches the loaded orders with the changes logged since the last load or refresh,
+        loads all orders the first time or when the changes are no longer logged.
+        Changed orders replace the loaded ones at their position, new ones are appended and paid or deleted ones are removed.
+        add_order() and remove_order() take the same lock, so orders they change meanwhile are not lost.
+        :param prefetch_items: also load the order_items of the changed orders with one query
+        :return: (changed orders, ids of removed orders)
+        """
+        with self._sync_lock:
+            changes = None
+            if self._orders_version is not None:
+                version, changes = self.poll_changes(self._orders_version)
+
+            if changes is None:
+                loaded_ids = {order.id for order in self.orders}
+                self._load_orders(prefetch_items)
+                return list(self.orders), loaded_ids - {order.id for order in self.orders}
+
+            is_open = {}
+            for change in changes:
+                is_open[change.order_id] = change.is_open
+            changed = self._orders_DAO.get_unpaid_orders_by_ids([order_id for order_id, value in is_open.items() if value])
+            closed_ids = set(is_open) - {order.id for order in changed}
+
+            removed_ids = {order.id for order in self.orders} & closed_ids
+            orders = [order for order in self.orders if order.id not in closed_ids]
+            positions = {order.id: index for index, order in enumerate(orders)}
+            for order in changed:
+                if order.id in positions:
+                    orders[positions[order.id]] = order
+                else:
+                    positions[order.id] = len(orders)
+                    orders.append(order)
+
+            self._prefetched_items = {
+                order_id: items for order_id, items in self._prefetched_items.items() if order_id not in is_open
+            }
+            if prefetch_items:
+                self._prefetch_order_items([order for order in orders if order.id not in self._prefetched_items])
+
+            self.orders = orders
+            self._orders_version = version
+            return changed, removed_ids
+
+    def _prefetch_order_items(self, orders: List[Order]):
+        """
+        Loads the order_items of the orders with one query and keeps them aside.
+        The orders are shared with the UI, so they are left untouched here and get_prefetched_order_items()
+        attaches the order_items when an order is opened.
+        :param orders:
+        :return:
+        """
+        if not orders:
+            return
+        items = self._order_items_DAO.get_items_by_order_ids([order.id for order in orders])
+        self._prefetched_items = {**self._prefetched_items, **items}
+
+    def get_prefetched_order_items(self, order_id: int) -> List[OrderItem] | None:
+        """
+        Returns the order_items prefetched with the orders and attaches them to the order.
+        Call it from the thread that edits the orders.
+        :param order_id:
+        :return: None when they were not prefetched, the order changed since or has unsaved changes
+        """
+        items = self._prefetched_items.get(order_id)
+        if items is None:
+            return None
+        for order in self.orders:
+            if order.id == order_id:
+                if order.is_dirty:
+                    return None
+                if order.order_items is not items:
+                    order.order_items = list(items)
+                    order.mark_clean()
+                    self._prefetched_items = {**self._prefetched_items, order_id: order.order_items}
+                return order.order_items
+        return None
+
+    def add_order(self, order: Order):
+        """
+        Adds a new order to the database.
+        A refresh running meanwhile may have loaded the new order already, it is then replaced by this one.
+        :param order:
+        :return:
+        """
+        if not isinstance(order, Order):
+            raise TypeError("Order must be an instance of Order")
+
+        self._orders_DAO.create(order)
+        with self._sync_lock:
+            for index, loaded in enumerate(self.orders):
+                if loaded.id == order.id:
+                    self.orders[index] = order
+                    break
+            else:
+                self.orders.append(order)
+
+    def update_order(self, order: Order) -> int:
+        """
+        Updates the order in the database. When someone else changed the order or its order items meanwhile,
+        the local changes are merged into the current rows and saved again unless both changed the same field.
+        The loaded orders pick up the saved version with the next refresh_orders(), run it in the background.
+        :param order:
+        :return: number of statements saved by sending only the changes
+        """
+        if not isinstance(order, Order):
+            raise TypeError("Order must be an instance of Order")
+
+        for attempt in range(self.SAVE_ATTEMPTS):
+            try:
+                saved = self._orders_DAO.update(order)
+                break
+            except ConcurrencyConflictError as e:
+                if attempt == self.SAVE_ATTEMPTS - 1 or not self._rebase_order(order, e.current):
+                    raise
+        return saved
+
+    @staticmethod
+    def _rebase_order(order: Order, current) -> bool:
+        """
+        Merges the local changes of the order into the current version of the conflicting row.
+        :param order:
+        :param current: current order or order item from ConcurrencyConflictError, None when it was deleted
+        :return: True when the changes were merged and can be saved again
+        """
+        if isinstance(current, Order):
+            target = order
+        elif isinstance(current, OrderItem):
+            target = next((item for item in order.order_items if item.id == current.id), None)
+        else:
+            target = None
+        return target is not None and not target.rebase(current)
+
+    def remove_order(self, order_id):
+        """
+        Removes the order from the loaded orders.
+        :param order_id:
+        :return:
+        """
+        if not isinstance(order_id, int):
+            raise TypeError("Order id must be an instance of int")
+
+        with self._sync_lock:
+            for order in self.orders:
+                if order.id == order_id:
+                    self.orders.remove(order)
+                    break
+
+    def delete_order(self, order_id):
+        """
+        Deletes the order from the database.
+        :param order_id:
+        :return:
+        """
+        if not isinstance(order_id, int):
+            raise TypeError("Order id must be an instance of int")
+
+        try:
+            self._orders_DAO.delete(order_id)
+        except Exception as e:
+            raise RuntimeError(f"failed to remove order with id: {order_id}") from e
+        self.remove_order(order_id)
+
+    def pay_order(self, order_id):
+        """
+        Sets is_paid to true for the order with the matching id.
+        :param order_id:
+        :return:
+        """
+        if not isinstance(order_id, int):
+            raise TypeError("Order id must be an instance of int")
+        try:
+            self._orders_DAO.set_paid(order_id, True)
+            self.remove_order(order_id)
+        except Exception as e:
+            raise RuntimeError(f"Failed to pay/close order {order_id}") from e
+
+    def get_order_items(self, order_id) -> List[OrderItem]:
+        """
+        Fetches all order items from the database.
+        :param order_id:
+        :return:
+        """
+        if not isinstance(order_id, int):
+            raise TypeError("Order id must be an instance of int")
+        return self._order_items_DAO.get_items_by_order_id(order_id)
+
+    def add_order_item(self, order_item: OrderItem):
+        """
+        Adds a new order item to the database.
+        :param order_item:
+        :return:
+        """
+        if not isinstance(order_item, OrderItem):
+            raise TypeError("Order item must be an instance of OrderItem")
+
+        if order_item.order_id is None:
+            raise ValueError("Order item must have an order_id")
+
+        self._order_items_DAO.create(order_item)
+        self._prefetched_items.pop(order_item.order_id, None)
+
+        for order in self.orders:
+            if order.id == order_item.order_id:
+                order.order_items.append(order_item)
+                pass
+
+    def edit_order_item(self, order_item: OrderItem):
+        """
+        Edits a new order item to the database, merging the change into a newer version of the row
+        when the quantity was not changed by someone else as well.
+        :param order_item:
+        :return:
+        """
+        for attempt in range(self.SAVE_ATTEMPTS):
+            try:
+                self._order_items_DAO.update(order_item)
+                break
+            except ConcurrencyConflictError as e:
+                if attempt == self.SAVE_ATTEMPTS - 1 or e.current is None or order_item.rebase(e.current):
+                    raise
+        self._prefetched_items.pop(order_item.order_id, None)
+
+    def delete_order_item(self, order_item_id: int):
+        """
+        Deletes the order item from the database.
+        :param order_item_id:
+        :return:
+        """
+        self._order_items_DAO.delete(order_item_id)
+        for order in self.orders:
+            if any(order_item.id == order_item_id for order_item in order.order_items):
+                self._prefetched_items.pop(order.id, None)
+
+    def remove_order_item(self, order_id: int, order_item_id: int):
+        """
+        Removes the order item from the database.
+        :param order_id:
+        :param order_item_id:
+        :return:
+        """
+        if not isinstance(order_id, int):
+            raise TypeError("Order id must be an instance of int")
+        if not isinstance(order_item_id, int):
+            raise TypeError("Order item_id must be an instance of int")
+
+        self._order_items_DAO.delete(order_item_id)
+        self._prefetched_items.pop(order_id, None)
+        for order in self.orders:
+            if order.id == order_id:
+                for order_item in order.order_items:
+                    if order_item.id == order_item_id:
+                        order.order_items.remove(order_item)
                         break
\ No newline at end of file
@@ -0,0 +1,100 @@
+import threading
+from collections import OrderedDict
+from datetime import date, datetime, time
+
+
+class ReportCache:
+    def __init__(self, capacity: int):
+        """
+        LRU cache of report rows keyed by the normalized date range. Every entry remembers the version of the data
+        it was built from and is only returned while that version is still current.
+        :param capacity: maximum number of cached ranges
+        """
+        if not isinstance(capacity, int) or capacity <= 0:
+            raise ValueError("report cache capacity must be a positive integer")
+
+        self._capacity = capacity
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def make_key(start_date, end_date) -> tuple:
+        """
+        Normalizes the range so equal ranges given as date, datetime or string share one entry.
+        :param start_date: date, datetime or "YYYY-MM-DD HH:MM:SS"
+        :param end_date: date, datetime or "YYYY-MM-DD HH:MM:SS"
+        :return: (start datetime, end datetime) without microseconds
+        """
+        def normalize(value) -> datetime:
+            if isinstance(value, str):
+                value = datetime.fromisoformat(value)
+            elif not isinstance(value, datetime) and isinstance(value, date):
+                value = datetime.combine(value, time.min)
+            return value.replace(microsecond=0, tzinfo=None)
+
+        return normalize(start_date), normalize(end_date)
+
+    def get(self, key: tuple, version):
+        """
+        Returns the cached rows of the range, or None when they are missing or were built from another version.
+        :param key: result of make_key()
+        :param version: current version of the data of the range
+        :return:
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if entry[0] != version:
+                del self._entries[key]
+                self.invalidations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: tuple, version, rows: list):
+        """
+        Stores the rows of the range and evicts the least recently used range when full.
+        :param key: result of make_key()
+        :param version: version of the data the rows were built from
+        :param rows:
+        :return:
+        """
+        with self._lock:
+            self._entries[key] = (version, rows)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self._capacity:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """
+        Forgets every cached range.
+        :return:
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "capacity": self._capacity,
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
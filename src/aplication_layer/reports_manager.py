@@ -1,13 +1,30 @@
-from datetime import datetime
-from src.data_access_layer.reports_DAO import ReportsDAO
-
-class ReportsManager:
-    def __init__(self):
-        self._reports_DAO = ReportsDAO()
-        self.sales_report_data = []
-
-    def load_sales_report(self, start_date: datetime, end_date: datetime):
-        """
-        Loads filtered report data.
-        """
-        self.sales_report_data = self._reports_DAO.get_sales_report(start_date, end_date)
\ No newline at end of file
+from datetime import datetime
+from src.aplication_layer.report_cache import ReportCache
+from src.data_access_layer.reports_DAO import ReportsDAO
+
+class ReportsManager:
+    def __init__(self, cache_size: int = 32):
+        self._reports_DAO = ReportsDAO()
+        self._cache = ReportCache(cache_size)
+        self.sales_report_data = []
+
+    def load_sales_report(self, start_date: datetime, end_date: datetime):
+        """
+        Loads filtered report data. A range that was loaded before is served from the cache
+        as long as none of its orders and no menu item changed since.
+        """
+        key = self._cache.make_key(start_date, end_date)
+        version = self._reports_DAO.get_sales_version(*key)
+
+        rows = self._cache.get(key, version)
+        if rows is None:
+            rows = self._reports_DAO.get_sales_report(*key)
+            self._cache.put(key, version, rows)
+        self.sales_report_data = rows
+
+    def cache_stats(self) -> dict:
+        """
+        Returns the hit, miss, invalidation and eviction counters of the report cache.
+        :return:
+        """
+        return self._cache.stats()
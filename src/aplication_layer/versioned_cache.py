@@ -0,0 +1,81 @@
+import time
+
+
+class VersionedCache:
+    VERSION_CHECK_INTERVAL = 30
+
+    def __init__(self, get_version, load):
+        """
+        List loaded from the database together with the change counter of its table. The list is read again
+        only when the counter moved, and the counter at most once per VERSION_CHECK_INTERVAL seconds.
+        :param get_version: reads the change counter of the table
+        :param load: reads the whole list
+        """
+        self._get_version = get_version
+        self._load = load
+        self._revision = 0
+        self._version = None
+        self._checked_at = float("-inf")
+        self.items = []
+
+    @property
+    def items(self) -> list:
+        return self._items
+
+    @items.setter
+    def items(self, value: list):
+        if not isinstance(value, list):
+            raise ValueError("items must be a list")
+        self._items = value
+        self._revision += 1
+
+    @property
+    def revision(self) -> int:
+        """
+        Number that changes whenever the list changes.
+        :return:
+        """
+        return self._revision
+
+    def load(self):
+        """
+        Loads the list and the counter it belongs to.
+        :return:
+        """
+        version = self._get_version()
+        self.items = self._load()
+        self._version = version
+        self._checked_at = time.monotonic()
+
+    def refresh(self, max_age: float = None) -> bool:
+        """
+        Reloads the list only when the counter changed since it was loaded.
+        :param max_age: seconds a counter check stays valid, None uses VERSION_CHECK_INTERVAL
+        :return: True when the list was reloaded
+        """
+        if max_age is None:
+            max_age = self.VERSION_CHECK_INTERVAL
+        if self._version is not None and time.monotonic() - self._checked_at < max_age:
+            return False
+
+        version = self._get_version()
+        self._checked_at = time.monotonic()
+        if version == self._version:
+            return False
+
+        self.items = self._load()
+        self._version = version
+        return True
+
+    def applied(self, rows: int = 1):
+        """
+        Records a write of this terminal that was already applied to the list.
+        The triggers increment the counter once per written row, so the expected counter is advanced by the same
+        amount and the next check only reloads the list when someone else changed the table as well.
+        Pass the row count reported by the database, a write that matched no row moved no counter.
+        :param rows: number of rows written
+        :return:
+        """
+        if self._version is not None:
+            self._version += rows
+        self._revision += 1
@@ -0,0 +1,126 @@
+import math
+import threading
+import time
+
+import mysql.connector
+
+CONNECTION_ERRNOS = {2002, 2003, 2005, 2006, 2013, 2026, 2055}
+
+
+class DatabaseUnavailableError(mysql.connector.errors.InterfaceError):
+    """
+    Raised without contacting the server while the circuit breaker is open.
+    """
+
+
+def is_connection_error(error: Exception) -> bool:
+    """
+    Tells whether the error means the connection was lost or could not be opened, as opposed to an error
+    reported by the server for the statement itself. Only the client errors listed in CONNECTION_ERRNOS count,
+    other client side errors such as reading a missing result set are raised as they are.
+    :param error:
+    :return:
+    """
+    if not isinstance(error, (mysql.connector.errors.InterfaceError, mysql.connector.errors.OperationalError)):
+        return False
+    return error.errno in CONNECTION_ERRNOS
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        """
+        Stops calls to the database after repeated connection failures and lets one trial call through
+        once reset_timeout has passed.
+        :param failure_threshold: consecutive connection failures that open the breaker
+        :param reset_timeout: seconds the breaker stays open before the next trial call
+        """
+        if not isinstance(failure_threshold, int) or failure_threshold <= 0:
+            raise ValueError("failure_threshold must be a positive integer")
+
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_started = None
+
+        self._rejected = 0
+        self._opened = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self._reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def before_call(self):
+        """
+        Raises DatabaseUnavailableError while the breaker is open.
+        After reset_timeout one caller is let through as a trial, the others keep failing fast until it finishes.
+        :return:
+        """
+        with self._lock:
+            if self._state == self.CLOSED:
+                return
+
+            now = time.monotonic()
+            remaining = self._reset_timeout - (now - self._opened_at)
+            trial_expired = self._trial_started is None or now - self._trial_started >= self._reset_timeout
+            if remaining <= 0 and trial_expired:
+                self._state = self.HALF_OPEN
+                self._trial_started = now
+                return
+
+            self._rejected += 1
+            if remaining > 0:
+                raise DatabaseUnavailableError(
+                    msg=f"Database is unavailable, next connection attempt in {math.ceil(remaining)} s"
+                )
+            raise DatabaseUnavailableError(msg="Database is unavailable, reconnecting")
+
+    def allows_retry(self) -> bool:
+        """
+        Tells whether a failed call may retry now, i.e. the breaker did not open because of it.
+        :return:
+        """
+        with self._lock:
+            return self._state == self.CLOSED
+
+    def record_success(self):
+        if self._failures == 0 and self._state == self.CLOSED:
+            return
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_started = None
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self._failure_threshold:
+                if self._state != self.OPEN:
+                    self._opened += 1
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._trial_started = None
+
+    def stats(self) -> dict:
+        """
+        Returns a snapshot of the breaker state and counters.
+        :return:
+        """
+        state = self.state
+        with self._lock:
+            return {
+                "state": state,
+                "consecutive_failures": self._failures,
+                "times_opened": self._opened,
+                "rejected_calls": self._rejected,
+            }
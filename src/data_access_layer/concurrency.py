@@ -0,0 +1,14 @@
+class ConcurrencyConflictError(RuntimeError):
+    """
+    Raised when a row was changed or deleted by someone else after it was loaded, so the write was not applied.
+    """
+
+    def __init__(self, message: str, row_id: int, current=None):
+        """
+        :param message:
+        :param row_id: id of the conflicting row
+        :param current: the row as it is stored now, None when it was deleted
+        """
+        super().__init__(message)
+        self.row_id = row_id
+        self.current = current
@@ -0,0 +1,308 @@
+import threading
+import time
+
+import mysql.connector
+
+
+class ConnectionPool:
+    def __init__(self, factory, size: int, idle_timeout: float, checkout_timeout: float,
+                 validator=None, validation_interval: float = 0, keepalive_interval: float = 0):
+        """
+        Bounded pool of database connections.
+        Every thread checks out at most one connection, nested checkouts on the same thread reuse it.
+        Liveness is tracked passively: a connection is only validated when it has not been checked for
+        validation_interval seconds, and connections that failed while in use are closed on check-in.
+        :param factory: callable that opens a new connection
+        :param size: maximum number of open connections
+        :param idle_timeout: seconds after which an unused connection is closed
+        :param checkout_timeout: seconds to wait for a free connection before giving up
+        :param validator: callable that checks a connection and repairs it or raises
+        :param validation_interval: seconds a connection is trusted after it was last known to work
+        :param keepalive_interval: seconds between background checks of idle connections, 0 disables them
+        """
+        if not isinstance(size, int) or size <= 0:
+            raise ValueError("pool size must be a positive integer")
+
+        self._factory = factory
+        self._size = size
+        self._idle_timeout = idle_timeout
+        self._checkout_timeout = checkout_timeout
+        self._validator = validator
+        self._validation_interval = validation_interval
+        self._keepalive_interval = keepalive_interval
+
+        self._condition = threading.Condition()
+        self._local = threading.local()
+        self._idle = []
+        self._open = 0
+        self._in_use = 0
+
+        self._created = 0
+        self._checkouts = 0
+        self._waits = 0
+        self._timeouts = 0
+        self._evicted = 0
+        self._validations = 0
+        self._invalidated = 0
+        self._keepalive_checks = 0
+
+        if validator is not None and keepalive_interval > 0:
+            threading.Thread(target=self._keepalive_loop, name="db-keepalive", daemon=True).start()
+
+    @property
+    def size(self):
+        return self._size
+
+    def acquire(self):
+        """
+        Returns the connection checked out by the current thread, checking one out if needed.
+        :return:
+        """
+        local = self._local
+        if getattr(local, "connection", None) is not None:
+            local.depth += 1
+            return local.connection
+
+        connection = self._checkout()
+        local.connection = connection
+        local.depth = 1
+        local.invalid = False
+        local.written = False
+        return connection
+
+    def holds_connection(self) -> bool:
+        """
+        Tells whether the current thread has a connection checked out.
+        :return:
+        """
+        return getattr(self._local, "connection", None) is not None
+
+    def mark_written(self):
+        """
+        Records that the current checkout executed a statement that changes data.
+        :return:
+        """
+        if getattr(self._local, "connection", None) is not None:
+            self._local.written = True
+
+    def has_written(self) -> bool:
+        """
+        Tells whether the current checkout executed a statement that changes data.
+        :return:
+        """
+        return getattr(self._local, "connection", None) is not None and self._local.written
+
+    def release(self):
+        """
+        Releases one checkout of the current thread, the connection goes back to the pool after the last one.
+        :return:
+        """
+        local = self._local
+        connection = getattr(local, "connection", None)
+        if connection is None:
+            return
+
+        local.depth -= 1
+        if local.depth > 0:
+            return
+
+        local.connection = None
+        self._checkin(connection, local.invalid)
+
+    def invalidate(self):
+        """
+        Marks the connection of the current thread as broken, it is closed instead of being returned to the pool.
+        :return:
+        """
+        if getattr(self._local, "connection", None) is not None:
+            self._local.invalid = True
+
+    def stats(self) -> dict:
+        """
+        Returns a snapshot of the pool counters.
+        :return:
+        """
+        with self._condition:
+            return {
+                "size": self._size,
+                "open": self._open,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "created": self._created,
+                "checkouts": self._checkouts,
+                "waits": self._waits,
+                "timeouts": self._timeouts,
+                "evicted": self._evicted,
+                "validations": self._validations,
+                "invalidated": self._invalidated,
+                "keepalive_checks": self._keepalive_checks,
+            }
+
+    def close_all(self):
+        """
+        Closes every idle connection. Connections in use are closed when they are returned.
+        :return:
+        """
+        with self._condition:
+            idle = self._idle
+            self._idle = []
+            self._open -= len(idle)
+            self._condition.notify_all()
+
+        for connection, _, _ in idle:
+            self._close_quietly(connection)
+
+    def _checkout(self):
+        """
+        Takes an idle connection or opens a new one, waiting while the pool is exhausted.
+        :return:
+        """
+        deadline = time.monotonic() + self._checkout_timeout
+        with self._condition:
+            while True:
+                expired = self._take_expired_locked()
+                if self._idle:
+                    connection, _, last_checked = self._idle.pop()
+                    self._in_use += 1
+                    self._checkouts += 1
+                    break
+
+                if self._open < self._size:
+                    connection = None
+                    self._open += 1
+                    self._in_use += 1
+                    self._checkouts += 1
+                    break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise mysql.connector.errors.PoolError(
+                        msg=f"No free database connection after {self._checkout_timeout} s (pool size {self._size})"
+                    )
+                self._waits += 1
+                self._condition.wait(remaining)
+
+        for old_connection in expired:
+            self._close_quietly(old_connection)
+
+        if connection is not None:
+            if self._validator is None or time.monotonic() - last_checked < self._validation_interval:
+                return connection
+            try:
+                self._validator(connection)
+            except Exception:
+                self._discard(connection)
+                raise
+            with self._condition:
+                self._validations += 1
+            return connection
+
+        try:
+            connection = self._factory()
+        except Exception:
+            with self._condition:
+                self._open -= 1
+                self._in_use -= 1
+                self._condition.notify()
+            raise
+
+        with self._condition:
+            self._created += 1
+        return connection
+
+    def _checkin(self, connection, invalid: bool = False):
+        """
+        Returns the connection to the pool, ending any transaction left open by a read.
+        A connection that worked until now counts as checked, so the next checkout skips validation.
+        :param connection:
+        :param invalid: True when the connection failed while it was in use
+        :return:
+        """
+        healthy = not invalid
+        if healthy:
+            try:
+                if connection.in_transaction:
+                    connection.rollback()
+            except mysql.connector.Error:
+                healthy = False
+
+        with self._condition:
+            self._in_use -= 1
+            if healthy:
+                now = time.monotonic()
+                self._idle.append((connection, now, now))
+            else:
+                self._open -= 1
+                self._invalidated += 1
+            expired = self._take_expired_locked()
+            self._condition.notify()
+
+        if not healthy:
+            self._close_quietly(connection)
+        for old_connection in expired:
+            self._close_quietly(old_connection)
+
+    def _take_expired_locked(self):
+        """
+        Removes connections idle for longer than idle_timeout. Must be called with the lock held.
+        :return: list of removed connections, to be closed outside the lock
+        """
+        if not self._idle:
+            return []
+
+        limit = time.monotonic() - self._idle_timeout
+        expired = [entry[0] for entry in self._idle if entry[1] < limit]
+        if expired:
+            self._idle = [entry for entry in self._idle if entry[1] >= limit]
+            self._open -= len(expired)
+            self._evicted += len(expired)
+        return expired
+
+    def _discard(self, connection):
+        """
+        Closes a checked out connection and frees its slot.
+        :param connection:
+        :return:
+        """
+        with self._condition:
+            self._open -= 1
+            self._in_use -= 1
+            self._invalidated += 1
+            self._condition.notify()
+        self._close_quietly(connection)
+
+    def _keepalive_loop(self):
+        """
+        Periodically validates idle connections that were not used for keepalive_interval seconds,
+        so they are not dropped by the server and checkouts rarely need to validate.
+        :return:
+        """
+        while True:
+            time.sleep(self._keepalive_interval)
+
+            with self._condition:
+                limit = time.monotonic() - self._keepalive_interval
+                stale = [entry for entry in self._idle if entry[2] < limit]
+                self._idle = [entry for entry in self._idle if entry[2] >= limit]
+                self._in_use += len(stale)
+
+            for connection, last_used, _ in stale:
+                try:
+                    self._validator(connection)
+                except Exception:
+                    self._discard(connection)
+                    continue
+
+                with self._condition:
+                    self._in_use -= 1
+                    self._keepalive_checks += 1
+                    self._idle.append((connection, last_used, time.monotonic()))
+                    self._condition.notify()
+
+    @staticmethod
+    def _close_quietly(connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
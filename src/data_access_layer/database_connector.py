@@ -1,75 +1,611 @@
-import sys
-from pathlib import Path
-
-import mysql.connector
-import configparser
-
-class DatabaseConnector:
-    _instance = None
-
-    def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance._connection = None
-            cls._instance._load_config()
-        return cls._instance
-
-    def _load_config(self):
-        """
-        Loads configuration from the configuration file.
-        :return:
-        """
-        try:
-            path = DatabaseConnector.get_configuration_files_folder_path() / "config.ini"
-            config = configparser.ConfigParser()
-            with open(path, 'r') as f:
-                config.read_file(f)
-
-            section = config["mysql"]
-            self._host = section["host"]
-            self._database = section["database"]
-            self._user = section["user"]
-            self._password = section["password"]
-        except FileNotFoundError:
-            raise RuntimeError("Configuration file not found.")
-        except KeyError as e:
-            raise RuntimeError(f"Missing required config key: {e}.")
-        except Exception as e:
-            raise RuntimeError(f"Failed to initialize configuration: {e}")
-
-    def connect(self):
-        """
-        Connects to MySQL database.
-        :return:
-        """
-        if self._connection is None or not self._connection.is_connected():
-            self._connection = mysql.connector.connect(
-                host=self._host,
-                user=self._user,
-                password=self._password,
-                database=self._database,
-                use_pure=True
-            )
-        return self._connection
-
-    @staticmethod
-    def get_configuration_files_folder_path():
-        """
-        Creates path to the configuration folder.
-        :return:
-        """
-        if getattr(sys, 'frozen', False):
-            base_path = Path(sys.executable).parent
-        else:
-            base_path = Path(__file__).resolve().parent.parent.parent
-
-        config_dir = base_path / "configuration_files"
-
-        if config_dir.exists():
-            return config_dir
-
-        alt_config_dir = base_path / "dist" / "configuration_files"
-        if alt_config_dir.exists():
-            return alt_config_dir
-
-        raise RuntimeError(f"Configuration folder not found at: {config_dir}")
+import functools
+import sys
+import threading
+import time
+from pathlib import Path
+
+import mysql.connector
+import configparser
+
+from src.data_access_layer.circuit_breaker import CircuitBreaker, is_connection_error
+from src.data_access_layer.connection_pool import ConnectionPool
+from src.data_access_layer.identity_map import IdentityMap
+from src.data_access_layer.query_tracer import QueryTracer
+from src.data_access_layer.sqlite_connection import SQLiteConnection
+from src.data_access_layer.statement_cache import StatementCache, StatementCacheStats, QueryResult
+
+
+class DatabaseConnector:
+    BACKENDS = ["mysql", "sqlite"]
+    READ_STATEMENTS = ("SELECT", "WITH", "SHOW", "EXPLAIN")
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._load_config()
+            cls._instance._statement_stats = StatementCacheStats()
+            cls._instance._tracer = cls._instance._create_tracer()
+            cls._instance._identity_map = IdentityMap()
+            cls._instance._breaker = CircuitBreaker(
+                cls._instance._failure_threshold,
+                cls._instance._reset_timeout
+            )
+            cls._instance._pool = cls._instance._create_pool(cls._instance._primary_settings)
+            cls._instance._local = threading.local()
+
+            cls._instance._replica_pool = None
+            cls._instance._replica_breaker = None
+            cls._instance._replica_lag = None
+            cls._instance._replica_lag_checked_at = float("-inf")
+            cls._instance._replica_routed = 0
+            cls._instance._replica_fallbacks = 0
+            if cls._instance._replica_settings is not None:
+                cls._instance._replica_pool = cls._instance._create_pool(cls._instance._replica_settings)
+                cls._instance._replica_breaker = CircuitBreaker(
+                    cls._instance._failure_threshold,
+                    cls._instance._reset_timeout
+                )
+        return cls._instance
+
+    def _load_config(self):
+        """
+        Loads configuration from the configuration file.
+        :return:
+        """
+        try:
+            path = DatabaseConnector.get_configuration_files_folder_path() / "config.ini"
+            config = configparser.ConfigParser()
+            with open(path, 'r') as f:
+                config.read_file(f)
+
+            self._backend = config.get("database", "backend", fallback="mysql").strip().lower()
+            if self._backend not in self.BACKENDS:
+                raise ValueError(f"backend must be one of {self.BACKENDS}")
+
+            if self._backend == "sqlite":
+                self._primary_settings = {
+                    "backend": "sqlite",
+                    "path": self._resolve_data_path(config.get("sqlite", "path", fallback="restaurant.db"))
+                }
+                self._use_c_extension = False
+            else:
+                self._primary_settings = self._read_mysql_settings(config["mysql"])
+                self._use_c_extension = config["mysql"].getboolean("use_c_extension", fallback=False)
+
+            self._replica_settings = None
+            if config.has_section("mysql_replica") and config.getboolean("mysql_replica", "enabled", fallback=True):
+                section = config["mysql_replica"]
+                if section.get("backend", fallback="mysql").strip().lower() == "sqlite":
+                    self._replica_settings = {"backend": "sqlite", "path": self._resolve_data_path(section["path"])}
+                else:
+                    self._replica_settings = self._read_mysql_settings(section)
+                self._replica_max_lag = section.getfloat("max_lag_seconds", fallback=30)
+                self._replica_lag_check_interval = section.getfloat("lag_check_interval", fallback=10)
+
+            self._pool_size = config.getint("pool", "size", fallback=5)
+            self._pool_idle_timeout = config.getfloat("pool", "idle_timeout", fallback=300)
+            self._pool_checkout_timeout = config.getfloat("pool", "checkout_timeout", fallback=10)
+            self._statement_cache_size = config.getint("pool", "statement_cache_size", fallback=32)
+            self._pool_validation_interval = config.getfloat("pool", "validation_interval", fallback=30)
+            self._pool_keepalive_interval = config.getfloat("pool", "keepalive_interval", fallback=20)
+
+            self._retry_attempts = config.getint("resilience", "retry_attempts", fallback=2)
+            self._retry_backoff = config.getfloat("resilience", "retry_backoff", fallback=0.2)
+            self._failure_threshold = config.getint("resilience", "failure_threshold", fallback=3)
+            self._reset_timeout = config.getfloat("resilience", "reset_timeout", fallback=10)
+
+            self._bulk_insert_chunk_size = config.getint("bulk", "insert_chunk_size", fallback=500)
+            if self._bulk_insert_chunk_size <= 0:
+                raise ValueError("insert_chunk_size must be a positive integer")
+
+            self._tracing_enabled = config.getboolean("tracing", "enabled", fallback=True)
+            self._slow_query_ms = config.getfloat("tracing", "slow_query_ms", fallback=200)
+            slow_query_log = config.get("tracing", "slow_query_log", fallback="slow_queries.log").strip()
+            self._slow_query_log = self._resolve_data_path(slow_query_log) if slow_query_log else None
+        except FileNotFoundError:
+            raise RuntimeError("Configuration file not found.")
+        except KeyError as e:
+            raise RuntimeError(f"Missing required config key: {e}.")
+        except Exception as e:
+            raise RuntimeError(f"Failed to initialize configuration: {e}")
+
+    @staticmethod
+    def _read_mysql_settings(section) -> dict:
+        """
+        Reads the connection settings of a MySQL server from a config section.
+        :param section:
+        :return:
+        """
+        return {
+            "backend": "mysql",
+            "host": section["host"],
+            "port": section.getint("port", fallback=3306),
+            "database": section["database"],
+            "user": section["user"],
+            "password": section["password"],
+            "connection_timeout": section.getint("connection_timeout", fallback=5),
+        }
+
+    def connect(self, read_only: bool = False):
+        """
+        Checks out a pooled connection for the current thread.
+        The connection is not pinged here, the pool validates it only after validation_interval without use.
+        Fails fast with DatabaseUnavailableError while the circuit breaker is open.
+        Every call must be paired with release(), also when it raised, so DAOs may call it inside try.
+        :param read_only: True for reporting and history reads that may run on the replica
+        :return:
+        """
+        routes = self._routes()
+        if routes and all(route is None for route in routes):
+            routes.clear()
+
+        try:
+            if read_only and self._replica_pool is not None and not self._pool.holds_connection():
+                connection = self._connect_replica()
+                if connection is not None:
+                    return connection
+
+            connection = self._checkout(self._pool, self._breaker)
+        except Exception:
+            routes.append(None)
+            raise
+        routes.append(self._pool)
+        return connection
+
+    def release(self):
+        """
+        Returns the connection of the current thread to the pool it came from.
+        The release paired with a failed connect() returns nothing, and calls without a matching connect() are ignored,
+        so a connection still used by an outer caller is never handed back early.
+        :return:
+        """
+        routes = self._routes()
+        if not routes:
+            return
+        pool = routes.pop()
+        if pool is not None:
+            pool.release()
+
+    def _routes(self) -> list:
+        """
+        Pools of the connections checked out by the current thread, innermost last.
+        None marks a connect() that failed and whose release() is still to come.
+        :return:
+        """
+        routes = getattr(self._local, "routes", None)
+        if routes is None:
+            routes = []
+            self._local.routes = routes
+        return routes
+
+    def _current_pool(self) -> ConnectionPool:
+        for pool in reversed(self._routes()):
+            if pool is not None:
+                return pool
+        return self._pool
+
+    def _breaker_for(self, pool: ConnectionPool) -> CircuitBreaker:
+        return self._replica_breaker if pool is self._replica_pool else self._breaker
+
+    def _checkout(self, pool: ConnectionPool, breaker: CircuitBreaker):
+        """
+        Checks out a connection from the pool, retrying failed connection attempts with backoff.
+        :param pool:
+        :param breaker: circuit breaker of the server behind the pool
+        :return:
+        """
+        if pool.holds_connection():
+            return pool.acquire()
+
+        attempt = 0
+        while True:
+            breaker.before_call()
+            try:
+                return pool.acquire()
+            except mysql.connector.Error as e:
+                if not is_connection_error(e):
+                    raise
+                breaker.record_failure()
+                if attempt >= self._retry_attempts or not breaker.allows_retry():
+                    raise
+            attempt += 1
+            time.sleep(self._retry_backoff * 2 ** (attempt - 1))
+
+    def _connect_replica(self):
+        """
+        Checks out a replica connection if the replica is reachable and not lagging more than max_lag_seconds.
+        :return: the connection, or None when the query must fall back to the primary
+        """
+        try:
+            connection = self._checkout(self._replica_pool, self._replica_breaker)
+        except mysql.connector.Error as e:
+            if not is_connection_error(e):
+                raise
+            self._replica_fallbacks += 1
+            return None
+        self._routes().append(self._replica_pool)
+
+        try:
+            fresh = self._replica_is_fresh(connection)
+        except mysql.connector.Error:
+            fresh = False
+        if not fresh:
+            self.release()
+            self._replica_fallbacks += 1
+            return None
+
+        self._replica_routed += 1
+        return connection
+
+    def _replica_is_fresh(self, connection) -> bool:
+        """
+        Compares the replication lag with max_lag_seconds, measuring it at most every lag_check_interval.
+        :param connection: replica connection
+        :return:
+        """
+        now = time.monotonic()
+        if now - self._replica_lag_checked_at >= self._replica_lag_check_interval:
+            self._replica_lag = self._measure_replica_lag(connection)
+            self._replica_lag_checked_at = now
+        return self._replica_lag is not None and self._replica_lag <= self._replica_max_lag
+
+    @staticmethod
+    def _measure_replica_lag(connection):
+        """
+        Reads how many seconds the replica is behind its source.
+        A server that is not replicating at all, e.g. a local copy used for testing, counts as up to date.
+        :param connection:
+        :return: lag in seconds, None when replication is broken
+        """
+        if isinstance(connection, SQLiteConnection):
+            return 0.0
+
+        for statement, column in (("SHOW REPLICA STATUS", "Seconds_Behind_Source"),
+                                  ("SHOW SLAVE STATUS", "Seconds_Behind_Master")):
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute(statement)
+                    row = cursor.fetchone()
+                    names = cursor.column_names
+            except mysql.connector.errors.ProgrammingError:
+                continue
+
+            if row is None:
+                return 0.0
+            lag = row[names.index(column)]
+            return None if lag is None else float(lag)
+        return None
+
+    def replica_stats(self) -> dict:
+        """
+        Returns how many read-only checkouts went to the replica or fell back to the primary.
+        :return:
+        """
+        if self._replica_pool is None:
+            return {"enabled": False}
+        return {
+            "enabled": True,
+            "lag_seconds": self._replica_lag,
+            "max_lag_seconds": self._replica_max_lag,
+            "routed": self._replica_routed,
+            "fallbacks": self._replica_fallbacks,
+            "breaker": self._replica_breaker.stats(),
+            "pool": self._replica_pool.stats(),
+        }
+
+    def execute(self, connection, sql: str, params=None, prepared: bool = True) -> QueryResult:
+        """
+        Executes the statement on the connection and fetches its whole result.
+        Prepared statements are cached per connection, so repeated statements are parsed by the server only once.
+        :param connection: connection returned by connect()
+        :param sql: statement using %s or %(name)s placeholders
+        :param params: tuple, list or dict of parameters
+        :param prepared: False for statements whose text changes between calls, e.g. generated IN lists
+        :return:
+        """
+        if self._tracer is None:
+            return self._execute_with_retry(connection, sql, params, prepared)
+
+        started = time.perf_counter()
+        result = self._execute_with_retry(connection, sql, params, prepared)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        caller = sys._getframe(1).f_code
+        trace = self._tracer.record(
+            getattr(caller, "co_qualname", caller.co_name),
+            sql,
+            elapsed_ms,
+            len(result.rows) if result.rows else max(result.rowcount, 0),
+            threading.current_thread().name
+        )
+        if self._tracer.is_slow(elapsed_ms):
+            self._tracer.log_slow_query(trace, sql, self._explain(connection, sql, params))
+        return result
+
+    def _execute_with_retry(self, connection, sql: str, params, prepared: bool) -> QueryResult:
+        """
+        Executes the statement, reconnecting and retrying when the connection was lost.
+        A retry is only safe while the checkout has not changed any data: the server rolls back the open
+        transaction of a lost connection, so reads and the first write of a transaction can simply run again.
+        :param connection:
+        :param sql:
+        :param params:
+        :param prepared:
+        :return:
+        """
+        pool = self._current_pool()
+        breaker = self._breaker_for(pool)
+
+        attempt = 0
+        while True:
+            try:
+                if attempt:
+                    self._reconnect(connection)
+                result = self._execute(connection, sql, params, prepared)
+            except mysql.connector.Error as e:
+                if not is_connection_error(e):
+                    raise
+                breaker.record_failure()
+                if attempt >= self._retry_attempts or pool.has_written() or not breaker.allows_retry():
+                    pool.invalidate()
+                    raise
+                attempt += 1
+                time.sleep(self._retry_backoff * 2 ** (attempt - 1))
+                continue
+
+            breaker.record_success()
+            if sql.lstrip().split(None, 1)[0].upper() not in self.READ_STATEMENTS:
+                pool.mark_written()
+            return result
+
+    @staticmethod
+    def _execute(connection, sql: str, params, prepared: bool) -> QueryResult:
+        if prepared:
+            return connection.statement_cache.execute(sql, params)
+
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall() if cursor.with_rows else []
+            return QueryResult(rows, cursor.lastrowid, cursor.rowcount)
+
+    def _explain(self, connection, sql: str, params) -> list:
+        """
+        Fetches the query plan of a slow statement on the connection that ran it.
+        :param connection:
+        :param sql:
+        :param params:
+        :return: rows of the plan, or a one-item list with the reason there is none
+        """
+        statement = sql.strip().rstrip(";").strip()
+        if statement.split(None, 1)[0].upper() not in ("SELECT", "INSERT", "UPDATE", "DELETE", "REPLACE", "WITH"):
+            return [("not explainable",)]
+
+        prefix = "EXPLAIN QUERY PLAN " if isinstance(connection, SQLiteConnection) else "EXPLAIN "
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(prefix + statement, params)
+                return cursor.fetchall()
+        except mysql.connector.Error as e:
+            return [(f"EXPLAIN failed: {e}",)]
+
+    @property
+    def query_tracer(self) -> QueryTracer | None:
+        """
+        Tracer that collects the latency of every statement, None when tracing is disabled.
+        :return:
+        """
+        return self._tracer
+
+    @property
+    def identity_map(self) -> IdentityMap:
+        """
+        Identity map shared by all DAOs, so each row is represented by one object.
+        :return:
+        """
+        return self._identity_map
+
+    def query_stats(self) -> list[dict]:
+        """
+        Returns p50/p95/p99 latencies per statement fingerprint, slowest first.
+        :return:
+        """
+        return self._tracer.summary() if self._tracer is not None else []
+
+    def statement_cache_stats(self) -> dict:
+        """
+        Returns prepared statement cache hit/miss counters of all pooled connections.
+        :return:
+        """
+        return self._statement_stats.as_dict()
+
+    @property
+    def backend(self) -> str:
+        """
+        Database backend selected in config.ini.
+        :return: "mysql" or "sqlite"
+        """
+        return self._backend
+
+    @property
+    def driver(self) -> str:
+        """
+        Name of the protocol implementation used for new connections.
+        :return: "c-extension", "pure-python" or "sqlite"
+        """
+        if self._backend == "sqlite":
+            return "sqlite"
+        return "c-extension" if self._use_c_extension and mysql.connector.HAVE_CEXT else "pure-python"
+
+    def set_use_c_extension(self, use_c_extension: bool):
+        """
+        Switches the protocol implementation used for new connections and closes the idle ones.
+        :param use_c_extension:
+        :return:
+        """
+        if not isinstance(use_c_extension, bool):
+            raise TypeError("use_c_extension must be a bool")
+        self._use_c_extension = use_c_extension
+        self._pool.close_all()
+        if self._replica_pool is not None:
+            self._replica_pool.close_all()
+
+    @property
+    def bulk_insert_chunk_size(self) -> int:
+        """
+        Number of rows the DAOs put into one multi-row INSERT.
+        :return:
+        """
+        return self._bulk_insert_chunk_size
+
+    def auto_increment_step(self, connection) -> int:
+        """
+        Returns the distance between consecutive auto-increment ids on the connection's server.
+        The value is read once per connection.
+        :param connection: connection returned by connect()
+        :return:
+        """
+        step = getattr(connection, "auto_increment_step", None)
+        if step is None:
+            if isinstance(connection, SQLiteConnection):
+                step = 1
+            else:
+                step = int(self.execute(connection, "SELECT @@auto_increment_increment").fetchone()[0])
+            connection.auto_increment_step = step
+        return step
+
+    @property
+    def pool_size(self) -> int:
+        return self._pool.size
+
+    def breaker_stats(self) -> dict:
+        """
+        Returns the circuit breaker state and counters.
+        :return:
+        """
+        return self._breaker.stats()
+
+    def pool_stats(self) -> dict:
+        """
+        Returns connection pool statistics.
+        :return:
+        """
+        return self._pool.stats()
+
+    def close(self):
+        """
+        Closes the idle pooled connections.
+        :return:
+        """
+        self._pool.close_all()
+        if self._replica_pool is not None:
+            self._replica_pool.close_all()
+
+    def _create_pool(self, settings: dict) -> ConnectionPool:
+        """
+        Creates the connection pool of one database server.
+        :param settings: connection settings of the server
+        :return:
+        """
+        return ConnectionPool(
+            functools.partial(self._open_connection, settings),
+            self._pool_size,
+            self._pool_idle_timeout,
+            self._pool_checkout_timeout,
+            validator=self._validate_connection,
+            validation_interval=self._pool_validation_interval,
+            keepalive_interval=self._pool_keepalive_interval
+        )
+
+    def _create_tracer(self):
+        """
+        Creates the query tracer configured in the [tracing] section.
+        :return:
+        """
+        if not self._tracing_enabled:
+            return None
+        return QueryTracer(self._slow_query_ms, self._slow_query_log)
+
+    @staticmethod
+    def _validate_connection(connection):
+        """
+        Pings the connection and reopens it when the server dropped it.
+        :param connection:
+        :return:
+        """
+        try:
+            connection.ping()
+        except mysql.connector.Error:
+            DatabaseConnector._reconnect(connection)
+
+    @staticmethod
+    def _reconnect(connection):
+        """
+        Reopens a lost connection. Its prepared statements died with the old session.
+        :param connection:
+        :return:
+        """
+        connection.reconnect()
+        connection.statement_cache.clear(deallocate=False)
+
+    def _open_connection(self, settings: dict):
+        """
+        Opens a new connection to the database with its own prepared statement cache.
+        :param settings: connection settings of the server
+        :return:
+        """
+        connection = self._connect_driver(settings)
+        connection.statement_cache = StatementCache(connection, self._statement_cache_size, self._statement_stats)
+        return connection
+
+    def _connect_driver(self, settings: dict):
+        """
+        Uses the C extension when it is enabled and available, otherwise the pure Python implementation.
+        :param settings: connection settings of the server
+        :return:
+        """
+        if settings["backend"] == "sqlite":
+            return SQLiteConnection(settings["path"])
+
+        arguments = {key: value for key, value in settings.items() if key != "backend"}
+        if self._use_c_extension and mysql.connector.HAVE_CEXT:
+            try:
+                return mysql.connector.connect(**arguments, use_pure=False)
+            except ImportError:
+                self._use_c_extension = False
+
+        return mysql.connector.connect(**arguments, use_pure=True)
+
+    @staticmethod
+    def _resolve_data_path(path: str) -> str:
+        """
+        Resolves a relative data file path against the folder that contains configuration_files.
+        :param path:
+        :return:
+        """
+        if path == ":memory:" or Path(path).is_absolute():
+            return path
+        return str(DatabaseConnector.get_configuration_files_folder_path().parent / path)
+
+    @staticmethod
+    def get_configuration_files_folder_path():
+        """
+        Creates path to the configuration folder.
+        :return:
+        """
+        if getattr(sys, 'frozen', False):
+            base_path = Path(sys.executable).parent
+        else:
+            base_path = Path(__file__).resolve().parent.parent.parent
+
+        config_dir = base_path / "configuration_files"
+
+        if config_dir.exists():
+            return config_dir
+
+        alt_config_dir = base_path / "dist" / "configuration_files"
+        if alt_config_dir.exists():
+            return alt_config_dir
+
+        raise RuntimeError(f"Configuration folder not found at: {config_dir}")
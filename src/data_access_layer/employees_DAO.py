@@ -1,78 +1,142 @@
-import mysql.connector
-
-from src.data_access_layer.database_connector import DatabaseConnector
-from src.objects.employee import Employee
-
-
-class EmployeesDAO:
-    def __init__(self):
-        self.db = DatabaseConnector()
-
-    def add(self, employee: Employee | list[Employee]):
-        sql = "INSERT INTO employees (first_name, last_name) VALUES (%(first_name)s, %(last_name)s)"
-
-        employees_to_add = employee if isinstance(employee, list) else [employee]
-
-        conn = None
-        try:
-            conn = self.db.connect()
-            with conn.cursor() as cursor:
-                for emp in employees_to_add:
-                    cursor.execute(sql, {
-                        "first_name": emp.first_name,
-                        "last_name": emp.last_name
-                    })
-                    emp.id = cursor.lastrowid
-                conn.commit()
-        except mysql.connector.Error as e:
-            if conn:
-                conn.rollback()
-            raise RuntimeError(f"Failed to add employee(s): {e}")
-
-    def load(self):
-        sql = "SELECT id, first_name, last_name FROM employees"
-        employees = []
-        try:
-            conn = self.db.connect()
-            with conn.cursor() as cursor:
-                cursor.execute(sql)
-                for row in cursor:
-                    employees.append(Employee.from_db(row[0], row[1], row[2]))
-            return employees
-        except mysql.connector.Error as e:
-            raise RuntimeError(f"Failed to fetch employees: {e}")
-
-    def delete(self, employee_id: int):
-        sql = "DELETE FROM employees WHERE id = %(employee_id)s"
-
-        try:
-            conn = self.db.connect()
-            with conn.cursor() as cursor:
-                cursor.execute(sql, {"employee_id": employee_id})
-                conn.commit()
-        except mysql.connector.Error as e:
-            raise RuntimeError(f"Failed to remove employee: {e}")
-
-    def update(self, employee: Employee):
-        if not isinstance(employee, Employee):
-            raise TypeError("Employee must be of type Employee")
-
-        sql = "UPDATE employees SET first_name = %(first_name)s, last_name = %(last_name)s WHERE id = %(id)s"
-
-        conn = None
-        try:
-            conn = self.db.connect()
-            with conn.cursor() as cursor:
-                cursor.execute(
-                    sql,
-                    {
-                        "first_name": employee.first_name,
-                        "last_name": employee.last_name,
-                        "id": employee.id
-                    }
-                )
-                conn.commit()
-        except mysql.connector.Error as e:
-            if conn:
-                conn.rollback()
-            raise RuntimeError(f"Failed to update employee: {e}")
\ No newline at end of file
+import mysql.connector
+
+from src.data_access_layer.database_connector import DatabaseConnector
+from src.objects.employee import Employee
+
+
+class EmployeesDAO:
+    def __init__(self):
+        self.db = DatabaseConnector()
+
+    def add(self, employee: Employee | list[Employee], chunk_size: int = None):
+        """
+        Adds employees to the database in one transaction.
+        Lists are sent as multi-row INSERTs of up to chunk_size rows; MySQL assigns the ids of one such
+        statement as a consecutive range starting at lastrowid, so they are set without reading them back.
+        :param employee: one employee or a list of employees
+        :param chunk_size: rows per INSERT, 1 sends one INSERT per employee, None uses the configured size
+        :return:
+        """
+        if chunk_size is None:
+            chunk_size = self.db.bulk_insert_chunk_size
+        if not isinstance(chunk_size, int) or chunk_size <= 0:
+            raise ValueError("chunk_size must be a positive integer")
+
+        employees_to_add = employee if isinstance(employee, list) else [employee]
+
+        conn = None
+        try:
+            conn = self.db.connect()
+            step = self.db.auto_increment_step(conn) if chunk_size > 1 else 1
+            for start in range(0, len(employees_to_add), chunk_size):
+                chunk = employees_to_add[start:start + chunk_size]
+                sql = "INSERT INTO employees (first_name, last_name) VALUES " + ", ".join(["(%s, %s)"] * len(chunk))
+                params = []
+                for emp in chunk:
+                    params.extend((emp.first_name, emp.last_name))
+
+                result = self.db.execute(conn, sql, params, prepared=len(chunk) in (1, chunk_size))
+                for offset, emp in enumerate(chunk):
+                    emp.id = result.lastrowid + offset * step
+            conn.commit()
+        except mysql.connector.Error as e:
+            if conn:
+                conn.rollback()
+            raise RuntimeError(f"Failed to add employee(s): {e}")
+        finally:
+            self.db.release()
+
+    def get_version(self) -> int:
+        """
+        Reads the change counter of the employees, which the employees triggers increase with every insert, update and delete.
+        :return:
+        """
+        sql = "SELECT version FROM change_counters WHERE name = 'employees'"
+
+        try:
+            conn = self.db.connect()
+            row = self.db.execute(conn, sql).fetchone()
+            return int(row[0]) if row else 0
+        except mysql.connector.Error as e:
+            raise RuntimeError(f"Failed to fetch employees version: {e}")
+        finally:
+            self.db.release()
+
+    @staticmethod
+    def _employee_from_row(row) -> Employee:
+        return Employee.from_db(row[0], row[1], row[2])
+
+    def load(self):
+        sql = "SELECT id, first_name, last_name FROM employees"
+        employees = []
+        try:
+            conn = self.db.connect()
+            for row in self.db.execute(conn, sql):
+                employees.append(self.db.identity_map.materialize(Employee, row[0], row, self._employee_from_row))
+            return employees
+        except mysql.connector.Error as e:
+            raise RuntimeError(f"Failed to fetch employees: {e}")
+        finally:
+            self.db.release()
+
+    def delete(self, employee_id: int) -> int:
+        """
+        Deletes the employee, whose orders keep the copied name with employee_id set to NULL.
+        MySQL does not fire triggers for changes made by foreign key actions,
+        so the open orders of the employee are written to the order change log here.
+        :param employee_id:
+        :return: number of deleted rows, 0 when the employee no longer exists
+        """
+        sql_log = """
+              INSERT INTO order_changes (order_id, is_open)
+              SELECT id, 1 FROM orders WHERE employee_id = %(employee_id)s AND is_paid = 0
+              """
+        sql = "DELETE FROM employees WHERE id = %(employee_id)s"
+
+        conn = None
+        try:
+            conn = self.db.connect()
+            self.db.execute(conn, sql_log, {"employee_id": employee_id})
+            result = self.db.execute(conn, sql, {"employee_id": employee_id})
+            conn.commit()
+            self.db.identity_map.invalidate(Employee, employee_id)
+            return result.rowcount
+        except mysql.connector.Error as e:
+            if conn:
+                conn.rollback()
+            raise RuntimeError(f"Failed to remove employee: {e}")
+        finally:
+            self.db.release()
+
+    def update(self, employee: Employee) -> int:
+        """
+        Updates the name of the employee in the database.
+        :param employee:
+        :return: number of updated rows, 0 when the employee no longer exists or nothing changed
+        """
+        if not isinstance(employee, Employee):
+            raise TypeError("Employee must be of type Employee")
+
+        sql = "UPDATE employees SET first_name = %(first_name)s, last_name = %(last_name)s WHERE id = %(id)s"
+
+        conn = None
+        try:
+            conn = self.db.connect()
+            result = self.db.execute(
+                conn,
+                sql,
+                {
+                    "first_name": employee.first_name,
+                    "last_name": employee.last_name,
+                    "id": employee.id
+                }
+            )
+            conn.commit()
+            self.db.identity_map.invalidate(Employee, employee.id)
+            return result.rowcount
+        except mysql.connector.Error as e:
+            if conn:
+                conn.rollback()
+            raise RuntimeError(f"Failed to update employee: {e}")
+        finally:
+            self.db.release()
\ No newline at end of file
@@ -0,0 +1,91 @@
+import threading
+import weakref
+
+
+class IdentityMap:
+    def __init__(self):
+        """
+        Keeps one object per database row, keyed by (type, id), for as long as the application references it.
+        Objects are held by weak references, so rows no longer used by any manager or tab are dropped
+        without an explicit size limit. Every object remembers the row it was built from and is returned
+        again only while the row is unchanged and the object has no unsaved changes.
+        """
+        self._lock = threading.Lock()
+        self._objects = weakref.WeakValueDictionary()
+        self._rows = weakref.WeakKeyDictionary()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def __len__(self):
+        return len(self._objects)
+
+    def get(self, cls: type, object_id):
+        """
+        Returns the object of the row if it is still referenced somewhere.
+        :param cls:
+        :param object_id:
+        :return: the object, None when it is not in the map
+        """
+        with self._lock:
+            return self._objects.get((cls, object_id))
+
+    def materialize(self, cls: type, object_id, row, factory):
+        """
+        Returns the object of the row, creating it only when the map has none or the row changed since.
+        :param cls: type of the created object
+        :param object_id: primary key of the row
+        :param row: selected columns, compared with the row the mapped object was built from
+        :param factory: creates the object from the row
+        :return:
+        """
+        row = tuple(row)
+        key = (cls, object_id)
+        with self._lock:
+            obj = self._objects.get(key)
+            if obj is not None and self._rows.get(obj) == row and not getattr(obj, "is_dirty", False):
+                self.hits += 1
+                return obj
+            self.misses += 1
+
+        obj = factory(row)
+        with self._lock:
+            self._objects[key] = obj
+            self._rows[obj] = row
+        return obj
+
+    def invalidate(self, cls: type, *object_ids):
+        """
+        Forgets the objects of rows that were written, so the next read builds them again.
+        :param cls:
+        :param object_ids:
+        :return:
+        """
+        with self._lock:
+            for object_id in object_ids:
+                if self._objects.pop((cls, object_id), None) is not None:
+                    self.invalidations += 1
+
+    def clear(self):
+        """
+        Forgets every object.
+        :return:
+        """
+        with self._lock:
+            self._objects.clear()
+            self._rows.clear()
+
+    def stats(self) -> dict:
+        """
+        Returns the number of mapped objects and the hit/miss counters of materialize().
+        :return:
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._objects),
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
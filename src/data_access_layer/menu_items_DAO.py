@@ -1,120 +1,204 @@
-import mysql.connector
-
-from src.data_access_layer.database_connector import DatabaseConnector
-from src.objects.menu_item import MenuItem
-
-
-class MenuItemsDAO:
-    def __init__(self):
-        self.db = DatabaseConnector()
-
-    def load(self):
-        """
-        Loads menu items from the database
-        :return:
-        """
-        sql = "SELECT id, name, item_type, price, vat_percentage, vat FROM menu_items order by item_type, name"
-
-        items = []
-
-        try:
-            conn = self.db.connect()
-            with conn.cursor() as cursor:
-                cursor.execute(sql)
-                for row in cursor:
-                    items.append(MenuItem.from_db(row[0], row[1], row[2], float(row[3]), row[4], float(row[5])))
-            return items
-        except mysql.connector.Error as e:
-            raise RuntimeError(f"Failed to fetch menu items: {e}")
-
-    def add(self, menu_item: MenuItem | list[MenuItem]):
-        sql_insert = "INSERT INTO menu_items (name, item_type, price, vat_percentage) VALUES (%(name)s, %(item_type)s, %(price)s, %(vat_percentage)s)"
-        sql_select = "SELECT vat FROM menu_items WHERE id = %(id)s"
-
-        items_to_add = menu_item if isinstance(menu_item, list) else [menu_item]
-        conn = None
-
-        try:
-            conn = self.db.connect()
-
-            with conn.cursor() as cursor:
-                for item in items_to_add:
-                    cursor.execute(sql_insert, {
-                        "name": item.name,
-                        "item_type": item.item_type,
-                        "price": item.price,
-                        "vat_percentage": item.vat_percentage
-                    })
-
-                    new_id = cursor.lastrowid
-                    item.id = new_id
-
-                    cursor.execute(sql_select, {"id": new_id})
-                    row = cursor.fetchone()
-                    if row:
-                        item.vat = float(row[0])
-
-            conn.commit()
-        except mysql.connector.Error as e:
-            if conn:
-                conn.rollback()
-            raise RuntimeError(f"Failed to add menu item(s): {e}")
-
-    def delete(self, menu_item_id: int):
-        """
-        Deletes menu_item with the matching id from the database.
-        :param menu_item_id:
-        :return:
-        """
-        if not isinstance(menu_item_id, int):
-            raise TypeError("Menu item id must be an integer")
-
-        sql = "DELETE FROM menu_items WHERE id = %(id)s"
-
-        conn = None
-
-        try:
-            conn = self.db.connect()
-            with conn.cursor() as cursor:
-                cursor.execute(sql, {"id": menu_item_id})
-                conn.commit()
-        except mysql.connector.Error as e:
-            if conn:
-                conn.rollback()
-            raise RuntimeError(f"Failed to delete item {menu_item_id}: {e}")
-
-    def update(self, menu_item: MenuItem):
-        """
-        Updates menu item in the database.
-        :param menu_item:
-        :return:
-        """
-        update_sql = "UPDATE menu_items SET name = %(name)s, item_type = %(item_type)s, price = %(price)s, vat_percentage = %(vat_percentage)s WHERE id = %(id)s"
-        select_vat_sql = "SELECT vat FROM menu_items WHERE id = %(id)s"
-
-        conn = None
-        try:
-            conn = self.db.connect()
-            with conn.cursor() as cursor:
-                cursor.execute(
-                    update_sql,
-                    {
-                        "id": menu_item.id,
-                        "name": menu_item.name,
-                        "item_type": menu_item.item_type,
-                        "price": menu_item.price,
-                        "vat_percentage": menu_item.vat_percentage
-                    }
-                )
-
-                cursor.execute(select_vat_sql, {"id": menu_item.id})
-                row = cursor.fetchone()
-
-                if row:
-                    menu_item.vat = float(row[0])
-
-                conn.commit()
-        except mysql.connector.Error as e:
-            if conn:
-                conn.rollback()
-            raise RuntimeError(f"Failed to update menu item: {e}")
\ No newline at end of file
+import mysql.connector
+
+from src.data_access_layer.database_connector import DatabaseConnector
+from src.objects.menu_item import MenuItem
+
+
+class MenuItemsDAO:
+    def __init__(self):
+        self.db = DatabaseConnector()
+
+    def load(self):
+        """
+        Loads menu items from the database
+        :return:
+        """
+        sql = "SELECT id, name, item_type, price, vat_percentage, vat FROM menu_items order by item_type, name"
+
+        items = []
+
+        try:
+            conn = self.db.connect()
+            for row in self.db.execute(conn, sql):
+                items.append(self.db.identity_map.materialize(MenuItem, row[0], row, self._menu_item_from_row))
+            return items
+        except mysql.connector.Error as e:
+            raise RuntimeError(f"Failed to fetch menu items: {e}")
+        finally:
+            self.db.release()
+
+    def get_version(self) -> int:
+        """
+        Reads the change counter of the menu, which the menu_items triggers increase with every insert, update and delete.
+        :return:
+        """
+        sql = "SELECT version FROM change_counters WHERE name = 'menu_items'"
+
+        try:
+            conn = self.db.connect()
+            row = self.db.execute(conn, sql).fetchone()
+            return int(row[0]) if row else 0
+        except mysql.connector.Error as e:
+            raise RuntimeError(f"Failed to fetch menu version: {e}")
+        finally:
+            self.db.release()
+
+    @staticmethod
+    def _menu_item_from_row(row) -> MenuItem:
+        return MenuItem.from_db(row[0], row[1], row[2], float(row[3]), row[4], float(row[5]))
+
+    def add(self, menu_item: MenuItem | list[MenuItem], chunk_size: int = None, verify_vat: bool = False):
+        """
+        Adds menu items to the database in one transaction, using multi-row INSERTs of up to chunk_size rows.
+        The VAT is set with MenuItem.calculate_vat, which matches the menu_items_calc_vat_ins trigger,
+        so nothing is read back per row.
+        :param menu_item: one menu item or a list of menu items
+        :param chunk_size: rows per INSERT, None uses the configured size
+        :param verify_vat: compare the VAT stored by the trigger with the computed one in a single query
+                           and roll back if they differ
+        :return:
+        """
+        if chunk_size is None:
+            chunk_size = self.db.bulk_insert_chunk_size
+        if not isinstance(chunk_size, int) or chunk_size <= 0:
+            raise ValueError("chunk_size must be a positive integer")
+
+        items_to_add = menu_item if isinstance(menu_item, list) else [menu_item]
+        conn = None
+
+        try:
+            conn = self.db.connect()
+            step = self.db.auto_increment_step(conn) if chunk_size > 1 else 1
+
+            for start in range(0, len(items_to_add), chunk_size):
+                chunk = items_to_add[start:start + chunk_size]
+                sql = (
+                    "INSERT INTO menu_items (name, item_type, price, vat_percentage) VALUES "
+                    + ", ".join(["(%s, %s, %s, %s)"] * len(chunk))
+                )
+                params = []
+                for item in chunk:
+                    params.extend((item.name, item.item_type, item.price, item.vat_percentage))
+
+                result = self.db.execute(conn, sql, params, prepared=len(chunk) in (1, chunk_size))
+                for offset, item in enumerate(chunk):
+                    item.id = result.lastrowid + offset * step
+                    item.vat = MenuItem.calculate_vat(item.price, item.vat_percentage)
+
+            if verify_vat and items_to_add:
+                mismatches = self._find_vat_mismatches(conn, items_to_add)
+                if mismatches:
+                    raise ValueError(f"VAT stored by the database differs for menu items {mismatches}")
+
+            conn.commit()
+        except (mysql.connector.Error, ValueError) as e:
+            if conn:
+                conn.rollback()
+            raise RuntimeError(f"Failed to add menu item(s): {e}")
+        finally:
+            self.db.release()
+
+    def find_vat_mismatches(self) -> list[int]:
+        """
+        Checks every stored VAT against MenuItem.calculate_vat.
+        :return: ids of the menu items whose VAT differs
+        """
+        try:
+            conn = self.db.connect()
+            return self._find_vat_mismatches(conn)
+        except mysql.connector.Error as e:
+            raise RuntimeError(f"Failed to check menu item VAT: {e}")
+        finally:
+            self.db.release()
+
+    def _find_vat_mismatches(self, conn, menu_items: list[MenuItem] = None) -> list[int]:
+        """
+        Reads the VAT of the given menu items, or of all of them, in one query and compares it with the computed value.
+        :param conn:
+        :param menu_items: items with ids assigned, None checks the whole table
+        :return: ids of the menu items whose VAT differs
+        """
+        sql = "SELECT id, price, vat_percentage, vat FROM menu_items"
+        params = None
+        ids = None
+        if menu_items is not None:
+            ids = {item.id for item in menu_items}
+            sql += " WHERE id BETWEEN %s AND %s"
+            params = (min(ids), max(ids))
+
+        mismatches = []
+        for row in self.db.execute(conn, sql, params):
+            if ids is not None and row[0] not in ids:
+                continue
+            if row[3] is None or float(row[3]) != MenuItem.calculate_vat(float(row[1]), row[2]):
+                mismatches.append(row[0])
+        return mismatches
+
+    def delete(self, menu_item_id: int) -> int:
+        """
+        Deletes menu_item with the matching id from the database.
+        Order items keep their copied name and price with menu_item_id set to NULL. MySQL does not fire triggers
+        for changes made by foreign key actions, so the open orders containing the item are written to the order change log here.
+        :param menu_item_id:
+        :return: number of deleted rows, 0 when the menu item no longer exists
+        """
+        if not isinstance(menu_item_id, int):
+            raise TypeError("Menu item id must be an integer")
+
+        sql_log = """
+              INSERT INTO order_changes (order_id, is_open)
+              SELECT DISTINCT o.id, 1
+              FROM order_items oi
+              JOIN orders o ON o.id = oi.order_id
+              WHERE oi.menu_item_id = %(id)s AND o.is_paid = 0
+              """
+        sql = "DELETE FROM menu_items WHERE id = %(id)s"
+
+        conn = None
+
+        try:
+            conn = self.db.connect()
+            self.db.execute(conn, sql_log, {"id": menu_item_id})
+            result = self.db.execute(conn, sql, {"id": menu_item_id})
+            conn.commit()
+            self.db.identity_map.invalidate(MenuItem, menu_item_id)
+            return result.rowcount
+        except mysql.connector.Error as e:
+            if conn:
+                conn.rollback()
+            raise RuntimeError(f"Failed to delete item {menu_item_id}: {e}")
+        finally:
+            self.db.release()
+
+    def update(self, menu_item: MenuItem) -> int:
+        """
+        Updates menu item in the database.
+        :param menu_item:
+        :return: number of updated rows, 0 when the menu item no longer exists or nothing changed
+        """
+        update_sql = "UPDATE menu_items SET name = %(name)s, item_type = %(item_type)s, price = %(price)s, vat_percentage = %(vat_percentage)s WHERE id = %(id)s"
+
+        conn = None
+        try:
+            conn = self.db.connect()
+            result = self.db.execute(
+                conn,
+                update_sql,
+                {
+                    "id": menu_item.id,
+                    "name": menu_item.name,
+                    "item_type": menu_item.item_type,
+                    "price": menu_item.price,
+                    "vat_percentage": menu_item.vat_percentage
+                }
+            )
+            conn.commit()
+            menu_item.vat = MenuItem.calculate_vat(menu_item.price, menu_item.vat_percentage)
+            self.db.identity_map.invalidate(MenuItem, menu_item.id)
+            return result.rowcount
+        except mysql.connector.Error as e:
+            if conn:
+                conn.rollback()
+            raise RuntimeError(f"Failed to update menu item: {e}")
+        finally:
+            self.db.release()
\ No newline at end of file
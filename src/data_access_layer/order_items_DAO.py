@@ -1,138 +1,224 @@
-from typing import List
-import mysql.connector
-from src.data_access_layer.database_connector import DatabaseConnector
-from src.objects.order_item import OrderItem
-from src.objects.menu_item import MenuItem
-
-
-class OrderItemsDAO:
-    def __init__(self):
-        self.db = DatabaseConnector()
-
-    def create(self, order_item: OrderItem | List[OrderItem]):
-        """
-        Adds order_item to the database.
-        :param order_item:
-        :return:
-        """
-        sql = "INSERT INTO order_items (order_id, menu_item_id, quantity) VALUES (%(order_id)s, %(menu_item_id)s, %(quantity)s)"
-
-        conn = None
-
-        try:
-            conn = self.db.connect()
-            order_items_to_add = order_item if isinstance(order_item, list) else [order_item]
-            with conn.cursor() as cursor:
-                for item in order_items_to_add:
-                    cursor.execute(
-                        sql,
-                        {
-                            "order_id": item.order_id,
-                            "menu_item_id": item.menu_item.id,
-                            "quantity": item.quantity
-                        }
-                    )
-                    item.id = cursor.lastrowid
-            conn.commit()
-        except mysql.connector.Error as e:
-            if conn:
-                conn.rollback()
-            raise RuntimeError(f"Failed to add order_item(s): {e}")
-
-    def delete(self, order_item_id: int):
-        """
-        Deletes the order_item from the database.
-        :param order_item_id:
-        :return:
-        """
-        if not isinstance(order_item_id, int):
-            raise TypeError("order_item_id must be int")
-        conn = None
-        sql = "DELETE FROM order_items WHERE id = %(id)s"
-        try:
-            conn = self.db.connect()
-            with conn.cursor() as cursor:
-                cursor.execute(sql, {"id": order_item_id})
-                conn.commit()
-        except mysql.connector.Error as e:
-            if conn:
-                conn.rollback()
-            raise RuntimeError(f"Failed to remove item: {e}") from e
-
-    def update(self, order_item: OrderItem):
-        """
-        Updates the order_item in the database.
-        :param order_item:
-        :return:
-        """
-        if not isinstance(order_item, OrderItem):
-            raise TypeError("order_item must be OrderItem")
-        sql = "UPDATE order_items SET order_id = %(order_id)s, menu_item_id = %(menu_item_id)s, quantity = %(quantity)s WHERE id = %(id)s"
-        conn = None
-        try:
-            conn = self.db.connect()
-            with conn.cursor() as cursor:
-                cursor.execute(
-                    sql,
-                    {
-                        "id": order_item.id,
-                        "order_id": order_item.order_id,
-                        "menu_item_id": order_item.menu_item.id,
-                        "quantity": order_item.quantity
-                    }
-                )
-                conn.commit()
-        except mysql.connector.Error as e:
-            if conn:
-                conn.rollback()
-            raise RuntimeError(f"Failed to update item: {e}") from e
-
-    def get_items_by_order_id(self, order_id: int) -> List[OrderItem]:
-        """
-        Fetches order_items with the matching order_id from the database.
-        :param order_id:
-        :return:
-        """
-        sql = """
-              SELECT id,
-                     order_id,
-                     quantity,
-                     total_price,
-                     total_vat,
-                     menu_item_id,
-                     item_name,
-                     item_type,
-                     item_price,
-                     vat_percentage,
-                     item_vat
-              FROM order_items
-              WHERE order_id = %s \
-              """
-        items = []
-        try:
-            conn = self.db.connect()
-            with conn.cursor() as cursor:
-                cursor.execute(sql, (order_id,))
-                for row in cursor:
-
-                    menu_item = MenuItem.from_db(
-                        menu_item_id=row[5],
-                        name=row[6],
-                        item_type=row[7],
-                        price=float(row[8]),
-                        vat_percentage=int(row[9]),
-                        vat=float(row[10])
-                    )
-
-                    order_item = OrderItem.from_db(
-                        id=row[0],
-                        order_id=row[1],
-                        menu_item=menu_item,
-                        quantity=row[2],
-                        total_price=float(row[3]),
-                        total_vat=float(row[4])
-                    )
-                    items.append(order_item)
-            return items
-        except mysql.connector.Error as e:
-            raise RuntimeError(f"Failed to fetch order items: {e}")
\ No newline at end of file
+from typing import List
+import mysql.connector
+from src.data_access_layer.concurrency import ConcurrencyConflictError
+from src.data_access_layer.database_connector import DatabaseConnector
+from src.objects.order_item import OrderItem
+from src.objects.menu_item import MenuItem
+
+
+class OrderItemsDAO:
+    def __init__(self):
+        self.db = DatabaseConnector()
+
+    def create(self, order_item: OrderItem | List[OrderItem]):
+        """
+        Adds order_item to the database.
+        :param order_item:
+        :return:
+        """
+        sql = "INSERT INTO order_items (order_id, menu_item_id, quantity) VALUES (%(order_id)s, %(menu_item_id)s, %(quantity)s)"
+
+        conn = None
+
+        try:
+            conn = self.db.connect()
+            order_items_to_add = order_item if isinstance(order_item, list) else [order_item]
+            for item in order_items_to_add:
+                result = self.db.execute(
+                    conn,
+                    sql,
+                    {
+                        "order_id": item.order_id,
+                        "menu_item_id": item.menu_item.id,
+                        "quantity": item.quantity
+                    }
+                )
+                item.id = result.lastrowid
+            conn.commit()
+            for item in order_items_to_add:
+                item.version = 1
+                item.mark_clean()
+        except mysql.connector.Error as e:
+            if conn:
+                conn.rollback()
+            raise RuntimeError(f"Failed to add order_item(s): {e}")
+        finally:
+            self.db.release()
+
+    def delete(self, order_item_id: int):
+        """
+        Deletes the order_item from the database.
+        :param order_item_id:
+        :return:
+        """
+        if not isinstance(order_item_id, int):
+            raise TypeError("order_item_id must be int")
+        conn = None
+        sql = "DELETE FROM order_items WHERE id = %(id)s"
+        try:
+            conn = self.db.connect()
+            self.db.execute(conn, sql, {"id": order_item_id})
+            conn.commit()
+            self.db.identity_map.invalidate(OrderItem, order_item_id)
+        except mysql.connector.Error as e:
+            if conn:
+                conn.rollback()
+            raise RuntimeError(f"Failed to remove item: {e}") from e
+        finally:
+            self.db.release()
+
+    def update(self, order_item: OrderItem):
+        """
+        Updates the order_item in the database if it still has the version it was loaded with.
+        :param order_item:
+        :return:
+        """
+        if not isinstance(order_item, OrderItem):
+            raise TypeError("order_item must be OrderItem")
+        sql = """
+              UPDATE order_items
+                  SET order_id = %(order_id)s, menu_item_id = %(menu_item_id)s, quantity = %(quantity)s, version = version + 1
+              WHERE id = %(id)s AND version = COALESCE(%(version)s, version)
+              """
+        conn = None
+        try:
+            conn = self.db.connect()
+            result = self.db.execute(
+                conn,
+                sql,
+                {
+                    "id": order_item.id,
+                    "order_id": order_item.order_id,
+                    "menu_item_id": order_item.menu_item.id,
+                    "quantity": order_item.quantity,
+                    "version": order_item.version
+                }
+            )
+            if result.rowcount == 0:
+                current = self.get_items_by_ids(conn, [order_item.id]).get(order_item.id)
+                conn.rollback()
+                raise ConcurrencyConflictError(f"Order item {order_item.id} was changed or deleted by someone else",
+                                               order_item.id, current)
+            conn.commit()
+            if order_item.version is not None:
+                order_item.version += 1
+            order_item.mark_clean()
+            self.db.identity_map.invalidate(OrderItem, order_item.id)
+        except mysql.connector.Error as e:
+            if conn:
+                conn.rollback()
+            raise RuntimeError(f"Failed to update item: {e}") from e
+        finally:
+            self.db.release()
+
+    def get_items_by_order_id(self, order_id: int) -> List[OrderItem]:
+        """
+        Fetches order_items with the matching order_id from the database.
+        :param order_id:
+        :return:
+        """
+        sql = """
+              SELECT id,
+                     order_id,
+                     quantity,
+                     total_price,
+                     total_vat,
+                     menu_item_id,
+                     item_name,
+                     item_type,
+                     item_price,
+                     vat_percentage,
+                     item_vat,
+                     version
+              FROM order_items
+              WHERE order_id = %s \
+              """
+        try:
+            conn = self.db.connect()
+            return [self.order_item_from_row(row) for row in self.db.execute(conn, sql, (order_id,))]
+        except mysql.connector.Error as e:
+            raise RuntimeError(f"Failed to fetch order items: {e}")
+        finally:
+            self.db.release()
+
+    def get_items_by_order_ids(self, order_ids: List[int]) -> dict[int, List[OrderItem]]:
+        """
+        Fetches the order_items of many orders with one query.
+        :param order_ids:
+        :return: dict of order id -> order_items, with an empty list for orders without order_items
+        """
+        order_ids = list(dict.fromkeys(order_ids))
+        items = {order_id: [] for order_id in order_ids}
+        if not order_ids:
+            return items
+
+        sql = f"""
+              SELECT id,
+                     order_id,
+                     quantity,
+                     total_price,
+                     total_vat,
+                     menu_item_id,
+                     item_name,
+                     item_type,
+                     item_price,
+                     vat_percentage,
+                     item_vat,
+                     version
+              FROM order_items
+              WHERE order_id IN ({','.join(['%s'] * len(order_ids))})
+              """
+        try:
+            conn = self.db.connect()
+            for row in self.db.execute(conn, sql, order_ids, prepared=False):
+                items[row[1]].append(self.order_item_from_row(row))
+            return items
+        except mysql.connector.Error as e:
+            raise RuntimeError(f"Failed to fetch order items: {e}")
+        finally:
+            self.db.release()
+
+    def get_items_by_ids(self, conn, order_item_ids: List[int]) -> dict[int, OrderItem]:
+        """
+        Reads order_items by id on an open connection, used to get the current rows after a failed conditional write.
+        :param conn:
+        :param order_item_ids:
+        :return: dict of order item id -> order_item, deleted ones are left out
+        """
+        sql = f"""
+              SELECT id, order_id, quantity, total_price, total_vat, menu_item_id,
+                     item_name, item_type, item_price, vat_percentage, item_vat, version
+              FROM order_items
+              WHERE id IN ({','.join(['%s'] * len(order_item_ids))})
+              """
+        return {row[0]: self.order_item_from_row(row) for row in self.db.execute(conn, sql, list(order_item_ids), prepared=False)}
+
+    def order_item_from_row(self, row) -> OrderItem:
+        """
+        Returns the order_item of a row with the columns selected by get_items_by_order_id through the identity map.
+        The menu item is a snapshot stored with the order_item, so it is not shared with the menu.
+        :param row:
+        :return:
+        """
+        return self.db.identity_map.materialize(OrderItem, row[0], row, self._order_item_from_row)
+
+    @staticmethod
+    def _order_item_from_row(row) -> OrderItem:
+        menu_item = MenuItem.from_db(
+            menu_item_id=row[5],
+            name=row[6],
+            item_type=row[7],
+            price=float(row[8]),
+            vat_percentage=int(row[9]),
+            vat=float(row[10])
+        )
+
+        return OrderItem.from_db(
+            id=row[0],
+            order_id=row[1],
+            menu_item=menu_item,
+            quantity=row[2],
+            total_price=float(row[3]),
+            total_vat=float(row[4]),
+            version=row[11]
+        )
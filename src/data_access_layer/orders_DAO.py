@@ -1,206 +1,463 @@
-import mysql.connector
-from src.data_access_layer.database_connector import DatabaseConnector
-from src.data_access_layer.order_items_DAO import OrderItemsDAO
-from src.objects.order import Order
-
-
-class OrdersDAO:
-    def __init__(self):
-        self.db = DatabaseConnector()
-        self._order_items_DAO = OrderItemsDAO
-
-    def set_paid(self, order_id: int, is_paid: bool):
-        """
-        Sets is_paid in the database.
-        :param order_id:
-        :param is_paid:
-        :return:
-        """
-        if not isinstance(order_id, int):
-            raise TypeError("Order id must be an instance of int")
-        if not isinstance(is_paid, bool):
-            raise TypeError("is_paid must be bool")
-
-        sql = "UPDATE orders SET is_paid = %(is_paid)s WHERE id = %(id)s"
-
-        conn = None
-        try:
-            conn = self.db.connect()
-            with conn.cursor() as cursor:
-                cursor.execute(
-                    sql,
-                    {
-                        "is_paid": int(is_paid),
-                        "id": order_id
-                    }
-                )
-                conn.commit()
-        except mysql.connector.Error as e:
-            if conn:
-                conn.rollback()
-            raise RuntimeError(f"Payment update failed: {e}")
-
-    def delete(self, order_id):
-        """
-        Deletes the order with the matching id from the database.
-        :param order_id:
-        :return:
-        """
-        if not isinstance(order_id, int):
-            raise TypeError("Order id must be an instance of int")
-
-        sql = "DELETE FROM orders WHERE id = %(id)s"
-
-        conn = None
-        try:
-            conn = self.db.connect()
-            with conn.cursor() as cursor:
-                cursor.execute(sql, {"id": order_id})
-                conn.commit()
-        except mysql.connector.Error as e:
-            if conn:
-                conn.rollback()
-            raise RuntimeError(f"Order delete failed: {e}")
-
-    def create(self, order: Order):
-        """
-        Adds order into the database.
-        :param order:
-        :return:
-        """
-        if not isinstance(order, Order):
-            raise TypeError("Order must be an instance of Order")
-
-        sql_order = "INSERT INTO orders (employee_id, name, is_paid) VALUES (%(employee_id)s, %(name)s, %(is_paid)s)"
-        sql_item = "INSERT INTO order_items (order_id, menu_item_id, quantity) VALUES (%(order_id)s, %(menu_item_id)s, %(quantity)s)"
-        sql_fetch = "SELECT creation_date, employee_first_name, employee_last_name FROM orders WHERE id = %s"
-
-        conn = None
-
-        try:
-            conn = self.db.connect()
-            cursor = conn.cursor()
-
-            cursor.execute(
-                sql_order,
-                {
-                    "employee_id": order.employee_id,
-                    "name": order.name,
-                    "is_paid": int(order.is_paid),
-                },
-            )
-            order.id = cursor.lastrowid
-
-            for item in order.order_items:
-                cursor.execute(
-                    sql_item,
-                    {
-                        "order_id": order.id,
-                        "menu_item_id": item.menu_item.id,
-                        "quantity": item.quantity
-                    }
-                )
-                item.id = cursor.lastrowid
-                item.order_id = order.id
-
-            cursor.execute(sql_fetch, (order.id,))
-            result = cursor.fetchone()
-            if result:
-                order.creation_date = result[0]
-                order.employee_first_name = result[1]
-                order.employee_last_name = result[2]
-
-            conn.commit()
-            cursor.close()
-
-        except mysql.connector.Error as e:
-            if conn:
-                conn.rollback()
-            raise RuntimeError(f"Order create failed: {e}")
-
-    def update(self, order: Order):
-        """
-        Updates the order in the database.
-        :param order:
-        :return:
-        """
-        if not isinstance(order, Order):
-            raise TypeError("Order must be an instance of Order")
-
-        sql_update_header = """
-                            UPDATE orders o
-                                JOIN employees e 
-                            ON e.id = %(employee_id)s
-                                SET
-                                    o.employee_id = %(employee_id)s, o.name = %(name)s, o.employee_first_name = e.first_name, o.employee_last_name = e.last_name
-                            WHERE o.id = %(id)s
-                            """
-
-        sql_get_current_ids = "SELECT id FROM order_items WHERE order_id = %s"
-
-        sql_update_item = "UPDATE order_items SET quantity = %(quantity)s WHERE id = %(id)s"
-
-        sql_insert_item = "INSERT INTO order_items (order_id, menu_item_id, quantity) VALUES (%(order_id)s, %(menu_item_id)s, %(quantity)s)"
-
-        conn = None
-        try:
-            conn = self.db.connect()
-            cursor = conn.cursor()
-
-            cursor.execute(sql_update_header, {
-                "employee_id": order.employee_id,
-                "name": order.name,
-                "id": order.id
-            })
-
-            cursor.execute(sql_get_current_ids, (order.id,))
-            current_db_ids = {row[0] for row in cursor.fetchall()}
-
-            passed_ids = set()
-
-            for item in order.order_items:
-                if item.id and item.id in current_db_ids:
-                    passed_ids.add(item.id)
-                    cursor.execute(sql_update_item, {
-                        "quantity": item.quantity,
-                        "id": item.id
-                    })
-                else:
-                    cursor.execute(sql_insert_item, {
-                        "order_id": order.id,
-                        "menu_item_id": item.menu_item.id,
-                        "quantity": item.quantity
-                    })
-                    item.id = cursor.lastrowid
-                    item.order_id = order.id
-
-            ids_to_delete = current_db_ids - passed_ids
-            if ids_to_delete:
-                format_strings = ','.join(['%s'] * len(ids_to_delete))
-                sql_delete = f"DELETE FROM order_items WHERE id IN ({format_strings})"
-                cursor.execute(sql_delete, list(ids_to_delete))
-
-            conn.commit()
-            cursor.close()
-        except mysql.connector.Error as e:
-            if conn:
-                conn.rollback()
-            raise RuntimeError(f"Order update failed: {e}")
-
-    def get_unpaid_orders(self):
-        """
-        Fetches all unpaid orders from the database.
-        :return:
-        """
-        sql = "SELECT * FROM view_paid_orders"
-
-        try:
-            orders = []
-            conn = self.db.connect()
-            with conn.cursor() as cursor:
-                cursor.execute(sql)
-                for row in cursor:
-                    orders.append(Order.from_db(row[0], row[1], row[2], row[3], row[4], row[5], row[6], float(row[7]), float(row[8])))
-            return orders
-        except mysql.connector.Error as e:
-            raise RuntimeError(f"Order get unpaid orders failed: {e}")
\ No newline at end of file
+from datetime import datetime, timedelta
+import mysql.connector
+from src.data_access_layer.concurrency import ConcurrencyConflictError
+from src.data_access_layer.database_connector import DatabaseConnector
+from src.data_access_layer.order_items_DAO import OrderItemsDAO
+from src.objects.order import Order
+from src.objects.order_item import OrderItem
+from src.objects.order_change import OrderChange
+
+
+class OrdersDAO:
+    CHANGE_SETTLE_SECONDS = 10
+
+    def __init__(self):
+        self.db = DatabaseConnector()
+        self._order_items_DAO = OrderItemsDAO()
+
+    def set_paid(self, order_id: int, is_paid: bool):
+        """
+        Sets is_paid in the database.
+        :param order_id:
+        :param is_paid:
+        :return:
+        """
+        if not isinstance(order_id, int):
+            raise TypeError("Order id must be an instance of int")
+        if not isinstance(is_paid, bool):
+            raise TypeError("is_paid must be bool")
+
+        sql = "UPDATE orders SET is_paid = %(is_paid)s WHERE id = %(id)s"
+
+        conn = None
+        try:
+            conn = self.db.connect()
+            self.db.execute(
+                conn,
+                sql,
+                {
+                    "is_paid": int(is_paid),
+                    "id": order_id
+                }
+            )
+            conn.commit()
+            self.db.identity_map.invalidate(Order, order_id)
+        except mysql.connector.Error as e:
+            if conn:
+                conn.rollback()
+            raise RuntimeError(f"Payment update failed: {e}")
+        finally:
+            self.db.release()
+
+    def delete(self, order_id):
+        """
+        Deletes the order with the matching id from the database.
+        :param order_id:
+        :return:
+        """
+        if not isinstance(order_id, int):
+            raise TypeError("Order id must be an instance of int")
+
+        sql = "DELETE FROM orders WHERE id = %(id)s"
+
+        conn = None
+        try:
+            conn = self.db.connect()
+            self.db.execute(conn, sql, {"id": order_id})
+            conn.commit()
+            self.db.identity_map.invalidate(Order, order_id)
+        except mysql.connector.Error as e:
+            if conn:
+                conn.rollback()
+            raise RuntimeError(f"Order delete failed: {e}")
+        finally:
+            self.db.release()
+
+    def create(self, order: Order):
+        """
+        Adds order into the database.
+        :param order:
+        :return:
+        """
+        if not isinstance(order, Order):
+            raise TypeError("Order must be an instance of Order")
+
+        sql_order = "INSERT INTO orders (employee_id, name, is_paid) VALUES (%(employee_id)s, %(name)s, %(is_paid)s)"
+        sql_item = "INSERT INTO order_items (order_id, menu_item_id, quantity) VALUES (%(order_id)s, %(menu_item_id)s, %(quantity)s)"
+        sql_fetch = "SELECT creation_date, employee_first_name, employee_last_name FROM orders WHERE id = %s"
+
+        conn = None
+
+        try:
+            conn = self.db.connect()
+
+            result = self.db.execute(
+                conn,
+                sql_order,
+                {
+                    "employee_id": order.employee_id,
+                    "name": order.name,
+                    "is_paid": int(order.is_paid),
+                },
+            )
+            order.id = result.lastrowid
+
+            for item in order.order_items:
+                result = self.db.execute(
+                    conn,
+                    sql_item,
+                    {
+                        "order_id": order.id,
+                        "menu_item_id": item.menu_item.id,
+                        "quantity": item.quantity
+                    }
+                )
+                item.id = result.lastrowid
+                item.order_id = order.id
+
+            result = self.db.execute(conn, sql_fetch, (order.id,)).fetchone()
+            if result:
+                order.creation_date = result[0]
+                order.employee_first_name = result[1]
+                order.employee_last_name = result[2]
+
+            conn.commit()
+            order.version = 1
+            for item in order.order_items:
+                item.version = 1
+            order.mark_clean()
+
+        except mysql.connector.Error as e:
+            if conn:
+                conn.rollback()
+            raise RuntimeError(f"Order create failed: {e}")
+        finally:
+            self.db.release()
+
+    def update(self, order: Order, chunk_size: int = None) -> int:
+        """
+        Writes the changes made to the order since it was loaded or saved in one transaction.
+        Only changed header columns are updated, changed quantities are sent as one UPDATE per chunk,
+        removed order items as one DELETE and new order items as multi-row INSERTs.
+        The header and every changed or removed order item are written only if they still have the version
+        they were loaded with, otherwise nothing is saved and ConcurrencyConflictError carries the current row.
+        Nothing is saved either when the selected employee no longer exists.
+        :param order:
+        :param chunk_size: rows per statement, None uses the configured size
+        :return: number of statements saved compared to rewriting the header and every order item
+        """
+        if not isinstance(order, Order):
+            raise TypeError("Order must be an instance of Order")
+        if chunk_size is None:
+            chunk_size = self.db.bulk_insert_chunk_size
+        if not isinstance(chunk_size, int) or chunk_size <= 0:
+            raise ValueError("chunk_size must be a positive integer")
+
+        sql_update_header = """
+                            UPDATE orders
+                                SET
+                                    employee_id = %(employee_id)s, name = %(name)s,
+                                    employee_first_name = (SELECT first_name FROM employees WHERE id = %(employee_id)s),
+                                    employee_last_name = (SELECT last_name FROM employees WHERE id = %(employee_id)s),
+                                    version = version + 1
+                            WHERE id = %(id)s AND version = COALESCE(%(version)s, version)
+                              AND EXISTS (SELECT 1 FROM employees WHERE id = %(employee_id)s)
+                            """
+
+        sql_update_name = """
+                          UPDATE orders SET name = %(name)s, version = version + 1
+                          WHERE id = %(id)s AND version = COALESCE(%(version)s, version)
+                          """
+
+        sql_get_current_ids = "SELECT id FROM order_items WHERE order_id = %s"
+
+        changed_fields = order.changed_fields()
+        statements = 0
+        header_updated = False
+
+        conn = None
+        try:
+            conn = self.db.connect()
+
+            if changed_fields:
+                params = {"employee_id": order.employee_id, "name": order.name, "id": order.id, "version": order.version}
+                sql = sql_update_header if "employee_id" in changed_fields else sql_update_name
+                header_updated = self.db.execute(conn, sql, params).rowcount > 0
+                statements += 1
+                if not header_updated:
+                    current = self.get_order(conn, order.id)
+                    if current is None or (order.version is not None and current.version != order.version):
+                        conn.rollback()
+                        raise ConcurrencyConflictError(f"Order {order.id} was changed or deleted by someone else",
+                                                       order.id, current)
+                    conn.rollback()
+                    raise RuntimeError(f"Order update failed: employee {order.employee_id} does not exist")
+
+            if order.is_tracked:
+                saved_ids = None
+                versions_to_delete = order.removed_item_versions()
+            else:
+                saved_ids = {row[0] for row in self.db.execute(conn, sql_get_current_ids, (order.id,))}
+                statements += 1
+                versions_to_delete = dict.fromkeys(saved_ids - {item.id for item in order.order_items})
+
+            new_items, changed_items = [], []
+            for item in order.order_items:
+                if item.id is None or (saved_ids is not None and item.id not in saved_ids):
+                    new_items.append(item)
+                elif item.changed_fields():
+                    changed_items.append(item)
+
+            for start in range(0, len(changed_items), chunk_size):
+                chunk = changed_items[start:start + chunk_size]
+                sql = ("UPDATE order_items SET quantity = CASE id " + " ".join(["WHEN %s THEN %s"] * len(chunk))
+                       + " END, version = version + 1 WHERE id IN (" + ", ".join(["%s"] * len(chunk))
+                       + ") AND version = CASE id " + " ".join(["WHEN %s THEN COALESCE(%s, version)"] * len(chunk)) + " END")
+                params = []
+                for item in chunk:
+                    params.extend((item.id, item.quantity))
+                params.extend(item.id for item in chunk)
+                for item in chunk:
+                    params.extend((item.id, item.version))
+                result = self.db.execute(conn, sql, params, prepared=len(chunk) in (1, chunk_size))
+                statements += 1
+                if result.rowcount < len(chunk):
+                    self._raise_item_conflict(conn, {item.id: item.version for item in chunk})
+
+            if versions_to_delete:
+                sql_delete = (f"DELETE FROM order_items WHERE id IN ({','.join(['%s'] * len(versions_to_delete))})"
+                              " AND version = CASE id " + " ".join(["WHEN %s THEN COALESCE(%s, version)"] * len(versions_to_delete)) + " END")
+                params = list(versions_to_delete)
+                for item_id, version in versions_to_delete.items():
+                    params.extend((item_id, version))
+                result = self.db.execute(conn, sql_delete, params, prepared=False)
+                statements += 1
+                if result.rowcount < len(versions_to_delete):
+                    self._raise_item_conflict(conn, versions_to_delete, deleted_ok=True)
+
+            new_ids = []
+            step = self.db.auto_increment_step(conn) if len(new_items) > 1 else 1
+            for start in range(0, len(new_items), chunk_size):
+                chunk = new_items[start:start + chunk_size]
+                sql = "INSERT INTO order_items (order_id, menu_item_id, quantity) VALUES " + ", ".join(["(%s, %s, %s)"] * len(chunk))
+                params = []
+                for item in chunk:
+                    params.extend((order.id, item.menu_item.id, item.quantity))
+
+                result = self.db.execute(conn, sql, params, prepared=len(chunk) in (1, chunk_size))
+                statements += 1
+                new_ids.extend(result.lastrowid + offset * step for offset in range(len(chunk)))
+
+            conn.commit()
+            if header_updated and order.version is not None:
+                order.version += 1
+            for item in changed_items:
+                if item.version is not None:
+                    item.version += 1
+            for item, item_id in zip(new_items, new_ids):
+                item.id = item_id
+                item.order_id = order.id
+                item.version = 1
+            order.mark_clean()
+            self.db.identity_map.invalidate(Order, order.id)
+            self.db.identity_map.invalidate(OrderItem, *(item.id for item in changed_items), *versions_to_delete)
+            return 2 + len(order.order_items) + (1 if versions_to_delete else 0) - statements
+        except mysql.connector.Error as e:
+            if conn:
+                conn.rollback()
+            raise RuntimeError(f"Order update failed: {e}")
+        finally:
+            self.db.release()
+
+    def _raise_item_conflict(self, conn, versions: dict, deleted_ok: bool = False):
+        """
+        Finds the order item whose conditional write matched no row, rolls back and raises ConcurrencyConflictError.
+        :param conn:
+        :param versions: dict of order item id -> version it was loaded with
+        :param deleted_ok: order items deleted by someone else are not a conflict, e.g. when deleting them
+        :return:
+        """
+        current = self._order_items_DAO.get_items_by_ids(conn, list(versions))
+        for item_id, version in versions.items():
+            item = current.get(item_id)
+            if item is None and deleted_ok:
+                continue
+            if item is None or (version is not None and item.version != version):
+                conn.rollback()
+                raise ConcurrencyConflictError(f"Order item {item_id} was changed or deleted by someone else", item_id, item)
+
+    def get_order(self, conn, order_id: int) -> Order | None:
+        """
+        Reads one order, paid or not, on an open connection.
+        :param conn:
+        :param order_id:
+        :return: the order, None when it does not exist
+        """
+        sql = """
+              SELECT id, employee_id, employee_first_name, employee_last_name, name, creation_date,
+                     is_paid, total_price, total_vat, version
+              FROM orders
+              WHERE id = %s
+              """
+        row = self.db.execute(conn, sql, (order_id,)).fetchone()
+        if row is None:
+            return None
+        return self.db.identity_map.materialize(Order, row[0], row, self._order_from_row)
+
+    @staticmethod
+    def _order_from_row(row) -> Order:
+        return Order.from_db(row[0], row[1], row[2], row[3], row[4], row[5], row[6], float(row[7]), float(row[8]), row[9])
+
+    def get_unpaid_orders(self):
+        """
+        Fetches all unpaid orders from the database.
+        :return:
+        """
+        sql = "SELECT * FROM view_paid_orders"
+
+        try:
+            orders = []
+            conn = self.db.connect()
+            for row in self.db.execute(conn, sql):
+                orders.append(self.db.identity_map.materialize(Order, row[0], row, self._order_from_row))
+            return orders
+        except mysql.connector.Error as e:
+            raise RuntimeError(f"Order get unpaid orders failed: {e}")
+        finally:
+            self.db.release()
+
+    def _database_time(self, conn) -> datetime:
+        """
+        Reads the database clock, which also sets the changed_at of the change log entries.
+        :param conn:
+        :return:
+        """
+        now = self.db.execute(conn, "SELECT CURRENT_TIMESTAMP").fetchone()[0]
+        if isinstance(now, str):
+            now = datetime.fromisoformat(now)
+        return now.replace(microsecond=0)
+
+    def _settle_threshold(self, conn) -> datetime:
+        """
+        Returns the time before which the change log is complete.
+        An entry id is taken when its row is inserted, so an id below a visible one can still be committed
+        by a running transaction, or never appear when that transaction is rolled back.
+        :param conn:
+        :return:
+        """
+        return self._database_time(conn) - timedelta(seconds=self.CHANGE_SETTLE_SECONDS)
+
+    def get_orders_version(self) -> int:
+        """
+        Returns the id of the change log entry the changes of the orders loaded after this call follow.
+        Entries written in the last CHANGE_SETTLE_SECONDS are not counted, so the next poll reads them again
+        together with any entry committed below them in the meantime.
+        :return:
+        """
+        sql_recent = "SELECT MIN(id) FROM order_changes WHERE changed_at >= %s"
+        sql_version = "SELECT MAX(id) FROM order_changes WHERE id < %s"
+        sql_last = "SELECT MAX(id) FROM order_changes"
+
+        try:
+            conn = self.db.connect()
+            recent = self.db.execute(conn, sql_recent, (self._settle_threshold(conn),)).fetchone()[0]
+            if recent is None:
+                row = self.db.execute(conn, sql_last).fetchone()
+            else:
+                row = self.db.execute(conn, sql_version, (recent,)).fetchone()
+            return int(row[0]) if row and row[0] is not None else 0
+        except mysql.connector.Error as e:
+            raise RuntimeError(f"Order get version failed: {e}")
+        finally:
+            self.db.release()
+
+    def get_order_changes(self, since: int):
+        """
+        Fetches the change log entries of orders and order_items written after the given entry id.
+        While nothing changed only the first and last id of the log are read.
+        The returned id stops before a gap in the ids until the entry after the gap is older than CHANGE_SETTLE_SECONDS,
+        so the entries after it are returned again by the next poll.
+        :param since: id returned by the previous poll or by get_orders_version
+        :return: (id to poll from next, list of OrderChange), the list is None when the log was pruned past since
+        """
+        if not isinstance(since, int):
+            raise TypeError("since must be int")
+
+        sql_bounds = "SELECT MIN(id), MAX(id) FROM order_changes"
+        sql_changes = "SELECT id, order_id, is_open, changed_at < %s FROM order_changes WHERE id > %s ORDER BY id"
+
+        try:
+            conn = self.db.connect()
+            first, last = self.db.execute(conn, sql_bounds).fetchone()
+            if last is None:
+                return (since, []) if since == 0 else (0, None)
+            if since > last or since < first - 1:
+                return int(last), None
+            if last == since:
+                return since, []
+
+            version = since
+            waiting = False
+            changes = []
+            for row in self.db.execute(conn, sql_changes, (self._settle_threshold(conn), since)):
+                change = OrderChange(int(row[0]), row[1], bool(row[2]))
+                changes.append(change)
+                if not waiting and (change.version == version + 1 or row[3]):
+                    version = change.version
+                else:
+                    waiting = True
+            return version, changes
+        except mysql.connector.Error as e:
+            raise RuntimeError(f"Order get changes failed: {e}")
+        finally:
+            self.db.release()
+
+    def get_unpaid_orders_by_ids(self, order_ids: list[int]) -> list[Order]:
+        """
+        Fetches the unpaid orders with the given ids, paid and deleted ones are left out.
+        :param order_ids:
+        :return:
+        """
+        if not order_ids:
+            return []
+
+        sql = f"SELECT * FROM view_paid_orders WHERE id IN ({','.join(['%s'] * len(order_ids))}) ORDER BY id"
+
+        try:
+            orders = []
+            conn = self.db.connect()
+            for row in self.db.execute(conn, sql, list(order_ids), prepared=False):
+                orders.append(self.db.identity_map.materialize(Order, row[0], row, self._order_from_row))
+            return orders
+        except mysql.connector.Error as e:
+            raise RuntimeError(f"Order get orders by ids failed: {e}")
+        finally:
+            self.db.release()
+
+    def prune_order_changes(self, days: int) -> int:
+        """
+        Deletes the change log entries older than the given number of days. The newest entry is always kept,
+        so pollers can tell from the first id whether entries they have not read were deleted.
+        Terminals whose last sync is older than the kept entries reload all orders.
+        :param days: age in days of the oldest entry kept
+        :return: number of deleted entries
+        """
+        if not isinstance(days, int) or days < 0:
+            raise ValueError("days must be a non-negative integer")
+
+        sql_last = "SELECT MAX(id) FROM order_changes"
+        sql = "DELETE FROM order_changes WHERE changed_at < %s AND id < %s"
+
+        conn = None
+        try:
+            conn = self.db.connect()
+            last = self.db.execute(conn, sql_last).fetchone()[0] or 0
+            result = self.db.execute(conn, sql, (self._database_time(conn) - timedelta(days=days), last))
+            conn.commit()
+            return result.rowcount
+        except mysql.connector.Error as e:
+            if conn:
+                conn.rollback()
+            raise RuntimeError(f"Order prune changes failed: {e}")
+        finally:
+            self.db.release()
@@ -0,0 +1,189 @@
+import math
+import re
+import threading
+from collections import deque
+from datetime import datetime
+
+PLACEHOLDER = re.compile(r"%\(\w+\)s|%s")
+STRING_LITERAL = re.compile(r"'(?:[^'\\]|\\.)*'")
+NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+VALUE_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+VALUE_LISTS = re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+")
+WHITESPACE = re.compile(r"[\s\\]+")
+
+
+def fingerprint(sql: str) -> str:
+    """
+    Normalizes a statement so calls that differ only in values, IN list length or row count are counted together.
+    :param sql:
+    :return:
+    """
+    sql = PLACEHOLDER.sub("?", sql)
+    sql = STRING_LITERAL.sub("?", sql)
+    sql = NUMBER_LITERAL.sub("?", sql)
+    sql = VALUE_LIST.sub("(...)", sql)
+    sql = VALUE_LISTS.sub("(...)", sql)
+    return WHITESPACE.sub(" ", sql).strip().rstrip(";").strip()
+
+
+def percentile(sorted_values: list, fraction: float) -> float:
+    """
+    Nearest-rank percentile of an already sorted list.
+    :param sorted_values:
+    :param fraction: e.g. 0.95 for p95
+    :return:
+    """
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(fraction * len(sorted_values))
+    return sorted_values[max(0, min(len(sorted_values), rank) - 1)]
+
+
+class QueryTrace:
+    def __init__(self, method: str, fingerprint: str, elapsed_ms: float, rows: int, thread: str):
+        """
+        One executed statement.
+        :param method: DAO method that executed it, e.g. OrdersDAO.update
+        :param fingerprint: normalized SQL
+        :param elapsed_ms: execution and fetch time in milliseconds
+        :param rows: rows returned, or affected for statements without a result set
+        :param thread: name of the calling thread
+        """
+        self.method = method
+        self.fingerprint = fingerprint
+        self.elapsed_ms = elapsed_ms
+        self.rows = rows
+        self.thread = thread
+        self.timestamp = datetime.now()
+
+
+class QueryTracer:
+    def __init__(self, slow_query_ms: float, slow_query_log: str = None, samples: int = 1000, recent: int = 200):
+        """
+        Collects per-statement latencies and writes statements slower than the threshold to the slow query log.
+        :param slow_query_ms: statements taking at least this many milliseconds are logged
+        :param slow_query_log: path of the log file, None to disable the log
+        :param samples: latencies kept per fingerprint for the percentiles
+        :param recent: number of most recent traces kept
+        """
+        self._slow_query_ms = slow_query_ms
+        self._slow_query_log = slow_query_log
+        self._samples = samples
+
+        self._lock = threading.Lock()
+        self._log_lock = threading.Lock()
+        self._statements = {}
+        self._recent = deque(maxlen=recent)
+        self._fingerprints = {}
+
+    @property
+    def slow_query_ms(self) -> float:
+        return self._slow_query_ms
+
+    def is_slow(self, elapsed_ms: float) -> bool:
+        return self._slow_query_log is not None and elapsed_ms >= self._slow_query_ms
+
+    def record(self, method: str, sql: str, elapsed_ms: float, rows: int, thread: str) -> QueryTrace:
+        """
+        Stores the trace of one statement.
+        :param method:
+        :param sql:
+        :param elapsed_ms:
+        :param rows:
+        :param thread:
+        :return:
+        """
+        normalized = self._fingerprints.get(sql)
+        if normalized is None:
+            normalized = fingerprint(sql)
+            if len(self._fingerprints) < 1024:
+                self._fingerprints[sql] = normalized
+
+        trace = QueryTrace(method, normalized, elapsed_ms, rows, thread)
+        with self._lock:
+            statement = self._statements.get(normalized)
+            if statement is None:
+                statement = {
+                    "methods": set(),
+                    "count": 0,
+                    "total_ms": 0.0,
+                    "rows": 0,
+                    "latencies": deque(maxlen=self._samples),
+                }
+                self._statements[normalized] = statement
+
+            statement["methods"].add(method)
+            statement["count"] += 1
+            statement["total_ms"] += elapsed_ms
+            statement["rows"] += rows
+            statement["latencies"].append(elapsed_ms)
+            self._recent.append(trace)
+        return trace
+
+    def log_slow_query(self, trace: QueryTrace, sql: str, plan: list):
+        """
+        Appends the statement and its query plan to the slow query log.
+        :param trace:
+        :param sql: original statement text
+        :param plan: rows of the EXPLAIN output, or a one-item list with the error
+        :return:
+        """
+        lines = [
+            f"--- {trace.timestamp:%Y-%m-%d %H:%M:%S} | {trace.method} | thread {trace.thread} | "
+            f"{trace.elapsed_ms:.1f} ms | {trace.rows} rows",
+            f"SQL: {WHITESPACE.sub(' ', sql).strip()}",
+            "EXPLAIN:",
+        ]
+        lines.extend("    " + " | ".join(str(value) for value in row) for row in plan)
+
+        with self._log_lock:
+            try:
+                with open(self._slow_query_log, "a", encoding="utf-8") as f:
+                    f.write("\n".join(lines) + "\n\n")
+            except OSError:
+                pass
+
+    def summary(self) -> list[dict]:
+        """
+        Returns latency percentiles per statement fingerprint, slowest p95 first.
+        :return:
+        """
+        with self._lock:
+            statements = [
+                (normalized, dict(statement, methods=sorted(statement["methods"]), latencies=sorted(statement["latencies"])))
+                for normalized, statement in self._statements.items()
+            ]
+
+        result = []
+        for normalized, statement in statements:
+            latencies = statement["latencies"]
+            result.append({
+                "fingerprint": normalized,
+                "methods": statement["methods"],
+                "count": statement["count"],
+                "mean_ms": statement["total_ms"] / statement["count"],
+                "p50_ms": percentile(latencies, 0.50),
+                "p95_ms": percentile(latencies, 0.95),
+                "p99_ms": percentile(latencies, 0.99),
+                "max_ms": latencies[-1],
+                "mean_rows": statement["rows"] / statement["count"],
+            })
+        result.sort(key=lambda row: row["p95_ms"], reverse=True)
+        return result
+
+    def recent(self) -> list[QueryTrace]:
+        """
+        Returns the most recent traces, oldest first.
+        :return:
+        """
+        with self._lock:
+            return list(self._recent)
+
+    def reset(self):
+        """
+        Forgets every collected trace.
+        :return:
+        """
+        with self._lock:
+            self._statements.clear()
+            self._recent.clear()
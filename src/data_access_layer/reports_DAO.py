@@ -1,46 +1,140 @@
-from typing import List
-import mysql.connector
-from src.data_access_layer.database_connector import DatabaseConnector
-from src.objects.sales_report_row import SalesReportRow
-
-
-class ReportsDAO:
-    def __init__(self):
-        self.db = DatabaseConnector()
-
-    def get_sales_report(self, start_date, end_date) -> List[SalesReportRow]:
-        """
-        Fetches aggregated sales data filtered by date range.
-        """
-        sql = """
-              SELECT mi.item_type         AS category, \
-                     mi.name              AS product_name, \
-                     COUNT(DISTINCT o.id) AS orders_count, \
-                     SUM(oi.quantity)     AS total_quantity_sold, \
-                     SUM(oi.total_price)  AS total_revenue, \
-                     SUM(oi.total_vat)    AS total_vat
-              FROM menu_items mi
-                       JOIN order_items oi ON mi.id = oi.menu_item_id
-                       JOIN orders o ON oi.order_id = o.id
-              WHERE o.creation_date BETWEEN %s AND %s
-              GROUP BY mi.item_type, mi.name
-              ORDER BY total_revenue DESC; \
-              """
-
-        report_data = []
-        try:
-            conn = self.db.connect()
-            with conn.cursor() as cursor:
-                cursor.execute(sql, (start_date, end_date))
-                for row in cursor:
-                    report_data.append(SalesReportRow(
-                        category=row[0],
-                        product_name=row[1],
-                        orders_count=row[2],
-                        total_quantity_sold=float(row[3]) if row[3] else 0.0,
-                        total_revenue=float(row[4]) if row[4] else 0.0,
-                        total_vat=float(row[5]) if row[5] else 0.0
-                    ))
-            return report_data
-        except mysql.connector.Error as e:
-            raise RuntimeError(f"Failed to fetch sales report: {e}")
\ No newline at end of file
+from datetime import date, datetime, time, timedelta
+from typing import List
+import mysql.connector
+from src.data_access_layer.database_connector import DatabaseConnector
+from src.objects.sales_report_row import SalesReportRow
+
+
+class ReportsDAO:
+    def __init__(self):
+        self.db = DatabaseConnector()
+
+    def get_sales_report(self, start_date, end_date) -> List[SalesReportRow]:
+        """
+        Fetches aggregated sales of paid orders created between start_date and end_date, both inclusive,
+        from the read replica when one is configured.
+        Whole days are read from the daily_product_sales rollup, only the partial days at the edges of the range
+        are aggregated from the order items.
+        :param start_date: datetime or "YYYY-MM-DD HH:MM:SS"
+        :param end_date: datetime or "YYYY-MM-DD HH:MM:SS"
+        :return:
+        """
+        start, end = self._to_datetime(start_date), self._to_datetime(end_date)
+
+        first_full_day = start.date() if start.time() == time.min else start.date() + timedelta(days=1)
+        last_full_day = end.date() if end.time() >= time(23, 59, 59) else end.date() - timedelta(days=1)
+        if first_full_day > last_full_day:
+            head_end, tail_start = start, start
+        else:
+            head_end = datetime.combine(first_full_day, time.min)
+            tail_start = datetime.combine(last_full_day + timedelta(days=1), time.min)
+
+        sql = """
+              SELECT mi.item_type           AS category, \
+                     mi.name                AS product_name, \
+                     SUM(s.orders_count)    AS orders_count, \
+                     SUM(s.quantity)        AS total_quantity_sold, \
+                     SUM(s.revenue)         AS total_revenue, \
+                     SUM(s.vat)             AS total_vat
+              FROM (SELECT menu_item_id, orders_count, quantity, revenue, vat
+                    FROM daily_product_sales
+                    WHERE sales_date BETWEEN %(first_full_day)s AND %(last_full_day)s
+                    UNION ALL
+                    SELECT oi.menu_item_id, COUNT(DISTINCT o.id), SUM(oi.quantity), SUM(oi.total_price), SUM(oi.total_vat)
+                    FROM orders o
+                             JOIN order_items oi ON oi.order_id = o.id
+                    WHERE o.is_paid = 1
+                      AND ((o.creation_date >= %(start)s AND o.creation_date < %(head_end)s)
+                        OR (o.creation_date >= %(tail_start)s AND o.creation_date <= %(end)s))
+                    GROUP BY oi.menu_item_id) s
+                       JOIN menu_items mi ON mi.id = s.menu_item_id
+              GROUP BY mi.item_type, mi.name
+              ORDER BY total_revenue DESC; \
+              """
+        params = {
+            "first_full_day": first_full_day,
+            "last_full_day": last_full_day,
+            "start": start,
+            "head_end": head_end,
+            "tail_start": tail_start,
+            "end": end,
+        }
+
+        report_data = []
+        try:
+            conn = self.db.connect(read_only=True)
+            for row in self.db.execute(conn, sql, params):
+                report_data.append(SalesReportRow(
+                    category=row[0],
+                    product_name=row[1],
+                    orders_count=int(row[2]),
+                    total_quantity_sold=float(row[3]) if row[3] else 0.0,
+                    total_revenue=float(row[4]) if row[4] else 0.0,
+                    total_vat=float(row[5]) if row[5] else 0.0
+                ))
+            return report_data
+        except mysql.connector.Error as e:
+            raise RuntimeError(f"Failed to fetch sales report: {e}")
+        finally:
+            self.db.release()
+
+    def get_sales_version(self, start_date, end_date) -> tuple:
+        """
+        Reads the change counters a cached sales report of the range depends on. The result changes whenever
+        a menu item or a paid order created on one of the days of the range changes.
+        :param start_date: datetime or "YYYY-MM-DD HH:MM:SS"
+        :param end_date: datetime or "YYYY-MM-DD HH:MM:SS"
+        :return: (menu items version, sum of the day versions)
+        """
+        sql = """
+              SELECT (SELECT version FROM change_counters WHERE name = 'menu_items'),
+                     (SELECT COALESCE(SUM(version), 0) FROM sales_day_changes WHERE sales_date BETWEEN %s AND %s)
+              """
+        start, end = self._to_datetime(start_date), self._to_datetime(end_date)
+
+        try:
+            conn = self.db.connect(read_only=True)
+            row = self.db.execute(conn, sql, (start.date(), end.date())).fetchone()
+            return int(row[0] or 0), int(row[1] or 0)
+        except mysql.connector.Error as e:
+            raise RuntimeError(f"Failed to fetch sales version: {e}")
+        finally:
+            self.db.release()
+
+    def rebuild_daily_sales(self) -> int:
+        """
+        Recomputes the daily_product_sales rollup from all paid orders.
+        :return: number of rollup rows written
+        """
+        sql_delete = "DELETE FROM daily_product_sales"
+        sql_fill = """
+                   INSERT INTO daily_product_sales (sales_date, menu_item_id, orders_count, quantity, revenue, vat)
+                   SELECT DATE(o.creation_date), oi.menu_item_id, COUNT(DISTINCT o.id), SUM(oi.quantity),
+                          ROUND(SUM(oi.total_price), 2), ROUND(SUM(oi.total_vat), 2)
+                   FROM orders o
+                            JOIN order_items oi ON oi.order_id = o.id
+                   WHERE o.is_paid = 1 AND oi.menu_item_id IS NOT NULL
+                   GROUP BY DATE(o.creation_date), oi.menu_item_id
+                   """
+
+        conn = None
+        try:
+            conn = self.db.connect()
+            self.db.execute(conn, sql_delete)
+            result = self.db.execute(conn, sql_fill)
+            conn.commit()
+            return result.rowcount
+        except mysql.connector.Error as e:
+            if conn:
+                conn.rollback()
+            raise RuntimeError(f"Failed to rebuild daily sales: {e}")
+        finally:
+            self.db.release()
+
+    @staticmethod
+    def _to_datetime(value) -> datetime:
+        if isinstance(value, datetime):
+            return value
+        if isinstance(value, date):
+            return datetime.combine(value, time.min)
+        return datetime.fromisoformat(value)
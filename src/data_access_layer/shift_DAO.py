@@ -1,93 +1,135 @@
-import mysql.connector
-from src.data_access_layer.database_connector import DatabaseConnector
-from src.objects.shift import Shift
-
-class ShiftsDAO:
-    def __init__(self):
-        self.db = DatabaseConnector()
-
-    def get_shifts_by_date(self, target_date):
-        """
-        Gets shifts for a specific date from the database.
-        :param target_date:
-        :return: List of shifts with the matching date.
-        """
-        sql = "SELECT id, employee_id, employee_first_name, employee_last_name, start_time, end_time, hourly_rate FROM view_shifts_log WHERE shift_date = %s ORDER BY start_time"
-        shifts = []
-        try:
-            conn = self.db.connect()
-            with conn.cursor() as cursor:
-                cursor.execute(sql, (target_date,))
-                for row in cursor:
-                    shifts.append(Shift.from_db(
-                        row[0], row[1], row[2], row[3], row[4], row[5], float(row[6])
-                    ))
-            return shifts
-        except mysql.connector.Error as e:
-            raise RuntimeError(f"Failed to load shifts: {e}")
-
-    def add(self, shift: Shift):
-        """
-        Adds a shift to the database.
-        :param shift:
-        :return:
-        """
-        sql = "INSERT INTO shifts (employee_id, start_time, end_time, hourly_rate) VALUES (%(emp_id)s, %(start)s, %(end)s, %(rate)s)"
-        conn = None
-        try:
-            conn = self.db.connect()
-            with conn.cursor() as cursor:
-                cursor.execute(sql, {
-                    "emp_id": shift.employee_id,
-                    "start": shift.start_time,
-                    "end": shift.end_time,
-                    "rate": shift.hourly_rate
-                })
-                shift.id = cursor.lastrowid
-            conn.commit()
-        except mysql.connector.Error as e:
-            if conn:
-                conn.rollback()
-            raise RuntimeError(f"Could not add shift: {e}")
-
-    def update(self, shift: Shift):
-        """
-        Updates the matching shift in the database.
-        :param shift:
-        :return:
-        """
-        sql = "UPDATE shifts SET employee_id=%(emp_id)s, start_time=%(start)s, end_time=%(end)s, hourly_rate=%(rate)s WHERE id=%(id)s"
-        conn = None
-        try:
-            conn = self.db.connect()
-            with conn.cursor() as cursor:
-                cursor.execute(sql, {
-                    "emp_id": shift.employee_id,
-                    "start": shift.start_time,
-                    "end": shift.end_time,
-                    "rate": shift.hourly_rate,
-                    "id": shift.id
-                })
-                conn.commit()
-        except Exception as e:
-            if conn:
-                conn.rollback()
-            raise RuntimeError(f"Could not update shift: {e}")
-
-    def delete(self, shift_id: int):
-        """
-        Deletes the shift with the matching id from the database.
-        :param shift_id:
-        :return:
-        """
-        sql = "DELETE FROM shifts WHERE id = %(id)s"
-        conn = None
-        try:
-            conn = self.db.connect()
-            with conn.cursor() as cursor:
-                cursor.execute(sql, {"id": shift_id})
-                conn.commit()
-        except Exception as e:
-            if conn:
-                conn.rollback()
-            raise RuntimeError(f"Could not delete shift: {e}")
\ No newline at end of file
+from datetime import date, datetime, time, timedelta
+
+import mysql.connector
+from src.data_access_layer.concurrency import ConcurrencyConflictError
+from src.data_access_layer.database_connector import DatabaseConnector
+from src.objects.shift import Shift
+
+class ShiftsDAO:
+    def __init__(self):
+        self.db = DatabaseConnector()
+
+    def get_shifts_by_date(self, target_date):
+        """
+        Gets shifts for a specific date from the database.
+        The day is matched as a start_time range, so the lookup uses the start_time index.
+        :param target_date:
+        :return: List of shifts with the matching date.
+        """
+        if isinstance(target_date, datetime):
+            target_date = target_date.date()
+        elif isinstance(target_date, str):
+            target_date = date.fromisoformat(target_date)
+        day_start = datetime.combine(target_date, time.min)
+
+        sql = "SELECT id, employee_id, employee_first_name, employee_last_name, start_time, end_time, hourly_rate, version FROM shifts WHERE start_time >= %s AND start_time < %s ORDER BY start_time"
+        shifts = []
+        try:
+            conn = self.db.connect()
+            for row in self.db.execute(conn, sql, (day_start, day_start + timedelta(days=1))):
+                shifts.append(self.db.identity_map.materialize(Shift, row[0], row, self._shift_from_row))
+            return shifts
+        except mysql.connector.Error as e:
+            raise RuntimeError(f"Failed to load shifts: {e}")
+        finally:
+            self.db.release()
+
+    def add(self, shift: Shift):
+        """
+        Adds a shift to the database.
+        :param shift:
+        :return:
+        """
+        sql = "INSERT INTO shifts (employee_id, start_time, end_time, hourly_rate) VALUES (%(emp_id)s, %(start)s, %(end)s, %(rate)s)"
+        conn = None
+        try:
+            conn = self.db.connect()
+            result = self.db.execute(conn, sql, {
+                "emp_id": shift.employee_id,
+                "start": shift.start_time,
+                "end": shift.end_time,
+                "rate": shift.hourly_rate
+            })
+            shift.id = result.lastrowid
+            conn.commit()
+            shift.version = 1
+            shift.mark_clean()
+        except mysql.connector.Error as e:
+            if conn:
+                conn.rollback()
+            raise RuntimeError(f"Could not add shift: {e}")
+        finally:
+            self.db.release()
+
+    def update(self, shift: Shift):
+        """
+        Updates the matching shift in the database if it still has the version it was loaded with.
+        :param shift:
+        :return:
+        """
+        sql = "UPDATE shifts SET employee_id=%(emp_id)s, start_time=%(start)s, end_time=%(end)s, hourly_rate=%(rate)s, version=version+1 WHERE id=%(id)s AND version=COALESCE(%(version)s, version)"
+        conn = None
+        try:
+            conn = self.db.connect()
+            result = self.db.execute(conn, sql, {
+                "emp_id": shift.employee_id,
+                "start": shift.start_time,
+                "end": shift.end_time,
+                "rate": shift.hourly_rate,
+                "id": shift.id,
+                "version": shift.version
+            })
+            if result.rowcount == 0:
+                current = self.get_shift(conn, shift.id)
+                conn.rollback()
+                raise ConcurrencyConflictError(f"Shift {shift.id} was changed or deleted by someone else", shift.id, current)
+            conn.commit()
+            if shift.version is not None:
+                shift.version += 1
+            shift.mark_clean()
+            self.db.identity_map.invalidate(Shift, shift.id)
+        except ConcurrencyConflictError:
+            raise
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            raise RuntimeError(f"Could not update shift: {e}")
+        finally:
+            self.db.release()
+
+    def get_shift(self, conn, shift_id: int) -> Shift | None:
+        """
+        Reads one shift on an open connection.
+        :param conn:
+        :param shift_id:
+        :return: the shift, None when it does not exist
+        """
+        sql = "SELECT id, employee_id, employee_first_name, employee_last_name, start_time, end_time, hourly_rate, version FROM shifts WHERE id = %s"
+        row = self.db.execute(conn, sql, (shift_id,)).fetchone()
+        if row is None:
+            return None
+        return self.db.identity_map.materialize(Shift, row[0], row, self._shift_from_row)
+
+    @staticmethod
+    def _shift_from_row(row) -> Shift:
+        return Shift.from_db(row[0], row[1], row[2], row[3], row[4], row[5], float(row[6]), row[7])
+
+    def delete(self, shift_id: int):
+        """
+        Deletes the shift with the matching id from the database.
+        :param shift_id:
+        :return:
+        """
+        sql = "DELETE FROM shifts WHERE id = %(id)s"
+        conn = None
+        try:
+            conn = self.db.connect()
+            self.db.execute(conn, sql, {"id": shift_id})
+            conn.commit()
+            self.db.identity_map.invalidate(Shift, shift_id)
+        except Exception as e:
+            if conn:
+                conn.rollback()
+            raise RuntimeError(f"Could not delete shift: {e}")
+        finally:
+            self.db.release()
\ No newline at end of file
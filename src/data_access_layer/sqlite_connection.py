@@ -0,0 +1,215 @@
+import re
+import sqlite3
+import sys
+import threading
+from datetime import date, datetime
+from pathlib import Path
+
+import mysql.connector
+
+NAMED_PARAMETER = re.compile(r"%\((\w+)\)s")
+SCHEMA_FILE = re.compile(r"^(\d+)_.*\.sql$")
+
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(" "))
+sqlite3.register_adapter(date, lambda value: value.isoformat())
+sqlite3.register_converter("TIMESTAMP", lambda value: datetime.fromisoformat(value.decode()))
+
+_schema_lock = threading.Lock()
+
+
+def translate_error(error: sqlite3.Error) -> mysql.connector.Error:
+    """
+    Maps a sqlite3 error to the matching mysql.connector error, so DAOs handle both backends the same way.
+    The errors carry a server-style sqlstate because an embedded database never loses its connection.
+    :param error:
+    :return:
+    """
+    if isinstance(error, sqlite3.IntegrityError):
+        return mysql.connector.errors.IntegrityError(msg=str(error), sqlstate="23000")
+    if isinstance(error, sqlite3.OperationalError):
+        return mysql.connector.errors.OperationalError(msg=str(error), sqlstate="HY000")
+    if isinstance(error, sqlite3.ProgrammingError):
+        return mysql.connector.errors.ProgrammingError(msg=str(error), sqlstate="42000")
+    return mysql.connector.errors.DatabaseError(msg=str(error), sqlstate="HY000")
+
+
+def translate_sql(sql: str) -> str:
+    """
+    Converts the %s and %(name)s placeholders used by the DAOs to the sqlite3 ? and :name style.
+    :param sql:
+    :return:
+    """
+    sql = NAMED_PARAMETER.sub(r":\1", sql)
+    return sql.replace("%s", "?").replace("%%", "%")
+
+
+def get_schema_folder_path() -> Path:
+    """
+    Creates path to the folder with the versioned SQLite schema scripts.
+    :return:
+    """
+    if getattr(sys, 'frozen', False):
+        base_path = Path(getattr(sys, '_MEIPASS', Path(sys.executable).parent))
+    else:
+        base_path = Path(__file__).resolve().parent.parent.parent
+    return base_path / "database_files" / "sqlite"
+
+
+class SQLiteCursor:
+    def __init__(self, cursor: sqlite3.Cursor):
+        """
+        Wraps a sqlite3 cursor with the subset of the mysql.connector cursor API used by the DAOs.
+        :param cursor:
+        """
+        self._cursor = cursor
+        self._is_insert = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __iter__(self):
+        return iter(self.fetchall())
+
+    @property
+    def with_rows(self) -> bool:
+        return self._cursor.description is not None
+
+    @property
+    def lastrowid(self):
+        """
+        Id of the first row of the last INSERT, the same value MySQL reports for multi-row inserts.
+        :return:
+        """
+        if not self._is_insert or self._cursor.rowcount <= 0:
+            return self._cursor.lastrowid
+        return self._cursor.lastrowid - self._cursor.rowcount + 1
+
+    @property
+    def rowcount(self) -> int:
+        return self._cursor.rowcount
+
+    def execute(self, sql: str, params=None):
+        self._is_insert = sql.lstrip().upper().startswith("INSERT")
+        try:
+            self._cursor.execute(translate_sql(sql), params if params is not None else ())
+        except sqlite3.Error as e:
+            raise translate_error(e) from e
+
+    def fetchone(self):
+        try:
+            return self._cursor.fetchone()
+        except sqlite3.Error as e:
+            raise translate_error(e) from e
+
+    def fetchall(self):
+        try:
+            return self._cursor.fetchall()
+        except sqlite3.Error as e:
+            raise translate_error(e) from e
+
+    def close(self):
+        self._cursor.close()
+
+
+class SQLiteConnection:
+    def __init__(self, path: str):
+        """
+        In-process SQLite database exposing the subset of the mysql.connector connection API used by the DAOs.
+        The schema is created or upgraded on first use.
+        :param path: database file, or :memory: for a database shared by all connections of the process
+        """
+        self._path = path
+        self._connection = None
+        self.reconnect()
+
+    @property
+    def in_transaction(self) -> bool:
+        return self._connection is not None and self._connection.in_transaction
+
+    def cursor(self, prepared: bool = False) -> SQLiteCursor:
+        """
+        Returns a new cursor. SQLite caches compiled statements itself, so prepared is accepted and ignored.
+        :param prepared:
+        :return:
+        """
+        return SQLiteCursor(self._connection.cursor())
+
+    def commit(self):
+        try:
+            self._connection.commit()
+        except sqlite3.Error as e:
+            raise translate_error(e) from e
+
+    def rollback(self):
+        try:
+            self._connection.rollback()
+        except sqlite3.Error as e:
+            raise translate_error(e) from e
+
+    def is_connected(self) -> bool:
+        return self._connection is not None
+
+    def ping(self, reconnect: bool = False, attempts: int = 1, delay: int = 0):
+        if self._connection is None:
+            if not reconnect:
+                raise mysql.connector.errors.InterfaceError(msg="SQLite connection is closed")
+            self.reconnect()
+
+    def reconnect(self, attempts: int = 1, delay: int = 0):
+        """
+        Opens the database file and applies pending schema scripts.
+        :param attempts:
+        :param delay:
+        :return:
+        """
+        self.close()
+        try:
+            if self._path == ":memory:":
+                connection = sqlite3.connect(
+                    "file:restaurant?mode=memory&cache=shared",
+                    uri=True,
+                    detect_types=sqlite3.PARSE_DECLTYPES,
+                    check_same_thread=False
+                )
+            else:
+                connection = sqlite3.connect(
+                    self._path,
+                    timeout=10,
+                    detect_types=sqlite3.PARSE_DECLTYPES,
+                    check_same_thread=False
+                )
+                connection.execute("PRAGMA journal_mode = WAL")
+            connection.execute("PRAGMA foreign_keys = ON")
+            self._connection = connection
+            self._apply_schema()
+        except sqlite3.Error as e:
+            self.close()
+            raise translate_error(e) from e
+
+    def close(self):
+        if self._connection is not None:
+            try:
+                self._connection.close()
+            finally:
+                self._connection = None
+
+    def _apply_schema(self):
+        """
+        Runs the numbered scripts from database_files/sqlite that are newer than the database's user_version.
+        :return:
+        """
+        with _schema_lock:
+            version = self._connection.execute("PRAGMA user_version").fetchone()[0]
+            scripts = []
+            for script in get_schema_folder_path().glob("*.sql"):
+                match = SCHEMA_FILE.match(script.name)
+                if match and int(match.group(1)) > version:
+                    scripts.append((int(match.group(1)), script))
+
+            for script_version, script in sorted(scripts):
+                self._connection.executescript(
+                    f"BEGIN;\n{script.read_text(encoding='utf-8')}\nPRAGMA user_version = {script_version};\nCOMMIT;"
+                )
@@ -0,0 +1,145 @@
+import re
+import threading
+from collections import OrderedDict
+
+NAMED_PARAMETER = re.compile(r"%\((\w+)\)s")
+
+
+class QueryResult:
+    def __init__(self, rows: list, lastrowid, rowcount: int):
+        """
+        Fully fetched result of one statement.
+        :param rows: fetched rows, empty for statements without a result set
+        :param lastrowid: auto-increment id generated by an INSERT
+        :param rowcount: number of rows returned or affected
+        """
+        self.rows = rows
+        self.lastrowid = lastrowid
+        self.rowcount = rowcount
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def fetchone(self):
+        return self.rows[0] if self.rows else None
+
+    def fetchall(self):
+        return self.rows
+
+
+class StatementCacheStats:
+    def __init__(self):
+        """
+        Hit/miss counters shared by the statement caches of all pooled connections.
+        """
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def record(self, hits: int = 0, misses: int = 0, evictions: int = 0):
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+            self.evictions += evictions
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+class StatementCache:
+    def __init__(self, connection, capacity: int, stats: StatementCacheStats):
+        """
+        LRU cache of server-side prepared statements of one connection, keyed by SQL text.
+        :param connection: connection the statements are prepared on
+        :param capacity: maximum number of statements kept prepared
+        :param stats: shared counters
+        """
+        if not isinstance(capacity, int) or capacity <= 0:
+            raise ValueError("statement cache capacity must be a positive integer")
+
+        self._connection = connection
+        self._capacity = capacity
+        self._stats = stats
+        self._statements = OrderedDict()
+
+    def __len__(self):
+        return len(self._statements)
+
+    def execute(self, sql: str, params=None) -> QueryResult:
+        """
+        Executes the statement with a cached prepared cursor, preparing it on first use.
+        :param sql: statement using %s or %(name)s placeholders
+        :param params: tuple, list or dict of parameters
+        :return:
+        """
+        entry = self._statements.get(sql)
+        if entry is None:
+            self._stats.record(misses=1)
+            entry = self._prepare(sql)
+        else:
+            self._stats.record(hits=1)
+            self._statements.move_to_end(sql)
+
+        cursor, positional_sql, names = entry
+        if isinstance(params, dict):
+            params = tuple(params[name] for name in names)
+
+        try:
+            cursor.execute(positional_sql, params)
+            rows = cursor.fetchall() if cursor.with_rows else []
+        except Exception:
+            self._discard(sql)
+            raise
+        return QueryResult(rows, cursor.lastrowid, cursor.rowcount)
+
+    def clear(self, deallocate: bool = True):
+        """
+        Forgets every cached statement.
+        :param deallocate: False when the server already dropped them, e.g. after a reconnect
+        :return:
+        """
+        statements = self._statements
+        self._statements = OrderedDict()
+        if deallocate:
+            for cursor, _, _ in statements.values():
+                self._close_quietly(cursor)
+
+    def _prepare(self, sql: str):
+        """
+        Creates the prepared cursor for the statement and evicts the least recently used one when full.
+        :param sql:
+        :return:
+        """
+        names = NAMED_PARAMETER.findall(sql)
+        positional_sql = NAMED_PARAMETER.sub("%s", sql).rstrip().rstrip(";")
+        entry = (self._connection.cursor(prepared=True), positional_sql, names)
+        self._statements[sql] = entry
+
+        if len(self._statements) > self._capacity:
+            _, (old_cursor, _, _) = self._statements.popitem(last=False)
+            self._stats.record(evictions=1)
+            self._close_quietly(old_cursor)
+        return entry
+
+    def _discard(self, sql: str):
+        entry = self._statements.pop(sql, None)
+        if entry is not None:
+            self._close_quietly(entry[0])
+
+    @staticmethod
+    def _close_quietly(cursor):
+        try:
+            cursor.close()
+        except Exception:
+            pass
@@ -0,0 +1,68 @@
+class ChangeTracking:
+    """
+    Remembers the values of TRACKED_FIELDS as stored in the database, so only changed columns are written
+    and local changes can be merged into a newer version of the row.
+    """
+    TRACKED_FIELDS = ()
+    REFRESHED_FIELDS = ()
+
+    _clean_state = None
+    version = None
+
+    def mark_clean(self):
+        """
+        Remembers the current values as the state stored in the database.
+        :return:
+        """
+        self._clean_state = {field: getattr(self, field) for field in self.TRACKED_FIELDS}
+
+    def changed_fields(self) -> set:
+        """
+        Returns the fields changed since the object was loaded or saved, all of them for a new object.
+        :return:
+        """
+        if self._clean_state is None:
+            return set(self.TRACKED_FIELDS)
+        return {field for field in self.TRACKED_FIELDS if getattr(self, field) != self._clean_state[field]}
+
+    @property
+    def is_dirty(self) -> bool:
+        return bool(self.changed_fields())
+
+    def apply_fields(self, values: dict):
+        """
+        Sets several fields at once.
+        :param values: field -> value
+        :return:
+        """
+        for field, value in values.items():
+            setattr(self, field, value)
+
+    def rebase(self, current) -> set:
+        """
+        Merges the local changes into a newer version of the same row. Fields that were not changed locally
+        take the current values and the current version becomes the loaded one, so saving again writes
+        the local changes on top of it.
+        :param current: the row as it is stored now
+        :return: fields changed both locally and in current, nothing is merged when not empty
+        """
+        changed = self.changed_fields()
+        base = self._clean_state or {}
+        conflicts = {
+            field for field in changed
+            if getattr(current, field) != getattr(self, field) and (field not in base or getattr(current, field) != base[field])
+        }
+        if conflicts:
+            return conflicts
+
+        values = {field: getattr(self if field in changed else current, field) for field in self.TRACKED_FIELDS}
+        try:
+            self.apply_fields(values)
+        except ValueError:
+            return changed
+
+        for field in self.REFRESHED_FIELDS:
+            setattr(self, field, getattr(current, field))
+        self._clean_state = {field: getattr(current, field) for field in self.TRACKED_FIELDS}
+        self.version = current.version
+        return set()
@@ -0,0 +1,5 @@
+class OrderChange:
+    def __init__(self, version, order_id, is_open):
+        self.version = version
+        self.order_id = order_id
+        self.is_open = is_open
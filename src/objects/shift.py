@@ -1,79 +1,109 @@
-from datetime import datetime
-
-
-class Shift:
-    def __init__(self, employee_id: int, start_time: datetime, end_time: datetime, hourly_rate: float):
-        self.employee_id = employee_id
-        self.start_time = start_time
-        self.end_time = end_time
-        self.hourly_rate = hourly_rate
-
-        self.employee_first_name = None
-        self.employee_last_name = None
-        self.id = None
-
-    @classmethod
-    def from_db(cls, id: int, employee_id: int, first_name: str, last_name: str, start_time: datetime,
-                end_time: datetime, hourly_rate: float):
-        shift = cls(employee_id, start_time, end_time, hourly_rate)
-        shift.id = id
-        shift.employee_first_name = first_name
-        shift.employee_last_name = last_name
-        return shift
-
-    @property
-    def id(self):
-        return self._id
-
-    @id.setter
-    def id(self, value):
-        if value is not None and not isinstance(value, int):
-            raise TypeError("id must be int or None")
-        self._id = value
-
-    @property
-    def employee_id(self):
-        return self._employee_id
-
-    @employee_id.setter
-    def employee_id(self, value):
-        # Allow None if employee was deleted
-        if value is not None and not isinstance(value, int):
-            raise TypeError("employee_id must be int or None")
-        self._employee_id = value
-
-    @property
-    def start_time(self):
-        return self._start_time
-
-    @start_time.setter
-    def start_time(self, value):
-        if not isinstance(value, datetime):
-            raise TypeError("start_time must be datetime")
-        if hasattr(self, "_end_time") and self._end_time and value >= self._end_time:
-            raise ValueError("start_time must be before end_time")
-        self._start_time = value
-
-    @property
-    def end_time(self):
-        return self._end_time
-
-    @end_time.setter
-    def end_time(self, value):
-        if not isinstance(value, datetime):
-            raise TypeError("end_time must be datetime")
-        if hasattr(self, "_start_time") and self._start_time and value <= self._start_time:
-            raise ValueError("end_time must be after start_time")
-        self._end_time = value
-
-    @property
-    def hourly_rate(self):
-        return self._hourly_rate
-
-    @hourly_rate.setter
-    def hourly_rate(self, value):
-        if not isinstance(value, (int, float)):
-            raise TypeError("hourly_rate must be a number")
-        if value <= 0:
-            raise ValueError("hourly_rate must be > 0")
-        self._hourly_rate = value
\ No newline at end of file
+from datetime import datetime
+
+from src.objects.change_tracking import ChangeTracking
+
+
+class Shift(ChangeTracking):
+    TRACKED_FIELDS = ("employee_id", "start_time", "end_time", "hourly_rate")
+    REFRESHED_FIELDS = ("employee_first_name", "employee_last_name")
+
+    def __init__(self, employee_id: int, start_time: datetime, end_time: datetime, hourly_rate: float):
+        self._clean_state = None
+
+        self.employee_id = employee_id
+        self.start_time = start_time
+        self.end_time = end_time
+        self.hourly_rate = hourly_rate
+
+        self.employee_first_name = None
+        self.employee_last_name = None
+        self.id = None
+        self.version = None
+
+    @classmethod
+    def from_db(cls, id: int, employee_id: int, first_name: str, last_name: str, start_time: datetime,
+                end_time: datetime, hourly_rate: float, version: int = None):
+        shift = cls(employee_id, start_time, end_time, hourly_rate)
+        shift.id = id
+        shift.employee_first_name = first_name
+        shift.employee_last_name = last_name
+        shift.version = version
+        shift.mark_clean()
+        return shift
+
+    @property
+    def id(self):
+        return self._id
+
+    @id.setter
+    def id(self, value):
+        if value is not None and not isinstance(value, int):
+            raise TypeError("id must be int or None")
+        self._id = value
+
+    @property
+    def employee_id(self):
+        return self._employee_id
+
+    @employee_id.setter
+    def employee_id(self, value):
+        # Allow None if employee was deleted
+        if value is not None and not isinstance(value, int):
+            raise TypeError("employee_id must be int or None")
+        self._employee_id = value
+
+    @property
+    def start_time(self):
+        return self._start_time
+
+    @start_time.setter
+    def start_time(self, value):
+        if not isinstance(value, datetime):
+            raise TypeError("start_time must be datetime")
+        if hasattr(self, "_end_time") and self._end_time and value >= self._end_time:
+            raise ValueError("start_time must be before end_time")
+        self._start_time = value
+
+    @property
+    def end_time(self):
+        return self._end_time
+
+    @end_time.setter
+    def end_time(self, value):
+        if not isinstance(value, datetime):
+            raise TypeError("end_time must be datetime")
+        if hasattr(self, "_start_time") and self._start_time and value <= self._start_time:
+            raise ValueError("end_time must be after start_time")
+        self._end_time = value
+
+    @property
+    def hourly_rate(self):
+        return self._hourly_rate
+
+    @hourly_rate.setter
+    def hourly_rate(self, value):
+        if not isinstance(value, (int, float)):
+            raise TypeError("hourly_rate must be a number")
+        if value <= 0:
+            raise ValueError("hourly_rate must be > 0")
+        self._hourly_rate = value
+
+    def apply_fields(self, values: dict):
+        """
+        Sets several fields at once, checking start_time and end_time together so a shift can be moved
+        past its old end.
+        :param values: field -> value
+        :return:
+        """
+        start_time = values.get("start_time", self.start_time)
+        end_time = values.get("end_time", self.end_time)
+        if not isinstance(start_time, datetime) or not isinstance(end_time, datetime):
+            raise TypeError("start_time and end_time must be datetime")
+        if start_time >= end_time:
+            raise ValueError("start_time must be before end_time")
+
+        self._start_time = start_time
+        self._end_time = end_time
+        for field, value in values.items():
+            if field not in ("start_time", "end_time"):
+                setattr(self, field, value)
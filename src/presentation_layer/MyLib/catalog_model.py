@@ -0,0 +1,105 @@
+from PyQt5 import QtGui
+from PyQt5.QtCore import Qt
+
+from src.data_access_layer.circuit_breaker import DatabaseUnavailableError
+
+
+class CatalogModel:
+    ID_ROLE = Qt.UserRole + 1
+
+    def __init__(self, run_async, refresh, items, revision, label, data=None):
+        """
+        Combo box model of a list kept by a manager, shared by every dialog and updated only when the list changed.
+        The list is refreshed in the background, so handing out the model never waits for the database.
+        :param run_async: runs a coroutine in the background and calls back with (success, result), like MainWindow.run_async
+        :param refresh: coroutine function that reloads the list when it is out of date
+        :param items: returns the current list
+        :param revision: returns a value that changes whenever the list changes
+        :param label: returns the text shown for an item
+        :param data: returns the value stored as the item data, None stores the item itself
+        """
+        self._run_async = run_async
+        self._refresh = refresh
+        self._items = items
+        self._revision = revision
+        self._label = label
+        self._data = data or (lambda item: item)
+        self._model = QtGui.QStandardItemModel()
+        self._built_revision = None
+        self._refreshing = False
+
+    def model(self) -> QtGui.QStandardItemModel:
+        """
+        Returns the model built from the loaded list, set it on a combo box with setModel().
+        The list is checked for changes in the background and the model is updated when they arrive.
+        :return:
+        """
+        self._update_model()
+        self.refresh()
+        return self._model
+
+    def refresh(self):
+        """
+        Starts a background refresh of the list unless one is running already.
+        :return:
+        """
+        if self._refreshing:
+            return
+        self._refreshing = True
+        self._run_async(self._refresh_list(), self._on_refresh_finished)
+
+    async def _refresh_list(self) -> bool:
+        """
+        Refreshes the list, a database error keeps the loaded one until the next refresh.
+        :return: True when the list is up to date
+        """
+        try:
+            await self._refresh()
+        except (RuntimeError, DatabaseUnavailableError):
+            return False
+        return True
+
+    def _on_refresh_finished(self, success, result):
+        """
+        Updates the model on the UI thread when the refresh changed the list.
+        :param success:
+        :param result:
+        :return:
+        """
+        self._refreshing = False
+        self._update_model()
+
+    def _update_model(self):
+        """
+        Brings the rows in line with the list when it changed since the model was built.
+        Rows are matched by item id and updated in place, so combo boxes showing the model keep their selection
+        unless the selected item was removed.
+        :return:
+        """
+        revision = self._revision()
+        if revision == self._built_revision:
+            return
+
+        items = self._items()
+        remaining = {item.id for item in items}
+        row = 0
+        for item in items:
+            while row < self._model.rowCount() and self._model.item(row).data(self.ID_ROLE) not in remaining:
+                self._model.removeRow(row)
+
+            current = self._model.item(row) if row < self._model.rowCount() else None
+            if current is None or current.data(self.ID_ROLE) != item.id:
+                current = QtGui.QStandardItem()
+                current.setEditable(False)
+                current.setData(item.id, self.ID_ROLE)
+                self._model.insertRow(row, current)
+            if current.text() != self._label(item):
+                current.setText(self._label(item))
+            current.setData(self._data(item), Qt.UserRole)
+
+            remaining.discard(item.id)
+            row += 1
+
+        if row < self._model.rowCount():
+            self._model.removeRows(row, self._model.rowCount() - row)
+        self._built_revision = revision
@@ -0,0 +1,84 @@
+import asyncio
+
+from PyQt5 import QtCore
+
+
+class QtAsyncioLoop(QtCore.QObject):
+    def __init__(self, parent=None, interval_ms: int = 5):
+        """
+        asyncio event loop driven by the Qt event loop.
+        The loop only runs while coroutines are pending, so an idle window costs nothing.
+        Coroutines and their callbacks run on the Qt main thread and may update widgets directly.
+        :param parent:
+        :param interval_ms: how often pending coroutines are advanced
+        """
+        super().__init__(parent)
+        self._loop = asyncio.new_event_loop()
+        self._tasks = set()
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setInterval(interval_ms)
+        self._timer.timeout.connect(self._tick)
+
+    @property
+    def loop(self):
+        return self._loop
+
+    def pending(self) -> int:
+        """
+        Returns the number of coroutines still running.
+        :return:
+        """
+        return len(self._tasks)
+
+    def submit(self, coroutine, callback=None):
+        """
+        Schedules the coroutine on the loop.
+        :param coroutine:
+        :param callback: called on the Qt thread with (success, result or error message)
+        :return: the scheduled task
+        """
+        task = self._loop.create_task(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(lambda done: self._on_task_done(done, callback))
+
+        if not self._timer.isActive():
+            self._timer.start()
+        return task
+
+    def close(self):
+        """
+        Cancels the pending coroutines and closes the loop.
+        :return:
+        """
+        self._timer.stop()
+        for task in list(self._tasks):
+            task.cancel()
+        if self._tasks:
+            self._loop.run_until_complete(asyncio.gather(*self._tasks, return_exceptions=True))
+        self._loop.close()
+
+    def _tick(self):
+        """
+        Runs every callback that is ready, without waiting for new ones.
+        :return:
+        """
+        if self._loop.is_running():
+            return
+
+        self._loop.call_soon(self._loop.stop)
+        self._loop.run_forever()
+
+        if not self._tasks:
+            self._timer.stop()
+
+    def _on_task_done(self, task, callback):
+        self._tasks.discard(task)
+        if callback is None or task.cancelled():
+            return
+
+        error = task.exception()
+        if error is not None:
+            callback(False, str(error))
+        else:
+            callback(True, task.result())
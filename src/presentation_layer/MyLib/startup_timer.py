@@ -0,0 +1,54 @@
+import time
+
+
+class StartupTimer:
+    def __init__(self):
+        """
+        Records when each startup phase begins and ends, relative to the creation of the timer.
+        Phases may overlap, e.g. the connection warm-up and the first tab load.
+        """
+        self._origin = time.perf_counter()
+        self._started = {}
+        self._phases = []
+
+    def start(self, name: str):
+        """
+        Marks the beginning of a phase.
+        :param name:
+        :return:
+        """
+        self._started[name] = time.perf_counter() - self._origin
+
+    def finish(self, name: str):
+        """
+        Marks the end of a phase that was started before.
+        :param name:
+        :return:
+        """
+        started = self._started.pop(name, None)
+        if started is not None:
+            self._phases.append((name, started, time.perf_counter() - self._origin))
+
+    def phases(self) -> list:
+        """
+        Returns the finished phases in the order they started.
+        :return: list of (name, start seconds, end seconds)
+        """
+        return sorted(self._phases, key=lambda phase: phase[1])
+
+    def report(self) -> str:
+        """
+        Formats the finished phases as a table with their start, end and duration in milliseconds.
+        :return:
+        """
+        phases = self.phases()
+        if not phases:
+            return "No startup phases recorded."
+
+        width = max(len(name) for name, _, _ in phases)
+        lines = [f"{'phase':<{width}}  {'start':>8}  {'end':>8}  {'took':>8}"]
+        for name, started, finished in phases:
+            lines.append(
+                f"{name:<{width}}  {started * 1000:>6.0f}ms  {finished * 1000:>6.0f}ms  {(finished - started) * 1000:>6.0f}ms"
+            )
+        return "\n".join(lines)
@@ -1,99 +1,238 @@
-import os
-from PyQt5 import QtWidgets, uic, QtCore
-
-from src.aplication_layer.employees_manager import EmployeesManager
-from src.aplication_layer.menu_items_manager import MenuItemsManager
-from src.aplication_layer.orders_manager import OrdersManager
-from src.aplication_layer.shifts_manager import ShiftsManager
-from src.aplication_layer.reports_manager import ReportsManager
-
-from src.presentation_layer.orders.scripts.orders_tab import OrdersTab
-from src.presentation_layer.employees.scripts.employees_tab import EmployeesTab
-from src.presentation_layer.menu_items.scripts.menu_items_tab import MenuItemsTab
-from src.presentation_layer.shifts.scripts.shifts_tab import ShiftsTab
-from src.presentation_layer.orders.scripts.order_details_tab import OrderDetailsTab
-from src.presentation_layer.shifts.scripts.shift_details_tab import ShiftDetailsTab
-from src.presentation_layer.importer.scripts.data_import_tab import DataImportTab
-from src.presentation_layer.orders.scripts.create_order_tab import CreateOrderTab
-from src.presentation_layer.sales_report.scripts.sales_report_tab import SalesReportTab
-
-
-class MainWindow(QtWidgets.QMainWindow):
-    def __init__(self):
-        super().__init__()
-
-        ui_path = os.path.join(os.path.dirname(__file__), 'app_main_window.ui')
-        uic.loadUi(ui_path, self)
-
-        self._orders_manager = OrdersManager()
-        self._employees_manager = EmployeesManager()
-        self._menu_items_manager = MenuItemsManager()
-        self._shifts_manager = ShiftsManager()
-        self._reports_manager = ReportsManager()
-
-        self._employees_tab = EmployeesTab(self._employees_manager, self)
-        self._menu_items_tab = MenuItemsTab(self._menu_items_manager, self)
-        self._reports_tab = SalesReportTab(self._reports_manager, self)
-        self._import_tab = DataImportTab()
-
-        self.main_stack = QtWidgets.QStackedWidget()
-        central_layout = self.centralwidget.layout()
-        central_layout.removeWidget(self.mainTabWidget)
-        self.mainTabWidget.setParent(None)
-        central_layout.addWidget(self.main_stack)
-        self.main_stack.addWidget(self.mainTabWidget)
-
-        self._orders_tab = OrdersTab(self._orders_manager, self, None)
-        self.tab_order_details = OrderDetailsTab(self._orders_manager, self, self._orders_tab)
-        self._orders_tab.details_tab = self.tab_order_details
-
-        self.tab_create_order = CreateOrderTab(
-            self._orders_manager,
-            self._employees_manager,
-            self._menu_items_manager,
-            self,
-            self._orders_tab
-        )
-        self._orders_tab.create_order_tab = self.tab_create_order
-
-        self.main_stack.addWidget(self.tab_order_details)
-        self.main_stack.addWidget(self.tab_create_order)
-
-        self._shifts_tab = ShiftsTab(self._shifts_manager, self, None)
-        self.tab_shift_details = ShiftDetailsTab(
-            self._shifts_manager,
-            self._employees_manager,
-            self,
-            self._shifts_tab
-        )
-        self._shifts_tab.details_tab = self.tab_shift_details
-        self.main_stack.addWidget(self.tab_shift_details)
-
-        self.mainTabWidget.addTab(self._orders_tab, "Orders")
-        self.mainTabWidget.addTab(self._employees_tab, "Employees")
-        self.mainTabWidget.addTab(self._menu_items_tab, "Menu Items")
-        self.mainTabWidget.addTab(self._shifts_tab, "Calendar")
-        self.mainTabWidget.addTab(self._reports_tab, "Sales Report")
-        self.mainTabWidget.addTab(self._import_tab, "Import data")
-
-        self.showMaximized()
-
-    def switch_to_tab(self, target_widget):
-        if target_widget == self.tab_shift_details:
-            self.main_stack.setCurrentWidget(self.tab_shift_details)
-        elif target_widget == self.tab_order_details:
-            self.main_stack.setCurrentWidget(self.tab_order_details)
-        elif target_widget == self.tab_create_order:
-            self.main_stack.setCurrentWidget(self.tab_create_order)
-        else:
-            self.main_stack.setCurrentWidget(self.mainTabWidget)
-            if target_widget is not None:
-                self.mainTabWidget.setCurrentWidget(target_widget)
-
-    def lock_ui(self):
-        QtWidgets.QApplication.setOverrideCursor(QtCore.Qt.WaitCursor)
-        self.setEnabled(False)
-
-    def unlock_ui(self):
-        self.setEnabled(True)
+import asyncio
+import os
+from PyQt5 import QtWidgets, uic, QtCore
+
+from src.aplication_layer.employees_manager import EmployeesManager
+from src.aplication_layer.menu_items_manager import MenuItemsManager
+from src.aplication_layer.orders_manager import OrdersManager
+from src.aplication_layer.shifts_manager import ShiftsManager
+from src.aplication_layer.reports_manager import ReportsManager
+from src.aplication_layer.async_managers import AsyncEmployeesManager, AsyncMenuItemsManager, get_executor
+from src.data_access_layer.database_connector import DatabaseConnector
+
+from src.presentation_layer.orders.scripts.orders_tab import OrdersTab
+from src.presentation_layer.employees.scripts.employees_tab import EmployeesTab
+from src.presentation_layer.menu_items.scripts.menu_items_tab import MenuItemsTab
+from src.presentation_layer.shifts.scripts.shifts_tab import ShiftsTab
+from src.presentation_layer.orders.scripts.order_details_tab import OrderDetailsTab
+from src.presentation_layer.shifts.scripts.shift_details_tab import ShiftDetailsTab
+from src.presentation_layer.importer.scripts.data_import_tab import DataImportTab
+from src.presentation_layer.orders.scripts.create_order_tab import CreateOrderTab
+from src.presentation_layer.sales_report.scripts.sales_report_tab import SalesReportTab
+from src.presentation_layer.MyLib.catalog_model import CatalogModel
+from src.presentation_layer.MyLib.qt_asyncio import QtAsyncioLoop
+from src.presentation_layer.MyLib.startup_timer import StartupTimer
+
+
+class MainWindow(QtWidgets.QMainWindow):
+    RECONNECT_INTERVAL_MS = 5000
+
+    def __init__(self, startup_timer: StartupTimer = None):
+        """
+        Builds the window and every tab without touching the database.
+        The connection is warmed up in the background and each tab loads its data when it is first shown.
+        :param startup_timer: timer that receives the startup phases, a new one is created when not given
+        """
+        super().__init__()
+        self._startup_timer = startup_timer or StartupTimer()
+        self._startup_timer.start("build window")
+        self._database_offline = False
+
+        ui_path = os.path.join(os.path.dirname(__file__), 'app_main_window.ui')
+        uic.loadUi(ui_path, self)
+
+        self._async_loop = QtAsyncioLoop(self)
+
+        self._orders_manager = OrdersManager()
+        self._employees_manager = EmployeesManager()
+        self._menu_items_manager = MenuItemsManager()
+        self._shifts_manager = ShiftsManager()
+        self._reports_manager = ReportsManager()
+        self._menu_catalog = CatalogModel(
+            self.run_async,
+            AsyncMenuItemsManager(self._menu_items_manager).refresh_menu_items,
+            lambda: self._menu_items_manager.menu_items,
+            lambda: self._menu_items_manager.revision,
+            lambda item: f"{item.name} - {item.price}"
+        )
+        self._employee_catalog = CatalogModel(
+            self.run_async,
+            AsyncEmployeesManager(self._employees_manager).refresh_employees,
+            lambda: self._employees_manager.employees,
+            lambda: self._employees_manager.revision,
+            lambda employee: f"{employee.first_name} {employee.last_name}",
+            lambda employee: employee.id
+        )
+
+        self._employees_tab = EmployeesTab(self._employees_manager, self)
+        self._menu_items_tab = MenuItemsTab(self._menu_items_manager, self)
+        self._reports_tab = SalesReportTab(self._reports_manager, self)
+        self._import_tab = DataImportTab()
+
+        self.main_stack = QtWidgets.QStackedWidget()
+        central_layout = self.centralwidget.layout()
+        central_layout.removeWidget(self.mainTabWidget)
+        self.mainTabWidget.setParent(None)
+        central_layout.addWidget(self.main_stack)
+        self.main_stack.addWidget(self.mainTabWidget)
+
+        self._orders_tab = OrdersTab(self._orders_manager, self, None)
+        self.tab_order_details = OrderDetailsTab(self._orders_manager, self._menu_catalog, self, self._orders_tab)
+        self._orders_tab.details_tab = self.tab_order_details
+
+        self.tab_create_order = CreateOrderTab(
+            self._orders_manager,
+            self._employee_catalog,
+            self._menu_catalog,
+            self,
+            self._orders_tab
+        )
+        self._orders_tab.create_order_tab = self.tab_create_order
+
+        self.main_stack.addWidget(self.tab_order_details)
+        self.main_stack.addWidget(self.tab_create_order)
+
+        self._shifts_tab = ShiftsTab(self._shifts_manager, self, None)
+        self.tab_shift_details = ShiftDetailsTab(
+            self._shifts_manager,
+            self._employee_catalog,
+            self,
+            self._shifts_tab
+        )
+        self._shifts_tab.details_tab = self.tab_shift_details
+        self.main_stack.addWidget(self.tab_shift_details)
+
+        self.mainTabWidget.addTab(self._orders_tab, "Orders")
+        self.mainTabWidget.addTab(self._employees_tab, "Employees")
+        self.mainTabWidget.addTab(self._menu_items_tab, "Menu Items")
+        self.mainTabWidget.addTab(self._shifts_tab, "Calendar")
+        self.mainTabWidget.addTab(self._reports_tab, "Sales Report")
+        self.mainTabWidget.addTab(self._import_tab, "Import data")
+
+        self._tab_loaders = {
+            self._orders_tab: self._orders_tab.refresh_data,
+            self._employees_tab: self._employees_tab.load_employees,
+            self._menu_items_tab: self._menu_items_tab.load_menu_items,
+            self._reports_tab: self._reports_tab.refresh_data,
+        }
+        self._loaded_tabs = set()
+        self.mainTabWidget.currentChanged.connect(self._on_tab_activated)
+        self._startup_timer.finish("build window")
+
+        self._startup_timer.start("show window")
+        self.showMaximized()
+        self._startup_timer.finish("show window")
+
+        self._startup_timer.start("connect to database")
+        self._warm_up_connection()
+        self._on_tab_activated(self.mainTabWidget.currentIndex())
+
+    @property
+    def startup_timer(self) -> StartupTimer:
+        return self._startup_timer
+
+    def _warm_up_connection(self):
+        """
+        Opens the first pooled connection in the background, in parallel with the first tab load.
+        :return:
+        """
+        async def warm_up():
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(get_executor(), self._check_connection)
+
+        self.run_async(warm_up(), self._on_connection_warmed_up)
+
+    @staticmethod
+    def _check_connection():
+        """
+        Runs a trivial query, so the circuit breaker learns whether the database is reachable.
+        :return:
+        """
+        connector = DatabaseConnector()
+        try:
+            connection = connector.connect()
+            connector.execute(connection, "SELECT 1")
+        finally:
+            connector.release()
+
+    def _on_connection_warmed_up(self, success, error_message):
+        """
+        Records the warm-up time. While the database is unreachable the window stays open,
+        shows the problem in the status bar and checks the connection again periodically.
+        :param success:
+        :param error_message:
+        :return:
+        """
+        self._startup_timer.finish("connect to database")
+        if success:
+            self._menu_catalog.refresh()
+            self._employee_catalog.refresh()
+            if self._database_offline:
+                self._database_offline = False
+                self.statusBar().showMessage("Database connection restored.", 5000)
+                self._reload_current_tab()
+            return
+
+        self._database_offline = True
+        self.statusBar().showMessage(f"Database unavailable: {error_message}. Reconnecting in the background...")
+        QtCore.QTimer.singleShot(self.RECONNECT_INTERVAL_MS, self._warm_up_connection)
+
+    def _reload_current_tab(self):
+        """
+        Reloads the data of the visible tab if it was loaded before.
+        :return:
+        """
+        widget = self.mainTabWidget.currentWidget()
+        if widget in self._loaded_tabs:
+            self._tab_loaders[widget]()
+
+    def _on_tab_activated(self, index):
+        """
+        Loads the data of the tab the first time it is shown.
+        :param index:
+        :return:
+        """
+        widget = self.mainTabWidget.widget(index)
+        loader = self._tab_loaders.get(widget)
+        if loader is None or widget in self._loaded_tabs:
+            return
+
+        self._loaded_tabs.add(widget)
+
+        phase = f"load {self.mainTabWidget.tabText(index)} tab"
+        self._startup_timer.start(phase)
+        task = loader()
+        task.add_done_callback(lambda _: self._startup_timer.finish(phase))
+
+    def switch_to_tab(self, target_widget):
+        if target_widget == self.tab_shift_details:
+            self.main_stack.setCurrentWidget(self.tab_shift_details)
+        elif target_widget == self.tab_order_details:
+            self.main_stack.setCurrentWidget(self.tab_order_details)
+        elif target_widget == self.tab_create_order:
+            self.main_stack.setCurrentWidget(self.tab_create_order)
+        else:
+            self.main_stack.setCurrentWidget(self.mainTabWidget)
+            if target_widget is not None:
+                self.mainTabWidget.setCurrentWidget(target_widget)
+
+    def run_async(self, coroutine, callback=None):
+        """
+        Runs the coroutine on the asyncio loop of the window without blocking the UI.
+        :param coroutine:
+        :param callback: called on the UI thread with (success, result or error message)
+        :return:
+        """
+        return self._async_loop.submit(coroutine, callback)
+
+    def closeEvent(self, event):
+        self._async_loop.close()
+        super().closeEvent(event)
+
+    def lock_ui(self):
+        QtWidgets.QApplication.setOverrideCursor(QtCore.Qt.WaitCursor)
+        self.setEnabled(False)
+
+    def unlock_ui(self):
+        self.setEnabled(True)
         QtWidgets.QApplication.restoreOverrideCursor()
\ No newline at end of file
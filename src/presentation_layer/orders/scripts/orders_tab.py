@@ -1,106 +1,167 @@
-import os
-from PyQt5 import QtWidgets, uic, QtCore
-from src.presentation_layer.orders.scripts.order_widget import OrderWidget
-
-
-class OrdersTab(QtWidgets.QWidget):
-    def __init__(self, manager, ui_manager, details_tab, create_order_tab=None):
-        super().__init__()
-        ui_path = os.path.join(os.path.dirname(__file__), '..', 'ui', 'orders_tab.ui')
-        uic.loadUi(ui_path, self)
-
-        self.manager = manager
-        self.ui_manager = ui_manager
-        self.details_tab = details_tab
-        self.create_order_tab = create_order_tab
-
-        self.btn_refresh.clicked.connect(self.refresh_data)
-        self.btn_create_order.clicked.connect(self.open_create_order_tab)
-        self.list_orders.itemClicked.connect(self.on_order_clicked)
-
-        self.refresh_data()
-
-    def on_order_clicked(self, item):
-        """
-        Opens order details for the clicked order.
-        :param item:
-        :return:
-        """
-        order = item.data(QtCore.Qt.UserRole)
-
-        try:
-            items = self.manager.get_order_items(order.id)
-            order.order_items = items
-
-            if self.create_order_tab:
-                self.create_order_tab.load_old_order(order)
-                self.ui_manager.switch_to_tab(self.create_order_tab)
-        except Exception as e:
-            QtWidgets.QMessageBox.critical(self, "Error", f"Failed to load order for editing: {e}")
-
-    def refresh_data(self):
-        """
-        Reloads the orders.
-        :return:
-        """
-        self.list_orders.clear()
-        try:
-            self.manager.load_orders()
-            for order in self.manager.orders:
-                item = QtWidgets.QListWidgetItem(self.list_orders)
-                item.setData(QtCore.Qt.UserRole, order)
-
-                widget = OrderWidget(order)
-                widget.pay_clicked.connect(self.pay_order)
-                widget.delete_clicked.connect(self.delete_order)
-
-                item.setSizeHint(widget.sizeHint())
-                self.list_orders.addItem(item)
-                self.list_orders.setItemWidget(item, widget)
-        except Exception as e:
-            QtWidgets.QMessageBox.critical(self, "Error", f"Failed to load orders: {e}")
-
-    def open_create_order_tab(self):
-        """
-        Opens the order creation tab.
-        :return:
-        """
-        if self.create_order_tab:
-            self.create_order_tab.open_empty_tab()
-            self.ui_manager.switch_to_tab(self.create_order_tab)
-
-    def pay_order(self, order):
-        """
-        Opens a window that asks user for confirmation.
-        If user confirms pay the order.
-        :param order:
-        :return:
-        """
-        reply = QtWidgets.QMessageBox.question(
-            self, 'Pay Order', f"Pay and close order '{order.name}'?\nTotal: {order.total_price:.2f}",
-            QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No, QtWidgets.QMessageBox.No
-        )
-        if reply == QtWidgets.QMessageBox.Yes:
-            try:
-                self.manager.pay_order(order.id)
-                self.refresh_data()
-            except Exception as e:
-                QtWidgets.QMessageBox.critical(self, "Error", f"Failed to pay order: {e}")
-
-    def delete_order(self, order):
-        """
-        Opens a window that asks the user for confirmation.
-        If the user confirms delete the order and show the result.
-        :param order:
-        :return:
-        """
-        reply = QtWidgets.QMessageBox.question(
-            self, 'Delete Order', f"Delete order '{order.name}'?",
-            QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No, QtWidgets.QMessageBox.No
-        )
-        if reply == QtWidgets.QMessageBox.Yes:
-            try:
-                self.manager.delete_order(order.id)
-                self.refresh_data()
-            except Exception as e:
+import os
+from PyQt5 import QtWidgets, uic, QtCore
+from src.aplication_layer.async_managers import AsyncOrdersManager
+from src.presentation_layer.orders.scripts.order_widget import OrderWidget
+
+
+class OrdersTab(QtWidgets.QWidget):
+    POLL_INTERVAL_MS = 3000
+
+    def __init__(self, manager, ui_manager, details_tab, create_order_tab=None):
+        super().__init__()
+        ui_path = os.path.join(os.path.dirname(__file__), '..', 'ui', 'orders_tab.ui')
+        uic.loadUi(ui_path, self)
+
+        self.manager = manager
+        self.async_manager = AsyncOrdersManager(manager)
+        self.ui_manager = ui_manager
+        self.details_tab = details_tab
+        self.create_order_tab = create_order_tab
+        self._rows = {}
+        self._polling = False
+
+        self.btn_refresh.clicked.connect(self.refresh_data)
+        self.btn_create_order.clicked.connect(self.open_create_order_tab)
+        self.list_orders.itemClicked.connect(self.on_order_clicked)
+
+        self._poll_timer = QtCore.QTimer(self)
+        self._poll_timer.setInterval(self.POLL_INTERVAL_MS)
+        self._poll_timer.timeout.connect(self.poll_changes)
+        self._poll_timer.start()
+
+    def on_order_clicked(self, item):
+        """
+        Opens order details for the clicked order.
+        :param item:
+        :return:
+        """
+        order = item.data(QtCore.Qt.UserRole)
+
+        try:
+            items = self.manager.get_prefetched_order_items(order.id)
+            if items is None:
+                items = self.manager.get_order_items(order.id)
+            order.order_items = items
+
+            if self.create_order_tab:
+                self.create_order_tab.load_old_order(order)
+                self.ui_manager.switch_to_tab(self.create_order_tab)
+        except Exception as e:
+            QtWidgets.QMessageBox.critical(self, "Error", f"Failed to load order for editing: {e}")
+
+    def refresh_data(self):
+        """
+        Disables the tab and fetches the orders changed since the last refresh and their order_items in the background.
+        :return: the scheduled load task
+        """
+        self.setEnabled(False)
+        return self.ui_manager.run_async(self.async_manager.refresh_orders(True), self.on_load_finished)
+
+    def on_load_finished(self, success, error_message):
+        """
+        Enables the tab and shows the loaded orders.
+        :param success:
+        :param error_message:
+        :return:
+        """
+        self.setEnabled(True)
+        if not success:
+            QtWidgets.QMessageBox.critical(self, "Error", f"Failed to load orders: {error_message}")
+            return
+
+        self.populate_orders()
+
+    def poll_changes(self):
+        """
+        Applies the changes other terminals made to the open orders.
+        Runs only while the tab is shown and not loading, an idle poll reads the first and last id of the change log.
+        :return:
+        """
+        if self._polling or not self.isVisible() or not self.isEnabled():
+            return
+        self._polling = True
+        self.ui_manager.run_async(self.async_manager.refresh_orders(True), self.on_poll_finished)
+
+    def on_poll_finished(self, success, result):
+        """
+        Updates the rows of the changed orders. Failed polls are retried by the next one.
+        :param success:
+        :param result: (changed orders, ids of removed orders) or the error message
+        :return:
+        """
+        self._polling = False
+        if success and (result[0] or result[1]):
+            self.populate_orders()
+
+    def populate_orders(self):
+        """
+        Updates the order list to match the loaded orders.
+        Only rows of orders that were added, replaced by a newer version or removed since the last call are touched.
+        :return:
+        """
+        loaded_ids = {order.id for order in self.manager.orders}
+        for order_id in [order_id for order_id in self._rows if order_id not in loaded_ids]:
+            item = self._rows.pop(order_id)
+            self.list_orders.takeItem(self.list_orders.row(item))
+
+        for order in self.manager.orders:
+            item = self._rows.get(order.id)
+            if item is not None and item.data(QtCore.Qt.UserRole) is order:
+                continue
+
+            if item is None:
+                item = QtWidgets.QListWidgetItem(self.list_orders)
+                self._rows[order.id] = item
+            item.setData(QtCore.Qt.UserRole, order)
+
+            widget = OrderWidget(order)
+            widget.pay_clicked.connect(self.pay_order)
+            widget.delete_clicked.connect(self.delete_order)
+
+            item.setSizeHint(widget.sizeHint())
+            self.list_orders.setItemWidget(item, widget)
+
+    def open_create_order_tab(self):
+        """
+        Opens the order creation tab.
+        :return:
+        """
+        if self.create_order_tab:
+            self.create_order_tab.open_empty_tab()
+            self.ui_manager.switch_to_tab(self.create_order_tab)
+
+    def pay_order(self, order):
+        """
+        Opens a window that asks user for confirmation.
+        If user confirms pay the order.
+        :param order:
+        :return:
+        """
+        reply = QtWidgets.QMessageBox.question(
+            self, 'Pay Order', f"Pay and close order '{order.name}'?\nTotal: {order.total_price:.2f}",
+            QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No, QtWidgets.QMessageBox.No
+        )
+        if reply == QtWidgets.QMessageBox.Yes:
+            try:
+                self.manager.pay_order(order.id)
+                self.refresh_data()
+            except Exception as e:
+                QtWidgets.QMessageBox.critical(self, "Error", f"Failed to pay order: {e}")
+
+    def delete_order(self, order):
+        """
+        Opens a window that asks the user for confirmation.
+        If the user confirms delete the order and show the result.
+        :param order:
+        :return:
+        """
+        reply = QtWidgets.QMessageBox.question(
+            self, 'Delete Order', f"Delete order '{order.name}'?",
+            QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No, QtWidgets.QMessageBox.No
+        )
+        if reply == QtWidgets.QMessageBox.Yes:
+            try:
+                self.manager.delete_order(order.id)
+                self.refresh_data()
+            except Exception as e:
                 QtWidgets.QMessageBox.critical(self, "Error", f"Failed to delete order: {e}")
\ No newline at end of file
@@ -0,0 +1,126 @@
+"""
+Prints the query plans of the DAO read queries and reports full table scans of shifts, orders and order_items.
+
+Run from the project root against the database configured in configuration_files/config.ini:
+    python -m tools.explain_plans --date 2024-05-01
+
+The DAO methods are called once and every statement they execute is explained with EXPLAIN on MySQL
+and EXPLAIN QUERY PLAN on SQLite. On MySQL the optimizer may still prefer a scan on nearly empty tables,
+so check the plans on a database with realistic data. The exit status is 1 when a full scan was found.
+"""
+import argparse
+import re
+import sys
+from datetime import date, datetime, timedelta
+
+from src.data_access_layer.database_connector import DatabaseConnector
+from src.data_access_layer.order_items_DAO import OrderItemsDAO
+from src.data_access_layer.orders_DAO import OrdersDAO
+from src.data_access_layer.reports_DAO import ReportsDAO
+from src.data_access_layer.shift_DAO import ShiftsDAO
+
+CHECKED_TABLES = {"shifts", "orders", "order_items"}
+TABLE_ALIAS = re.compile(r"\b(?:FROM|JOIN)\s+(\w+)(?:\s+(?:AS\s+)?(?!ON\b|WHERE\b|JOIN\b|GROUP\b|ORDER\b)(\w+))?", re.IGNORECASE)
+
+
+def capture_statements(db: DatabaseConnector, calls: list) -> list:
+    """
+    Runs the DAO calls and records the statements they execute.
+    :param db:
+    :param calls: list of (name, callable)
+    :return: list of (name, sql, params)
+    """
+    statements = []
+    execute = db.execute
+    current = [None]
+
+    def recording_execute(connection, sql, params=None, prepared=True):
+        statements.append((current[0], sql, params))
+        return execute(connection, sql, params, prepared)
+
+    db.execute = recording_execute
+    try:
+        for name, call in calls:
+            current[0] = name
+            call()
+    finally:
+        del db.execute
+    return statements
+
+
+def explain(db: DatabaseConnector, sql: str, params) -> list[str]:
+    """
+    Returns the plan of the statement as text lines.
+    :param db:
+    :param sql:
+    :param params:
+    :return:
+    """
+    prefix = "EXPLAIN QUERY PLAN " if db.backend == "sqlite" else "EXPLAIN "
+    conn = db.connect()
+    try:
+        result = db.execute(conn, prefix + sql.strip().rstrip(";"), params, prepared=False)
+        return [" | ".join(str(value) for value in row) for row in result.fetchall()]
+    finally:
+        db.release()
+
+
+def full_scans(db: DatabaseConnector, sql: str, plan: list[str]) -> set:
+    """
+    Finds the checked tables that the plan reads completely.
+    :param db:
+    :param sql: explained statement, used to resolve table aliases
+    :param plan: lines returned by explain()
+    :return:
+    """
+    aliases = {}
+    for table, alias in TABLE_ALIAS.findall(sql):
+        aliases[alias or table] = table
+
+    scans = set()
+    for line in plan:
+        columns = [column.strip() for column in line.split("|")]
+        if db.backend == "sqlite":
+            detail = columns[-1].split()
+            if len(detail) >= 2 and detail[0] == "SCAN" and "USING" not in detail:
+                scans.add(aliases.get(detail[1], detail[1]))
+        elif len(columns) > 4 and columns[4] == "ALL":
+            scans.add(aliases.get(columns[2], columns[2]))
+    return scans & CHECKED_TABLES
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--date", default=date.today().isoformat(), help="day used for the shift and report queries")
+    args = parser.parse_args()
+
+    db = DatabaseConnector()
+    day = date.fromisoformat(args.date)
+    report_start = datetime.combine(day, datetime.min.time())
+    report_end = report_start + timedelta(days=1) - timedelta(seconds=1)
+    orders_version = OrdersDAO().get_orders_version()
+
+    calls = [
+        ("ShiftsDAO.get_shifts_by_date", lambda: ShiftsDAO().get_shifts_by_date(day)),
+        ("OrdersDAO.get_unpaid_orders", lambda: OrdersDAO().get_unpaid_orders()),
+        ("OrdersDAO.get_order_changes", lambda: OrdersDAO().get_order_changes(orders_version - 1)),
+        ("OrdersDAO.get_unpaid_orders_by_ids", lambda: OrdersDAO().get_unpaid_orders_by_ids([0, 1, 2])),
+        ("OrderItemsDAO.get_items_by_order_id", lambda: OrderItemsDAO().get_items_by_order_id(0)),
+        ("OrderItemsDAO.get_items_by_order_ids", lambda: OrderItemsDAO().get_items_by_order_ids([0, 1, 2])),
+        ("ReportsDAO.get_sales_report", lambda: ReportsDAO().get_sales_report(report_start, report_end)),
+    ]
+
+    found = False
+    for name, sql, params in capture_statements(db, calls):
+        plan = explain(db, sql, params)
+        scans = full_scans(db, sql, plan)
+        found = found or bool(scans)
+        print(f"{name}: {'full scan of ' + ', '.join(sorted(scans)) if scans else 'ok'}")
+        for line in plan:
+            print(f"    {line}")
+
+    sys.exit(1 if found else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Applies the MySQL migrations from database_files/migrations to the database configured in configuration_files/config.ini.
+
+Run from the project root:
+    python -m tools.migrate           applies the pending migrations
+    python -m tools.migrate --list    shows which migrations are applied
+
+Each script is named <version>_<name>.sql and ends by inserting its version into schema_migrations,
+so it can also be run with the mysql command line client. SQLite databases are upgraded automatically
+from database_files/sqlite when the app connects.
+"""
+import argparse
+import re
+from pathlib import Path
+
+import mysql.connector
+
+from src.data_access_layer.database_connector import DatabaseConnector
+
+MIGRATION_FILE = re.compile(r"^(\d+)_(.*)\.sql$")
+DELIMITER = re.compile(r"^\s*DELIMITER\s+(\S+)\s*$", re.IGNORECASE)
+
+
+def get_migrations_folder_path() -> Path:
+    """
+    Creates path to the folder with the MySQL migration scripts.
+    :return:
+    """
+    return Path(__file__).resolve().parent.parent / "database_files" / "migrations"
+
+
+def find_migrations() -> list:
+    """
+    Lists the migration scripts ordered by version.
+    :return: list of (version, name, path)
+    """
+    migrations = []
+    for script in get_migrations_folder_path().glob("*.sql"):
+        match = MIGRATION_FILE.match(script.name)
+        if match:
+            migrations.append((int(match.group(1)), match.group(2), script))
+    return sorted(migrations)
+
+
+def split_statements(script: str) -> list[str]:
+    """
+    Splits a script into statements the way the mysql client does, honouring DELIMITER lines
+    so trigger bodies are kept together.
+    :param script:
+    :return:
+    """
+    statements = []
+    delimiter = ";"
+    current = []
+    for line in script.splitlines():
+        match = DELIMITER.match(line)
+        if match:
+            delimiter = match.group(1)
+            continue
+        if not current and (not line.strip() or line.lstrip().startswith("--")):
+            continue
+
+        current.append(line)
+        if line.rstrip().endswith(delimiter):
+            statement = "\n".join(current).rstrip()[:-len(delimiter)].strip()
+            if statement:
+                statements.append(statement)
+            current = []
+
+    if "\n".join(current).strip():
+        statements.append("\n".join(current).strip())
+    return statements
+
+
+def applied_versions(db: DatabaseConnector, conn) -> set:
+    """
+    Reads the versions recorded in schema_migrations, creating the table when it does not exist yet.
+    :param db:
+    :param conn:
+    :return:
+    """
+    db.execute(
+        conn,
+        "CREATE TABLE IF NOT EXISTS schema_migrations ("
+        "version INT PRIMARY KEY, name VARCHAR(255) NOT NULL, "
+        "applied_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP)",
+        prepared=False
+    )
+    return {row[0] for row in db.execute(conn, "SELECT version FROM schema_migrations")}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--list", action="store_true", help="only show the state of each migration")
+    args = parser.parse_args()
+
+    db = DatabaseConnector()
+    if db.backend != "mysql":
+        print("SQLite databases apply the scripts from database_files/sqlite automatically.")
+        return
+
+    migrations = find_migrations()
+    conn = db.connect()
+    try:
+        applied = applied_versions(db, conn)
+        conn.commit()
+
+        for version, name, path in migrations:
+            if args.list or version in applied:
+                print(f"{version:>4}  {name:<40}{'applied' if version in applied else 'pending'}")
+                continue
+
+            print(f"{version:>4}  {name:<40}applying")
+            for statement in split_statements(path.read_text(encoding="utf-8")):
+                db.execute(conn, statement, prepared=False)
+            conn.commit()
+    except mysql.connector.Error as e:
+        conn.rollback()
+        raise RuntimeError(f"Migration failed: {e}")
+    finally:
+        db.release()
+
+
+if __name__ == "__main__":
+    main()
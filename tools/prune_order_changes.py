@@ -0,0 +1,27 @@
+"""
+Deletes old entries of the order_changes log that terminals poll for changes of the open orders.
+
+Run from the project root against the database configured in configuration_files/config.ini,
+for example once a day from cron or the Windows task scheduler:
+    python -m tools.prune_order_changes --days 7
+
+A terminal that has not polled since the oldest kept entry reloads all open orders on its next refresh.
+"""
+import argparse
+import time
+
+from src.data_access_layer.orders_DAO import OrdersDAO
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--days", type=int, default=7, help="age in days of the oldest entry kept")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    rows = OrdersDAO().prune_order_changes(args.days)
+    print(f"Pruned order_changes: {rows} entries older than {args.days} days in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+"""
+Rebuilds the daily_product_sales rollup used by the sales report from all paid orders.
+
+Run from the project root against the database configured in configuration_files/config.ini:
+    python -m tools.rebuild_sales_rollup
+
+Needed after importing historical orders directly into the database, or after changing
+the order items of orders that were already paid.
+"""
+import argparse
+import time
+
+from src.data_access_layer.reports_DAO import ReportsDAO
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.parse_args()
+
+    start = time.perf_counter()
+    rows = ReportsDAO().rebuild_daily_sales()
+    print(f"Rebuilt daily_product_sales: {rows} rows in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()